@@ -13,11 +13,34 @@ a = Analysis(
         ('CHANGELOG.md', '.'),
     ],
     hiddenimports=[
-        'mods',
-        'servers',
-        'jvm_presets',
-        'updater',
-        'backup',
+        'engine',
+        'engine.accounts',
+        'engine.backup',
+        'engine.cds',
+        'engine.config',
+        'engine.download',
+        'engine.events',
+        'engine.gclog',
+        'engine.install',
+        'engine.jvm_flags',
+        'engine.jvm_presets',
+        'engine.launch',
+        'engine.modindex',
+        'engine.modpack',
+        'engine.mods',
+        'engine.objects',
+        'engine.overlap',
+        'engine.policy',
+        'engine.process',
+        'engine.resolver',
+        'engine.sampler',
+        'engine.servers',
+        'engine.startup',
+        'engine.terminal',
+        'engine.timing',
+        'engine.updater',
+        'engine.versions',
+        'engine.watcher',
         'PIL',
         'PIL.Image',
         'PIL.ImageTk',
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Compare game startup with and without an AppCDS class data archive.
+
+Needs an installed version and a Java 13+ runtime. Each run starts the game
+in offline mode, measures the time to the first log line and, when a display
+is available, to the game window, then asks the game to exit. The first run
+with ``-XX:ArchiveClassesAtExit`` builds the archive in a temporary directory;
+the archive runs map it with ``-XX:SharedArchiveFile``.
+
+    python benchmarks/bench_cds.py 1.20.4 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.cds import ClassDataArchives, resolve_java  # noqa: E402
+from engine.config import MINECRAFT_DIR  # noqa: E402
+from engine.launch import GameLauncher  # noqa: E402
+from engine.process import FIRST_WINDOW_MARKERS, spawn_game  # noqa: E402
+
+
+def timed_start(command, cwd, timeout):
+    """(seconds to first log line, seconds to window or None) for one game start"""
+    t0 = time.perf_counter()
+    process = spawn_game(command, cwd)
+    threading.Thread(target=process.stderr.read, daemon=True).start()
+    first_line = first_window = None
+    deadline = threading.Timer(timeout, process.terminate)
+    deadline.start()
+    for line in process.stdout:
+        elapsed = time.perf_counter() - t0
+        if first_line is None:
+            first_line = elapsed
+        if any(marker in line for marker in FIRST_WINDOW_MARKERS):
+            first_window = elapsed
+            break
+    deadline.cancel()
+    # A normal JVM shutdown (SIGTERM) is what lets -XX:ArchiveClassesAtExit write the archive
+    process.terminate()
+    threading.Thread(target=process.stdout.read, daemon=True).start()
+    process.wait()
+    return first_line, first_window
+
+
+def report(label, results):
+    lines = [r[0] for r in results if r[0] is not None]
+    windows = [r[1] for r in results if r[1] is not None]
+    text = f"{label:<16} first log line {statistics.median(lines) * 1000:7.0f} ms" if lines else f"{label:<16} no output"
+    if windows:
+        text += f", window {statistics.median(windows) * 1000:7.0f} ms"
+    print(f"{text}  (median of {len(results)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("version")
+    parser.add_argument("--minecraft-dir", default=MINECRAFT_DIR)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the window before stopping a run")
+    args = parser.parse_args()
+
+    launcher = GameLauncher(args.minecraft_dir, {}, lambda text: None)
+    if not launcher.is_installed(args.version):
+        sys.exit(f"{args.version} is not installed in {args.minecraft_dir}")
+    command = launcher.generate_command(args.version, launcher.get_login_options("Benchmark"))
+    java = resolve_java(command[0])
+    archives = ClassDataArchives(tempfile.mkdtemp(prefix="omni-cds-"))
+    java_version = archives.java_version(java) if java else None
+    if not java_version or java_version < 13:
+        sys.exit(f"Java 13+ is needed for dynamic archives (found {java_version or 'none'})")
+
+    archive = os.path.join(archives.root, "bench.jsa")
+    with_args = command[:1] + [f"-XX:SharedArchiveFile={archive}"] + command[1:]
+
+    report("no archive", [timed_start(command, args.minecraft_dir, args.timeout) for _ in range(args.runs)])
+    t0 = time.perf_counter()
+    timed_start(command[:1] + [f"-XX:ArchiveClassesAtExit={archive}"] + command[1:], args.minecraft_dir, args.timeout)
+    if not os.path.exists(archive):
+        sys.exit("The JVM did not write a class data archive")
+    print(f"Archive run      {time.perf_counter() - t0:7.1f} s, archive {os.path.getsize(archive) / 1024 / 1024:.1f} MB")
+    report("with archive", [timed_start(with_args, args.minecraft_dir, args.timeout) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the progress event bus.
+
+Worker threads publish progress and log lines the way a version install does.
+The old path scheduled one UI callback per event; with the bus the UI drains
+once per frame. Publishing cost is reported per event, and the number of UI
+callbacks for both paths. When a display is available, the old path is timed
+with real ``root.after(0, ...)`` calls, otherwise with a queue stand-in.
+
+    python benchmarks/bench_events.py --events 200000 --threads 16
+"""
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.events import FRAME_RATE, EventBus  # noqa: E402
+
+
+def run_workers(threads, events, publish):
+    per_thread = events // threads
+
+    def work(worker):
+        for i in range(per_thread):
+            if i % 50 == 0:
+                publish("log", f"worker {worker}: file {i}")
+            else:
+                publish("progress", i)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, per_thread * threads
+
+
+def bench_bus(threads, events):
+    bus = EventBus()
+    frames = []
+    stop = threading.Event()
+
+    def ui_loop():
+        while not stop.is_set():
+            time.sleep(1 / FRAME_RATE)
+            t0 = time.perf_counter()
+            frame = bus.drain()
+            frames.append((time.perf_counter() - t0, len(frame.lines) + len(frame.progress)))
+
+    ui = threading.Thread(target=ui_loop)
+    ui.start()
+
+    def publish(kind, value):
+        if kind == "log":
+            bus.log(value)
+        else:
+            bus.progress("install", value, events)
+
+    seconds, count = run_workers(threads, events, publish)
+    stop.set()
+    ui.join()
+    frames.append((0, len(bus.drain().lines)))
+    return seconds, count, frames
+
+
+def bench_per_event_callbacks(threads, events):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        schedule, label = (lambda func: root.after(0, func)), "root.after(0, ...)"
+    except Exception:
+        root = None
+        pending = queue.SimpleQueue()
+        schedule, label = pending.put, "queue stand-in"
+
+    def publish(kind, value):
+        schedule(lambda: value)
+
+    seconds, count = run_workers(threads, events, publish)
+    if root is not None:
+        root.destroy()
+    return seconds, count, label
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    seconds, count, frames = bench_bus(args.threads, args.events)
+    drain_us = sum(t for t, _ in frames) / max(len(frames), 1) * 1e6
+    print(f"Event bus: {seconds / count * 1e9:7.0f} ns/event, {count} events -> {len(frames)} UI frames "
+          f"(avg drain {drain_us:.0f} us)")
+
+    seconds, count, label = bench_per_event_callbacks(args.threads, args.events)
+    print(f"Per-event callbacks ({label}): {seconds / count * 1e9:7.0f} ns/event, {count} events -> {count} UI callbacks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Benchmark the parallel installer against sequential downloads.
+
+A local HTTP server stands in for Mojang's servers: it serves a synthetic
+version JSON, libraries and an asset index with many small objects, adding a
+fixed delay to every request to imitate network round-trip time. The last
+run installs into a second game directory that shares an object store with
+the first, which is what a machine with several instances sees.
+
+    python benchmarks/bench_install.py --assets 2000 --latency 0.02
+"""
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine.install import VersionInstaller  # noqa: E402
+from engine.objects import ObjectStore  # noqa: E402
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, files, latency):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.files = files
+        self.latency = latency
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, delayed ACKs stall keep-alive connections
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = self.server.files.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def build_fixture(asset_count, library_count, asset_size):
+    """Files served by the stand-in, keyed by path, plus a version JSON factory"""
+    files = {}
+    objects = {}
+    for i in range(asset_count):
+        body = os.urandom(asset_size)
+        digest = hashlib.sha1(body).hexdigest()
+        files[f"/resources/{digest[:2]}/{digest}"] = body
+        objects[f"minecraft/sounds/{i}.ogg"] = {"hash": digest, "size": len(body)}
+    index = json.dumps({"objects": objects}).encode()
+    files["/indexes/bench.json"] = index
+
+    def version_json(base_url):
+        libraries = []
+        for i in range(library_count):
+            body = files.setdefault(f"/libraries/bench/lib{i}/1.0/lib{i}-1.0.jar", os.urandom(64 * 1024))
+            libraries.append({"name": f"bench:lib{i}:1.0", "downloads": {"artifact": {
+                "path": f"bench/lib{i}/1.0/lib{i}-1.0.jar", "url": f"{base_url}/libraries/bench/lib{i}/1.0/lib{i}-1.0.jar",
+                "sha1": hashlib.sha1(body).hexdigest(), "size": len(body)}}})
+        client = files.setdefault("/client.jar", os.urandom(1024 * 1024))
+        return {
+            "id": "bench", "type": "release", "releaseTime": "2024-01-01T00:00:00+00:00",
+            "assets": "bench",
+            "assetIndex": {"id": "bench", "url": f"{base_url}/indexes/bench.json", "sha1": hashlib.sha1(index).hexdigest(), "size": len(index)},
+            "downloads": {"client": {"url": f"{base_url}/client.jar", "sha1": hashlib.sha1(client).hexdigest(), "size": len(client)}},
+            "libraries": libraries,
+        }
+
+    return files, version_json
+
+
+def sequential_install(minecraft_dir, tasks):
+    """The old path: one requests.get per file, one file at a time, no shared connection"""
+    for task in tasks:
+        os.makedirs(os.path.dirname(task.path), exist_ok=True)
+        response = requests.get(task.url, stream=True, timeout=30)
+        response.raise_for_status()
+        with open(task.path, "wb") as f:
+            shutil.copyfileobj(response.raw, f)
+        if task.sha1 and hashlib.sha1(open(task.path, "rb").read()).hexdigest() != task.sha1:
+            raise RuntimeError(f"Checksum mismatch for {task.url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=2000)
+    parser.add_argument("--libraries", type=int, default=60)
+    parser.add_argument("--asset-size", type=int, default=4096)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every request")
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    files, version_json = build_fixture(args.assets, args.libraries, args.asset_size)
+    server = StandInServer(files, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    data = json.dumps(version_json(base_url)).encode()
+    files["/versions/bench.json"] = data
+    manifest = {"versions": [{"id": "bench", "url": f"{base_url}/versions/bench.json", "sha1": hashlib.sha1(data).hexdigest()}]}
+
+    def fresh_installer(workers, store=None):
+        minecraft_dir = tempfile.mkdtemp(prefix="bench_install_")
+        return minecraft_dir, VersionInstaller(minecraft_dir, max_workers=workers, resources_url=f"{base_url}/resources",
+                                               manifest=manifest, store=store)
+
+    print(f"{args.assets} assets, {args.libraries} libraries, {args.latency * 1000:.0f} ms per request")
+    results = {}
+    try:
+        minecraft_dir, installer = fresh_installer(1)
+        _, tasks, _ = installer.resolve_plan("bench")
+        shutil.rmtree(minecraft_dir)
+        minecraft_dir = tempfile.mkdtemp(prefix="bench_install_")
+        start = time.perf_counter()
+        sequential_install(minecraft_dir, tasks)
+        results["sequential requests.get"] = time.perf_counter() - start
+        shutil.rmtree(minecraft_dir)
+
+        for label, workers in (("pooled, 1 worker", 1), (f"pooled, {args.workers} workers", args.workers)):
+            minecraft_dir, installer = fresh_installer(workers)
+            start = time.perf_counter()
+            installer.install("bench")
+            results[label] = time.perf_counter() - start
+            shutil.rmtree(minecraft_dir)
+
+        store = ObjectStore(tempfile.mkdtemp(prefix="bench_store_"))
+        first_dir, installer = fresh_installer(args.workers, store)
+        installer.install("bench")
+        second_dir, installer = fresh_installer(args.workers, store)
+        start = time.perf_counter()
+        installer.install("bench")
+        results["shared store, 2nd game dir"] = time.perf_counter() - start
+        stats = store.stats()
+        for path in (first_dir, second_dir, store.root):
+            shutil.rmtree(path)
+    finally:
+        server.shutdown()
+
+    baseline = results["sequential requests.get"]
+    for label, seconds in results.items():
+        print(f"{label:>28}: {seconds:7.2f} s  ({baseline / seconds:5.1f}x)")
+    print(f"Shared store: {stats['objects']} objects ({stats['bytes'] / 1024 / 1024:.1f} MB) "
+          f"linked {stats['links']} times across {stats['game_dirs']} game directories")
+
+
+if __name__ == "__main__":
+    main()
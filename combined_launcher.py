@@ -1,14 +1,23 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from PIL import Image, ImageTk, ImageDraw
-import os, threading, json, uuid, subprocess, requests, io, traceback, sys, time, minecraft_launcher_lib, webbrowser, shutil, zipfile, datetime, tempfile
-
-# === Constants ===
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
-MINECRAFT_DIR = minecraft_launcher_lib.utils.get_minecraft_directory()
-LAUNCHER_NAME = "OmniLauncher"
-LAUNCHER_VERSION = "1.6.0"
+import os, threading, json, subprocess, requests, io, traceback, sys, minecraft_launcher_lib, webbrowser
+
+# === Engine ===
+_engine_t0 = time.perf_counter()
+from engine import (
+    AUTO_PRESET, AccountSessionManager, MICROSOFT_CLIENT_ID, MICROSOFT_REDIRECT_URI,
+    CONFIG_FILE, LAUNCHER_NAME, LAUNCHER_VERSION, MINECRAFT_DIR, SCRIPT_DIR, load_json, save_json,
+    BackupManager, EventBus, FRAME_RATE, GameLauncher, JVMPresetManager, JVM_ARG_EXPLANATIONS, JVM_PRESETS,
+    ModManager, ModpackImporter, ProcessSampler, mod_resolver, ServerManager, parse_cpu_list, parse_mod_urls, StartupPipeline, StartupTimer, TERMINAL_CAPACITY, TerminalBuffer, Updater, VERSION_TYPES, get_latest_release, get_version_catalog, get_version_info, load_version_catalog,
+    format_overlap, format_span_summary, launch_timing_summary, progress_percent,
+)
+startup_timer = StartupTimer(STARTUP_T0)
+startup_timer.record("engine_import", (time.perf_counter() - _engine_t0) * 1000)
+
 ICON = os.path.join(SCRIPT_DIR, "launcher.ico")
 
 # === Logging Setup ===
@@ -59,13 +68,6 @@ THEMES = {
 }
 
 # === Load config ===
-def load_json(file, default):
-    return json.load(open(file, "r", encoding="utf-8")) if os.path.exists(file) else default
-
-def save_json(file, data):
-    with open(file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
 def save_config():
     """Save the current config_data to file"""
     try:
@@ -74,24 +76,10 @@ def save_config():
     except Exception as e:
         append_terminal(f"Failed to save configuration: {e}")
 
-config_data = load_json(CONFIG_FILE, {})
+with startup_timer.phase("config_load"):
+    config_data = load_json(CONFIG_FILE, {})
 selected_skin_path = None
 
-# Validate Microsoft login
-if "microsoft_login" in config_data:
-    try:
-        valid = minecraft_launcher_lib.microsoft_account.validate_login(config_data["microsoft_login"])
-        if valid:
-            config_data["microsoft_login"] = valid
-        else:
-            config_data.pop("microsoft_login", None)
-    except Exception:
-        config_data.pop("microsoft_login", None)
-
-# === UUID for offline users ===
-def offline_uuid(username):
-    return str(uuid.uuid3(uuid.NAMESPACE_DNS, f"OfflinePlayer:{username}"))
-
 # === Thread-Safe UI Updates ===
 def thread_safe_ui_update(func):
     """Decorator to make UI updates thread-safe"""
@@ -124,62 +112,7 @@ def clear_image_cache():
     global image_cache
     image_cache.clear()
 
-# === Command Caching ===
-command_cache = {}
-MAX_COMMAND_CACHE_SIZE = 50
-
-def cache_command(version, options_key, command):
-    """Cache generated Minecraft commands"""
-    global command_cache
-    cache_key = f"{version}_{options_key}"
-    if len(command_cache) >= MAX_COMMAND_CACHE_SIZE:
-        # Remove oldest entry
-        oldest_key = next(iter(command_cache))
-        del command_cache[oldest_key]
-    command_cache[cache_key] = command
-
-def get_cached_command(version, options_key):
-    """Get cached command if available"""
-    cache_key = f"{version}_{options_key}"
-    return command_cache.get(cache_key)
-
-# === Version List Caching ===
-version_cache = {}
-VERSION_CACHE_DURATION = 3600  # Cache for 1 hour (3600 seconds)
-
-def get_cached_versions():
-    """Get cached version list or fetch new one if cache is expired"""
-    global version_cache
-    current_time = time.time()
-
-    # Check if cache exists and is not expired
-    if 'versions' in version_cache and 'timestamp' in version_cache:
-        if current_time - version_cache['timestamp'] < VERSION_CACHE_DURATION:
-            return version_cache['versions']
-
-    # Cache expired or doesn't exist, fetch new versions
-    try:
-        versions = [v["id"] for v in minecraft_launcher_lib.utils.get_available_versions(MINECRAFT_DIR)]
-        version_cache = {
-            'versions': versions,
-            'timestamp': current_time
-        }
-        return versions
-    except Exception as e:
-        append_terminal(f"Failed to fetch versions: {e}")
-        # Return fallback versions
-        fallback_versions = ["1.20.1", "1.19.4", "1.19.3", "1.18.2", "1.17.1", "1.16.5"]
-        version_cache = {
-            'versions': fallback_versions,
-            'timestamp': current_time
-        }
-        return fallback_versions
-
-def clear_version_cache():
-    """Clear the version cache"""
-    global version_cache
-    version_cache.clear()
-
+# === Minecraft Update Check ===
 def check_for_minecraft_updates():
     """Check for the latest Minecraft version and compare with current selection"""
     def do_check():
@@ -187,19 +120,16 @@ def check_for_minecraft_updates():
             append_terminal("Checking for Minecraft updates...")
 
             # Fetch latest version from Mojang API
-            response = requests.get("https://launchermeta.mojang.com/mc/game/version_manifest.json", timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-            latest_release = data["latest"]["release"]
+            latest_release = get_latest_release(refresh=True)
 
             current_version = version_var.get()
 
             append_terminal(f"Latest Minecraft version: {latest_release}")
             append_terminal(f"Current selected version: {current_version}")
 
-            # Compare versions (simple string comparison for now)
-            if latest_release != current_version:
+            # Compare by release order; modded versions compare as the version they build on
+            catalog = get_version_catalog(MINECRAFT_DIR, network=False)
+            if catalog.compare(latest_release, current_version) > 0:
                 if messagebox.askyesno("Minecraft Update Available",
                                       f"A new Minecraft version is available!\n\n"
                                       f"Latest: {latest_release}\n"
@@ -222,178 +152,60 @@ def check_for_minecraft_updates():
 # === Terminal ===
 terminal_output = None  # Will be initialized later
 
-@thread_safe_ui_update
+# Workers publish into the bus; drain_events applies it to the UI once per frame
+event_bus = EventBus()
+FRAME_MS = 1000 // FRAME_RATE
+PROGRESS_LOG_FORMATS = {
+    "install": "Download progress: {percent}% ({current}/{total} bytes)",
+    "mods": "Mod downloads: {percent}% ({current}/{total} bytes)",
+}
+shown_progress = {}
+terminal_buffer = TerminalBuffer(config_data.get("terminal_lines", TERMINAL_CAPACITY))
+
 def append_terminal(text):
-    if terminal_output:
+    """Queue a terminal line; safe from any thread"""
+    event_bus.log(text)
+
+def drain_events():
+    """Batch everything published since the last frame into one terminal insert and one progress update"""
+    try:
+        render_frame(event_bus.drain())
+    except Exception:
+        # One bad frame must not stop the loop; later lines and progress would be lost
+        logger.exception("Failed to render terminal frame")
+    finally:
+        root.after(FRAME_MS, drain_events)
+
+def render_frame(frame):
+    lines = frame.lines
+    for key, progress in frame.progress.items():
+        percent = progress_percent(progress)
+        if percent is None or shown_progress.get(key) == percent:
+            continue
+        shown_progress[key] = percent
+        progress_var.set(percent)
+        if key in PROGRESS_LOG_FORMATS:
+            lines.append(PROGRESS_LOG_FORMATS[key].format(percent=percent, current=progress.current, total=progress.total))
+    if lines and terminal_output:
+        terminal_buffer.extend(lines)
+        trim, text = terminal_buffer.flush()
         terminal_output.config(state="normal")
-        terminal_output.insert("end", str(text) + "\n")
+        if trim:
+            terminal_output.delete("1.0", f"{trim + 1}.0")
+        terminal_output.insert("end", text)
         terminal_output.see("end")
         terminal_output.config(state="disabled")
 
 @thread_safe_ui_update
 def clear_terminal():
     if terminal_output:
+        terminal_buffer.clear()
         terminal_output.config(state="normal")
         terminal_output.delete("1.0", "end")
         terminal_output.config(state="disabled")
         append_terminal("Terminal cleared.")
 
-# === Mods.py content ===
-import time
-
-class ModManager:
-    def __init__(self, minecraft_dir, config_data, append_terminal_callback, save_config_callback=None):
-        self.minecraft_dir = minecraft_dir
-        self.config_data = config_data
-        self.append_terminal = append_terminal_callback
-        self.save_config = save_config_callback
-        self.mods_dir = os.path.join(minecraft_dir, "mods")
-        self.mod_list = self.config_data.get("mod_list", [])
-
-        # Ensure mods directory exists
-        os.makedirs(self.mods_dir, exist_ok=True)
-
-    def get_mods_list(self):
-        """Get list of installed mods"""
-        if not os.path.exists(self.mods_dir):
-            return []
-        return [f for f in os.listdir(self.mods_dir) if f.endswith('.jar')]
-
-    def install_mod_from_file(self, file_path):
-        """Install a mod from a local file"""
-        try:
-            if not file_path.endswith('.jar'):
-                raise ValueError("Only .jar files are supported")
-
-            filename = os.path.basename(file_path)
-
-            # Scan mod file for loader and version
-            loader = 'Unknown'
-            mod_version = 'Unknown'
-            try:
-                with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                    if 'META-INF/MANIFEST.MF' in zip_ref.namelist():
-                        with zip_ref.open('META-INF/MANIFEST.MF') as f:
-                            manifest = f.read().decode('utf-8', errors='ignore')
-                            if 'forge' in manifest.lower() or 'fml' in manifest.lower():
-                                loader = 'Forge'
-                            elif 'fabric' in manifest.lower():
-                                loader = 'Fabric'
-                            elif 'neoforge' in manifest.lower():
-                                loader = 'NeoForge'
-                            # Try to find version in manifest
-                            for line in manifest.split('\n'):
-                                if line.startswith('Implementation-Version:'):
-                                    mod_version = line.split(':', 1)[1].strip()
-                                    break
-                                elif line.startswith('Specification-Version:'):
-                                    mod_version = line.split(':', 1)[1].strip()
-                                    break
-                self.append_terminal(f"Mod {filename}: Loader {loader}, Version {mod_version}")
-            except Exception as e:
-                self.append_terminal(f"Could not scan mod file {filename}: {e}")
-
-            dest_path = os.path.join(self.mods_dir, filename)
-
-            shutil.copy2(file_path, dest_path)
-            self.append_terminal(f"Mod installed: {filename}")
-
-            # Add to mod list if not already present
-            if filename not in self.mod_list:
-                self.mod_list.append(filename)
-                self.config_data["mod_list"] = self.mod_list
-                if self.save_config:
-                    self.save_config()
-
-            return True
-        except Exception as e:
-            self.append_terminal(f"Failed to install mod: {e}")
-            return False
-
-    def remove_mod(self, mod_name):
-        """Remove a mod"""
-        try:
-            mod_path = os.path.join(self.mods_dir, mod_name)
-            if os.path.exists(mod_path):
-                os.remove(mod_path)
-                self.append_terminal(f"Mod removed: {mod_name}")
-
-                # Remove from mod list
-                if mod_name in self.mod_list:
-                    self.mod_list.remove(mod_name)
-                    self.config_data["mod_list"] = self.mod_list
-                    if self.save_config:
-                        self.save_config()
-
-                return True
-            else:
-                self.append_terminal(f"Mod not found: {mod_name}")
-                return False
-        except Exception as e:
-            self.append_terminal(f"Failed to remove mod: {e}")
-            return False
-
-    def download_mod_from_url(self, url, filename=None):
-        """Download and install a mod from URL"""
-        try:
-            if not filename:
-                filename = os.path.basename(url)
-                if not filename.endswith('.jar'):
-                    filename += '.jar'
-
-            dest_path = os.path.join(self.mods_dir, filename)
-
-            self.append_terminal(f"Downloading mod from: {url}")
-
-            # Download with progress
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-
-            with open(dest_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-
-            self.append_terminal(f"Mod downloaded: {filename}")
-
-            # Add to mod list if not already present
-            if filename not in self.mod_list:
-                self.mod_list.append(filename)
-                self.config_data["mod_list"] = self.mod_list
-                if self.save_config:
-                    self.save_config()
-
-            return True
-        except Exception as e:
-            self.append_terminal(f"Failed to download mod: {e}")
-            return False
-
-    def search_mods(self, query):
-        """Search for mods in the installed list"""
-        if not query:
-            return self.get_mods_list()
-        return [mod for mod in self.get_mods_list() if query.lower() in mod.lower()]
-
-    def get_mod_info(self, mod_name):
-        """Get basic info about a mod file"""
-        try:
-            mod_path = os.path.join(self.mods_dir, mod_name)
-            if os.path.exists(mod_path):
-                stat = os.stat(mod_path)
-                return {
-                    "name": mod_name,
-                    "size": f"{stat.st_size / 1024:.1f} KB",
-                    "modified": time.ctime(stat.st_mtime)
-                }
-            return None
-        except Exception as e:
-            self.append_terminal(f"Failed to get mod info: {e}")
-            return None
-
+# === Mods Tab UI ===
 def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback, current_theme, save_config_callback=None):
     """Create the Mods tab with improved UI and functionality"""
     try:
@@ -409,7 +221,7 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
                  bg=current_theme["bg"], fg=current_theme["fg"]).pack(pady=(20, 10))
 
         # Mod Manager instance
-        mod_manager = ModManager(minecraft_dir, config_data, append_terminal_callback)
+        mod_manager = ModManager(minecraft_dir, config_data, append_terminal_callback, save_config_callback)
         append_terminal_callback(f"DEBUG: ModManager created. Mods dir: {mod_manager.mods_dir}")
         append_terminal_callback(f"DEBUG: Initial mod list: {mod_manager.mod_list}")
     except Exception as e:
@@ -452,7 +264,7 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
     url_frame = tk.Frame(tab_mods, bg=current_theme["bg"])
     url_frame.pack(fill="x", padx=20, pady=(0, 10))
 
-    tk.Label(url_frame, text="Download from URL:", bg=current_theme["bg"], fg=current_theme["fg"]).pack(anchor="w")
+    tk.Label(url_frame, text="Download from URL (several separated by spaces):", bg=current_theme["bg"], fg=current_theme["fg"]).pack(anchor="w")
     url_var = tk.StringVar()
     url_entry = tk.Entry(url_frame, textvariable=url_var, bg=current_theme["entry_bg"], fg=current_theme["entry_fg"])
     url_entry.pack(fill="x", pady=(0, 5))
@@ -480,21 +292,48 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
             else:
                 messagebox.showerror("Error", "Failed to install mod.")
 
-    def download_mod():
-        url = url_var.get().strip()
-        if not url:
-            messagebox.showwarning("Warning", "Please enter a URL.")
-            return
+    def download_mods_in_background(urls):
+        """Download urls on a worker thread; progress goes through the event bus, dialogs back on the Tk thread"""
+        def report(done, total, files_done, files_total):
+            event_bus.progress("mods", done, total)
 
         def download_thread():
-            if mod_manager.download_mod_from_url(url):
-                refresh_mods_list()
-                messagebox.showinfo("Success", "Mod downloaded and installed successfully!")
+            installed, failed = mod_manager.download_mods(urls, progress=report)
+            tab_mods.after(0, refresh_mods_list)
+            if failed:
+                tab_mods.after(0, lambda: messagebox.showerror(
+                    "Error", f"{len(failed)} of {len(urls)} mods failed to download:\n\n"
+                    + "\n".join(url for url, _ in failed[:10])))
             else:
-                messagebox.showerror("Error", "Failed to download mod.")
+                tab_mods.after(0, lambda: messagebox.showinfo("Success", f"{len(installed)} mods downloaded and installed!"))
 
         threading.Thread(target=download_thread, daemon=True).start()
 
+    def download_mod():
+        urls = parse_mod_urls(url_var.get())
+        if not urls:
+            messagebox.showwarning("Warning", "Please enter one or more http(s) URLs.")
+            return
+        download_mods_in_background(urls)
+
+    def download_mod_list():
+        file_path = filedialog.askopenfilename(
+            title="Select Mod URL List",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                urls = parse_mod_urls(f.read())
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to read {file_path}: {e}")
+            return
+        if not urls:
+            messagebox.showwarning("Warning", "No http(s) URLs found in the file.")
+            return
+        download_mods_in_background(urls)
+
     def remove_selected_mod():
         selection = mods_listbox.curselection()
         if not selection:
@@ -519,10 +358,83 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
         info = mod_manager.get_mod_info(mod_name)
         if info:
             info_text = f"Name: {info['name']}\nSize: {info['size']}\nModified: {info['modified']}"
+            if info.get("mod_id"):
+                info_text += (f"\nID: {info['mod_id']}  Version: {info['version'] or 'Unknown'}  Loader: {info['loader'] or 'Unknown'}"
+                              f"\nMinecraft: {info['minecraft'] or 'any'}")
+                if info["dependencies"]:
+                    info_text += f"\nRequires: {', '.join(info['dependencies'])}"
+            elif info.get("error"):
+                info_text += f"\nCould not read metadata: {info['error']}"
             info_label.config(text=info_text)
         else:
             info_label.config(text="Could not retrieve mod info")
 
+    def import_modpack():
+        file_path = filedialog.askopenfilename(
+            title="Select Modpack",
+            filetypes=[("Modpacks", "*.mrpack *.zip"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        keep = not messagebox.askyesno(
+            "Import Modpack", "Move the mods the pack does not include to a backup folder?\n\n"
+            "Choose No to keep them next to the pack's mods.")
+
+        def import_thread():
+            importer = ModpackImporter(minecraft_dir, config_data, append_terminal_callback, save_config_callback)
+            try:
+                result = importer.import_pack(
+                    file_path, progress=lambda done, total, files_done, files_total: event_bus.progress("mods", done, total),
+                    replace_mods=not keep)
+            except Exception as e:
+                message = f"Modpack import failed: {e}"
+                append_terminal_callback(message)
+                tab_mods.after(0, lambda: messagebox.showerror("Error", message))
+                return
+            mod_manager.mod_list = config_data.get("mod_list", [])
+
+            def done():
+                refresh_mods_list()
+                if result["version"]:
+                    version_var.set(result["version"])
+                    refresh_versions()
+                messagebox.showinfo("Success", f"Modpack {result['name']} imported: {result['files']} files downloaded"
+                                    + (f", version {result['version']} selected." if result["version"] else "."))
+            tab_mods.after(0, done)
+
+        threading.Thread(target=import_thread, daemon=True).start()
+
+    def check_mods():
+        """Check the mods folder against the selected version on a worker thread"""
+        version = version_var.get()
+        if not version:
+            messagebox.showwarning("Warning", "Please select a version first.")
+            return
+
+        def check_thread():
+            try:
+                result = mod_resolver.check_version(version, minecraft_dir)
+            except Exception as e:
+                message = f"Mod check failed: {e}"
+                append_terminal_callback(message)
+                tab_mods.after(0, lambda: messagebox.showerror("Error", message))
+                return
+            issues = list(result["issues"])
+            overlaps = mod_manager.find_class_overlaps()
+            for overlap in (overlaps or {}).get("overlaps", []):
+                issues.append({"severity": "warning", "message": format_overlap(overlap)})
+            if issues:
+                text = "\n".join(f"[{issue['severity']}] {issue['message']}" for issue in issues[:20])
+                if len(issues) > 20:
+                    text += f"\n... and {len(issues) - 20} more (see terminal)"
+                for issue in issues:
+                    append_terminal_callback(f"Mod check {issue['severity']}: {issue['message']}")
+                tab_mods.after(0, lambda: messagebox.showwarning("Mod Check", f"{len(issues)} problem(s) for {version}:\n\n{text}"))
+            else:
+                tab_mods.after(0, lambda: messagebox.showinfo("Mod Check", f"{result['mods']} mods, no problems found for {version}."))
+
+        threading.Thread(target=check_thread, daemon=True).start()
+
     def open_mods_folder():
         try:
             os.startfile(mod_manager.mods_dir)
@@ -530,6 +442,9 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
             append_terminal_callback(f"Error opening mods folder: {e}")
             messagebox.showerror("Error", f"Failed to open mods folder: {e}")
 
+    # Jars added, removed or replaced on disk (also by hand) refresh the list without touching the disk per keystroke
+    mod_manager.start_watching(lambda events: tab_mods.after(0, refresh_mods_list))
+
     # Bind events
     search_var.trace("w", lambda *args: refresh_mods_list())
     mods_listbox.bind('<<ListboxSelect>>', lambda *args: show_mod_info())
@@ -539,8 +454,14 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
               bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
     tk.Button(buttons_frame, text="Download from URL", command=download_mod,
               bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
+    tk.Button(buttons_frame, text="Download List...", command=download_mod_list,
+              bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
+    tk.Button(buttons_frame, text="Import Modpack...", command=import_modpack,
+              bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
     tk.Button(buttons_frame, text="Remove Selected", command=remove_selected_mod,
               bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
+    tk.Button(buttons_frame, text="Check Mods", command=check_mods,
+              bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
     tk.Button(buttons_frame, text="Refresh List", command=refresh_mods_list,
               bg=current_theme["button_bg"], fg=current_theme["button_fg"]).pack(side="left", padx=(0, 10))
     tk.Button(buttons_frame, text="Open Mods Folder", command=open_mods_folder,
@@ -551,131 +472,7 @@ def create_mods_tab(parent, minecraft_dir, config_data, append_terminal_callback
 
     return tab_mods
 
-# === updater.py content ===
-class Updater:
-    def __init__(self, current_version, launcher_name, append_terminal_callback):
-        self.current_version = current_version
-        self.launcher_name = launcher_name
-        self.append_terminal = append_terminal_callback
-        self.github_repo = "your-github-username/omnilancher"  # Replace with actual GitHub repo
-        self.update_url = f"https://api.github.com/repos/{self.github_repo}/releases/latest"
-
-    def check_for_updates(self):
-        """Check for updates from GitHub releases"""
-        try:
-            self.append_terminal("Checking for launcher updates...")
-            response = requests.get(self.update_url, timeout=10)
-            response.raise_for_status()
-
-            release_data = response.json()
-            latest_version = release_data["tag_name"].lstrip('v')
-            download_url = None
-
-            # Find the appropriate asset (assuming it's a zip file)
-            for asset in release_data.get("assets", []):
-                if asset["name"].endswith(".zip"):
-                    download_url = asset["browser_download_url"]
-                    break
-
-            if not download_url:
-                # Fallback to source code zip
-                download_url = release_data["zipball_url"]
-
-            return {
-                "latest_version": latest_version,
-                "download_url": download_url,
-                "changelog": release_data.get("body", "No changelog available"),
-                "release_url": release_data["html_url"]
-            }
-
-        except Exception as e:
-            self.append_terminal(f"Failed to check for updates: {e}")
-            return None
-
-    def download_and_install_update(self, update_info):
-        """Download and install the update"""
-        try:
-            self.append_terminal("Downloading update...")
-
-            # Download the update
-            response = requests.get(update_info["download_url"], timeout=60)
-            response.raise_for_status()
-
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as temp_file:
-                temp_file.write(response.content)
-                temp_path = temp_file.name
-
-            self.append_terminal("Extracting update...")
-
-            # Extract to temporary directory
-            extract_dir = tempfile.mkdtemp()
-            with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-
-            # Find the main directory (GitHub releases might have extra folder)
-            contents = os.listdir(extract_dir)
-            if len(contents) == 1 and os.path.isdir(os.path.join(extract_dir, contents[0])):
-                source_dir = os.path.join(extract_dir, contents[0])
-            else:
-                source_dir = extract_dir
-
-            # Get current launcher directory
-            current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-            # Backup current version
-            backup_dir = os.path.join(current_dir, "backup")
-            if os.path.exists(backup_dir):
-                shutil.rmtree(backup_dir)
-            shutil.copytree(current_dir, backup_dir, ignore=shutil.ignore_patterns("backup", "__pycache__", "*.pyc"))
-
-            self.append_terminal("Installing update...")
-
-            # Copy new files (excluding certain files)
-            exclude_files = {"config.json", "logs", "screenshots", ".git"}
-            for item in os.listdir(source_dir):
-                if item in exclude_files:
-                    continue
-
-                source_path = os.path.join(source_dir, item)
-                dest_path = os.path.join(current_dir, item)
-
-                if os.path.isdir(source_path):
-                    if os.path.exists(dest_path):
-                        shutil.rmtree(dest_path)
-                    shutil.copytree(source_path, dest_path)
-                else:
-                    shutil.copy2(source_path, dest_path)
-
-            # Clean up
-            os.unlink(temp_path)
-            shutil.rmtree(extract_dir)
-
-            self.append_terminal("Update installed successfully!")
-            return True
-
-        except Exception as e:
-            self.append_terminal(f"Failed to install update: {e}")
-            return False
-
-    def compare_versions(self, version1, version2):
-        """Compare two version strings"""
-        def parse_version(v):
-            return [int(x) for x in v.split('.')]
-
-        try:
-            v1_parts = parse_version(version1)
-            v2_parts = parse_version(version2)
-
-            # Pad shorter version with zeros
-            max_len = max(len(v1_parts), len(v2_parts))
-            v1_parts.extend([0] * (max_len - len(v1_parts)))
-            v2_parts.extend([0] * (max_len - len(v2_parts)))
-
-            return (v1_parts > v2_parts) - (v1_parts < v2_parts)
-        except:
-            return 0  # Assume equal if parsing fails
-
+# === Updater Section UI ===
 def create_updater_section(parent, current_version, launcher_name, append_terminal_callback, current_theme):
     """Create the updater section for settings tab"""
     updater = Updater(current_version, launcher_name, append_terminal_callback)
@@ -720,61 +517,7 @@ def create_updater_section(parent, current_version, launcher_name, append_termin
 
     return update_frame
 
-# === servers.py content ===
-class ServerManager:
-    def __init__(self, config_data, append_terminal_callback):
-        self.config_data = config_data
-        self.append_terminal = append_terminal_callback
-        self.servers = self.config_data.get("servers", [])
-
-    def add_server(self, name, ip, port="25565"):
-        """Add a new server to the list"""
-        server = {
-            "name": name,
-            "ip": ip,
-            "port": port
-        }
-
-        # Check if server already exists
-        for existing in self.servers:
-            if existing["ip"] == ip and existing["port"] == port:
-                return False, "Server already exists"
-
-        self.servers.append(server)
-        self.config_data["servers"] = self.servers
-        return True, "Server added successfully"
-
-    def remove_server(self, index):
-        """Remove a server from the list"""
-        if 0 <= index < len(self.servers):
-            removed = self.servers.pop(index)
-            self.config_data["servers"] = self.servers
-            return True, f"Server '{removed['name']}' removed"
-        return False, "Invalid server index"
-
-    def get_servers_list(self):
-        """Get formatted list of servers"""
-        return [f"{server['name']} ({server['ip']}:{server['port']})" for server in self.servers]
-
-    def get_server_details(self, index):
-        """Get server details by index"""
-        if 0 <= index < len(self.servers):
-            return self.servers[index]
-        return None
-
-    def ping_server(self, ip, port):
-        """Ping a server to check if it's online"""
-        try:
-            # This is a basic implementation - in a real scenario you'd use proper Minecraft server pinging
-            import socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex((ip, int(port)))
-            sock.close()
-            return result == 0
-        except:
-            return False
-
+# === Servers Tab UI ===
 def create_servers_tab(parent, config_data, append_terminal_callback, current_theme, launch_callback):
     """Create the servers management tab"""
     try:
@@ -905,80 +648,7 @@ def create_servers_tab(parent, config_data, append_terminal_callback, current_th
 
     return tab_servers
 
-# === jvm_presets.py content ===
-JVM_PRESETS = {
-    "Default": {
-        "args": "",
-        "description": "No custom JVM arguments - uses Minecraft defaults"
-    },
-    "Performance": {
-        "args": "-Xmx4G -Xms4G -XX:+UseG1GC -XX:+UnlockExperimentalVMOptions -XX:+DisableExplicitGC -XX:+UseAdaptiveGCBoundary -XX:MaxGCPauseMillis=100 -XX:+UseStringDeduplication -XX:+UseCompressedOops -XX:+OptimizeStringConcat -XX:+UseFastAccessorMethods",
-        "description": "Optimized for performance with G1GC and memory management"
-    },
-    "Low Memory": {
-        "args": "-Xmx2G -Xms1G -XX:+UseSerialGC -XX:+OptimizeStringConcat",
-        "description": "Minimal memory usage for low-end systems"
-    },
-    "High Performance": {
-        "args": "-Xmx8G -Xms4G -XX:+UseG1GC -XX:+UnlockExperimentalVMOptions -XX:+DisableExplicitGC -XX:G1NewSizePercent=20 -XX:G1ReservePercent=20 -XX:MaxGCPauseMillis=50 -XX:G1HeapRegionSize=32M -XX:+UseStringDeduplication -XX:+UseCompressedOops -XX:+OptimizeStringConcat -XX:+UseFastAccessorMethods -XX:+AggressiveOpts",
-        "description": "High-performance settings for powerful systems with 8GB+ RAM"
-    },
-    "Debug": {
-        "args": "-Xmx4G -Xms2G -XX:+UnlockDiagnosticVMOptions -XX:+DebugNonSafepoints -XX:+PrintGC -XX:+PrintGCDetails -XX:+PrintGCTimeStamps",
-        "description": "Debug settings with GC logging for troubleshooting"
-    },
-    "Server": {
-        "args": "-Xmx6G -Xms3G -XX:+UseG1GC -XX:MaxGCPauseMillis=200 -XX:+UnlockExperimentalVMOptions -XX:+UseCGroupMemoryLimitForHeap -XX:+UseLargePages -XX:LargePageSizeInBytes=2m",
-        "description": "Server-optimized settings for dedicated server environments"
-    }
-}
-
-JVM_ARG_EXPLANATIONS = {
-    "-Xmx": "Maximum heap size (e.g., -Xmx4G for 4GB)",
-    "-Xms": "Initial heap size (e.g., -Xms2G for 2GB)",
-    "-XX:+UseG1GC": "Use G1 Garbage Collector (recommended for most cases)",
-    "-XX:+UseSerialGC": "Use Serial Garbage Collector (for low memory systems)",
-    "-XX:+UseParallelGC": "Use Parallel Garbage Collector",
-    "-XX:+UseConcMarkSweepGC": "Use Concurrent Mark Sweep Garbage Collector",
-    "-XX:+UnlockExperimentalVMOptions": "Allow experimental JVM options",
-    "-XX:+DisableExplicitGC": "Disable explicit garbage collection calls",
-    "-XX:MaxGCPauseMillis": "Maximum GC pause time in milliseconds",
-    "-XX:+UseStringDeduplication": "Enable string deduplication to save memory",
-    "-XX:+UseCompressedOops": "Use compressed object pointers (64-bit systems)",
-    "-XX:+OptimizeStringConcat": "Optimize string concatenation",
-    "-XX:+UseFastAccessorMethods": "Use fast accessor methods",
-    "-XX:+AggressiveOpts": "Enable aggressive optimizations",
-    "-XX:+PrintGC": "Print GC information",
-    "-XX:+PrintGCDetails": "Print detailed GC information",
-    "-XX:+PrintGCTimeStamps": "Print GC timestamps",
-    "-XX:G1NewSizePercent": "Percentage of heap for young generation (G1GC)",
-    "-XX:G1ReservePercent": "Reserved heap percentage (G1GC)",
-    "-XX:G1HeapRegionSize": "Heap region size for G1GC",
-    "-XX:+UseCGroupMemoryLimitForHeap": "Use cgroup memory limits for heap sizing",
-    "-XX:+UseLargePages": "Use large pages for better performance",
-    "-XX:LargePageSizeInBytes": "Large page size in bytes"
-}
-
-class JVMPresetManager:
-    def __init__(self, current_jvm_args_var, append_terminal_callback):
-        self.current_jvm_args_var = current_jvm_args_var
-        self.append_terminal = append_terminal_callback
-
-    def apply_preset(self, preset_name):
-        """Apply a JVM preset"""
-        if preset_name in JVM_PRESETS:
-            preset = JVM_PRESETS[preset_name]
-            self.current_jvm_args_var.set(preset["args"])
-            self.append_terminal(f"JVM preset '{preset_name}' applied")
-            return True
-        return False
-
-    def get_preset_description(self, preset_name):
-        """Get description for a preset"""
-        if preset_name in JVM_PRESETS:
-            return JVM_PRESETS[preset_name]["description"]
-        return ""
-
+# === JVM Presets Section UI ===
 def create_jvm_presets_section(parent, current_jvm_args_var, append_terminal_callback, current_theme):
     """Create JVM presets section for settings tab"""
     jvm_manager = JVMPresetManager(current_jvm_args_var, append_terminal_callback)
@@ -1015,7 +685,11 @@ def create_jvm_presets_section(parent, current_jvm_args_var, append_terminal_cal
     def apply_preset():
         selected = preset_var.get()
         if jvm_manager.apply_preset(selected):
-            messagebox.showinfo("Success", f"JVM preset '{selected}' applied successfully!")
+            if selected == AUTO_PRESET:
+                messagebox.showinfo("Auto JVM Preset", f"{current_jvm_args_var.get()}\n\n" +
+                                    "\n".join(f"• {reason}" for reason in jvm_manager.auto_reasons))
+            else:
+                messagebox.showinfo("Success", f"JVM preset '{selected}' applied successfully!")
         else:
             messagebox.showerror("Error", "Failed to apply JVM preset.")
 
@@ -1043,145 +717,7 @@ def create_jvm_presets_section(parent, current_jvm_args_var, append_terminal_cal
 
     return presets_frame
 
-# === backup.py content ===
-class BackupManager:
-    def __init__(self, minecraft_dir, config_data, append_terminal_callback):
-        self.minecraft_dir = minecraft_dir
-        self.config_data = config_data
-        self.append_terminal = append_terminal_callback
-        self.backup_dir = os.path.join(os.path.dirname(minecraft_dir), "launcher_backups")
-
-        # Ensure backup directory exists
-        os.makedirs(self.backup_dir, exist_ok=True)
-
-    def create_backup(self, include_mods=True, include_screenshots=True):
-        """Create a backup of launcher data"""
-        try:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"launcher_backup_{timestamp}.zip"
-            backup_path = os.path.join(self.backup_dir, backup_name)
-
-            self.append_terminal("Creating backup...")
-
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Backup config.json
-                config_path = os.path.join(os.path.dirname(self.minecraft_dir), "config.json")
-                if os.path.exists(config_path):
-                    zipf.write(config_path, "config.json")
-                    self.append_terminal("✓ Config backed up")
-
-                # Backup mods if requested
-                if include_mods:
-                    mods_dir = os.path.join(self.minecraft_dir, "mods")
-                    if os.path.exists(mods_dir):
-                        for root, dirs, files in os.walk(mods_dir):
-                            for file in files:
-                                if file.endswith('.jar'):
-                                    file_path = os.path.join(root, file)
-                                    arcname = os.path.join("mods", os.path.relpath(file_path, mods_dir))
-                                    zipf.write(file_path, arcname)
-                        self.append_terminal("✓ Mods backed up")
-
-                # Backup screenshots if requested
-                if include_screenshots:
-                    screenshots_dir = os.path.join(self.minecraft_dir, "screenshots")
-                    if os.path.exists(screenshots_dir):
-                        for root, dirs, files in os.walk(screenshots_dir):
-                            for file in files:
-                                if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                                    file_path = os.path.join(root, file)
-                                    arcname = os.path.join("screenshots", os.path.relpath(file_path, screenshots_dir))
-                                    zipf.write(file_path, arcname)
-                        self.append_terminal("✓ Screenshots backed up")
-
-                # Create backup info file
-                backup_info = {
-                    "timestamp": timestamp,
-                    "minecraft_version": self.config_data.get("last_version", "unknown"),
-                    "launcher_version": self.config_data.get("launcher_version", "unknown"),
-                    "included_mods": include_mods,
-                    "included_screenshots": include_screenshots
-                }
-                zipf.writestr("backup_info.json", json.dumps(backup_info, indent=2))
-
-            self.append_terminal(f"Backup created: {backup_name}")
-            return backup_path
-
-        except Exception as e:
-            self.append_terminal(f"Failed to create backup: {e}")
-            return None
-
-    def restore_backup(self, backup_path):
-        """Restore from a backup"""
-        try:
-            self.append_terminal("Restoring from backup...")
-
-            with zipfile.ZipFile(backup_path, 'r') as zipf:
-                # Check backup info
-                if "backup_info.json" in zipf.namelist():
-                    with zipf.open("backup_info.json") as f:
-                        backup_info = json.load(f)
-                        self.append_terminal(f"Restoring backup from {backup_info.get('timestamp', 'unknown')}")
-
-                # Restore config.json
-                if "config.json" in zipf.namelist():
-                    extract_path = os.path.join(os.path.dirname(self.minecraft_dir), "config.json")
-                    with zipf.open("config.json") as source, open(extract_path, 'wb') as target:
-                        shutil.copyfileobj(source, target)
-                    self.append_terminal("✓ Config restored")
-
-                # Restore mods
-                mods_dir = os.path.join(self.minecraft_dir, "mods")
-                os.makedirs(mods_dir, exist_ok=True)
-
-                for item in zipf.namelist():
-                    if item.startswith("mods/") and item.endswith('.jar'):
-                        extract_path = os.path.join(self.minecraft_dir, item)
-                        os.makedirs(os.path.dirname(extract_path), exist_ok=True)
-                        with zipf.open(item) as source, open(extract_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-
-                if any(item.startswith("mods/") for item in zipf.namelist()):
-                    self.append_terminal("✓ Mods restored")
-
-                # Restore screenshots
-                for item in zipf.namelist():
-                    if item.startswith("screenshots/"):
-                        extract_path = os.path.join(self.minecraft_dir, item)
-                        os.makedirs(os.path.dirname(extract_path), exist_ok=True)
-                        with zipf.open(item) as source, open(extract_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-
-                if any(item.startswith("screenshots/") for item in zipf.namelist()):
-                    self.append_terminal("✓ Screenshots restored")
-
-            self.append_terminal("Backup restored successfully!")
-            return True
-
-        except Exception as e:
-            self.append_terminal(f"Failed to restore backup: {e}")
-            return False
-
-    def list_backups(self):
-        """List available backups"""
-        if not os.path.exists(self.backup_dir):
-            return []
-
-        backups = []
-        for file in os.listdir(self.backup_dir):
-            if file.startswith("launcher_backup_") and file.endswith(".zip"):
-                file_path = os.path.join(self.backup_dir, file)
-                backups.append({
-                    "name": file,
-                    "path": file_path,
-                    "size": os.path.getsize(file_path),
-                    "date": datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                })
-
-        # Sort by date (newest first)
-        backups.sort(key=lambda x: x["date"], reverse=True)
-        return backups
-
+# === Backup Section UI ===
 def create_backup_section(parent, minecraft_dir, config_data, append_terminal_callback, current_theme):
     """Create backup/restore section for settings tab"""
     backup_manager = BackupManager(minecraft_dir, config_data, append_terminal_callback)
@@ -1252,6 +788,7 @@ def create_backup_section(parent, minecraft_dir, config_data, append_terminal_ca
 current_theme_name = config_data.get("theme", "dark")
 current_theme = THEMES.get(current_theme_name, THEMES["dark"])
 
+startup_timer.mark("imports")
 root = tk.Tk()
 root.title(f"{LAUNCHER_NAME} v{LAUNCHER_VERSION}")
 root.geometry("1000x700")
@@ -1401,36 +938,31 @@ version_frame.pack(fill="x", padx=20, pady=(0, 10))
 if "favorite_versions" not in config_data:
     config_data["favorite_versions"] = []
 
-def get_versions():
-    """Get available Minecraft versions with caching"""
-    try:
-        versions_data = minecraft_launcher_lib.utils.get_available_versions(MINECRAFT_DIR)
-        return [v["id"] for v in versions_data]
-    except Exception as e:
-        append_terminal(f"Failed to fetch versions: {e}")
-        return ["1.20.1", "1.19.4", "1.18.2"]
+def apply_version_filter(*args):
+    """Show catalog versions matching the type filter and search box"""
+    regular_combo['values'] = version_catalog.search(version_search_var.get(), version_type_var.get())
+
+def set_version_catalog(catalog):
+    global version_catalog
+    version_catalog = catalog
+    apply_version_filter()
+    if len(catalog) and version_var.get() not in catalog:
+        version_var.set(catalog.ids()[0])
 
 def refresh_versions():
     """Refresh the version list"""
     def do_refresh():
         try:
             append_terminal("Refreshing Minecraft version list...")
-            # Clear version cache if it exists
-            if 'version_cache' in globals():
-                global version_cache
-                version_cache.clear()
-
-            # Get fresh versions
-            new_versions = get_versions()
+            # Revalidate the cached manifest and get fresh versions
+            new_catalog = load_version_catalog(MINECRAFT_DIR, append_terminal, refresh=True)
 
             # Update regular versions combobox
-            regular_combo['values'] = new_versions
-            if new_versions and version_var.get() not in new_versions:
-                version_var.set(new_versions[0])
+            set_version_catalog(new_catalog)
 
             # Update favorites combobox (keep only valid favorites)
             current_favorites = config_data.get("favorite_versions", [])
-            valid_favorites = [v for v in current_favorites if v in new_versions]
+            valid_favorites = [v for v in current_favorites if v in new_catalog]
             if len(valid_favorites) != len(current_favorites):
                 config_data["favorite_versions"] = valid_favorites
                 save_config()
@@ -1439,7 +971,7 @@ def refresh_versions():
             if valid_favorites and favorite_var.get() not in valid_favorites:
                 favorite_var.set(valid_favorites[0]) if valid_favorites else favorite_var.set("")
 
-            append_terminal(f"Version list refreshed. Found {len(new_versions)} versions.")
+            append_terminal(f"Version list refreshed. Found {len(new_catalog)} versions.")
             refresh_button.config(text="Refresh", state="normal")
 
         except Exception as e:
@@ -1496,8 +1028,17 @@ def remove_from_favorites():
     else:
         messagebox.showwarning("Warning", "Version not found in favorites.")
 
-# Get initial versions
-versions = get_versions()
+# Get initial versions from the last known list; the startup pipeline refreshes it once the window is up
+def dispatch_to_ui(func, *args):
+    root.after(0, lambda: func(*args))
+
+# Tokens are trusted until shortly before they expire and refreshed in the background
+account_manager = AccountSessionManager(config_data, lambda: save_json(CONFIG_FILE, config_data), append_terminal,
+                                        on_change=lambda login: dispatch_to_ui(on_account_change, login))
+startup_pipeline = StartupPipeline(MINECRAFT_DIR, config_data, startup_timer, dispatch_to_ui, append_terminal,
+                                   accounts=account_manager)
+version_catalog = startup_pipeline.cached_catalog()
+versions = version_catalog.ids()
 favorites = config_data.get("favorite_versions", [])
 
 # Variables for version selection
@@ -1527,6 +1068,19 @@ tk.Label(regular_frame, text="All Versions:", bg=current_theme["bg"], fg=current
 regular_combo = ttk.Combobox(regular_frame, textvariable=version_var, values=versions, state="readonly", width=20)
 regular_combo.pack(side="left", padx=(5, 0))
 
+version_type_var = tk.StringVar(value="all")
+tk.Label(regular_frame, text="Type:", bg=current_theme["bg"], fg=current_theme["fg"]).pack(side="left", padx=(10, 0))
+ttk.Combobox(regular_frame, textvariable=version_type_var, values=["all"] + VERSION_TYPES,
+             state="readonly", width=10).pack(side="left", padx=(5, 0))
+
+version_search_var = tk.StringVar()
+tk.Label(regular_frame, text="Search:", bg=current_theme["bg"], fg=current_theme["fg"]).pack(side="left", padx=(10, 0))
+tk.Entry(regular_frame, textvariable=version_search_var, bg=current_theme["entry_bg"], fg=current_theme["entry_fg"],
+         width=15).pack(side="left", padx=(5, 0))
+
+version_type_var.trace_add("write", apply_version_filter)
+version_search_var.trace_add("write", apply_version_filter)
+
 # Set initial version
 if versions:
     version_var.set(versions[0])
@@ -1555,12 +1109,7 @@ def show_version_info():
         return
 
     try:
-        versions_data = minecraft_launcher_lib.utils.get_available_versions(MINECRAFT_DIR)
-        version_info = None
-        for v in versions_data:
-            if v["id"] == selected_version:
-                version_info = v
-                break
+        version_info = get_version_info(MINECRAFT_DIR, selected_version)
 
         if version_info:
             info_text = f"""Version: {version_info['id']}
@@ -1636,8 +1185,8 @@ def microsoft_login():
                 messagebox.showerror("Network Error", "Unable to connect to Microsoft servers. Please check your internet connection.")
                 return
 
-            client_id = "00000000402b5328"
-            redirect_uri = "https://login.microsoftonline.com/common/oauth2/nativeclient"
+            client_id = MICROSOFT_CLIENT_ID
+            redirect_uri = MICROSOFT_REDIRECT_URI
             login_url = minecraft_launcher_lib.microsoft_account.get_login_url(client_id, redirect_uri)
             webbrowser.open(login_url)
             append_terminal("Browser opened for Microsoft login.")
@@ -1645,9 +1194,7 @@ def microsoft_login():
             url = simpledialog.askstring("Enter URL", "Paste the url you were redirected to:")
             if url and minecraft_launcher_lib.microsoft_account.url_contains_auth_code(url):
                 auth_code = minecraft_launcher_lib.microsoft_account.parse_auth_code_url(url, redirect_uri)
-                login_data = minecraft_launcher_lib.microsoft_account.complete_login(client_id, None, redirect_uri, auth_code)
-                config_data["microsoft_login"] = login_data
-                save_json(CONFIG_FILE, config_data)
+                login_data = account_manager.add(minecraft_launcher_lib.microsoft_account.complete_login(client_id, None, redirect_uri, auth_code))
                 username_var.set(login_data["name"])
                 append_terminal(f"Successfully logged in as {login_data['name']}")
                 messagebox.showinfo("Login Success", f"Logged in as {login_data['name']}")
@@ -1662,7 +1209,44 @@ def microsoft_login():
 
 RoundedButton(tab_launcher, text="Microsoft Login", command=microsoft_login).pack(pady=10)
 
+def describe_login_state(login, state):
+    if not login:
+        return "Offline mode"
+    if state in ("valid", "refresh_due"):
+        return f"Microsoft account: {login['name']}"
+    return f"Microsoft account: {login['name']} (refreshing...)"
+
+login_status_var = tk.StringVar(value=describe_login_state(config_data.get("microsoft_login"), startup_pipeline.cached_login_state()))
+tk.Label(tab_launcher, textvariable=login_status_var, bg=current_theme["bg"], fg=current_theme["fg"]).pack()
+
+OFFLINE_ACCOUNT = "Offline"
+account_var = tk.StringVar()
+account_combo = ttk.Combobox(tab_launcher, textvariable=account_var, state="readonly", width=30)
+account_combo.pack(pady=(5, 0))
+
+def update_account_choices():
+    active = account_manager.active()
+    account_combo["values"] = [login["name"] for login in account_manager.accounts()] + [OFFLINE_ACCOUNT]
+    account_var.set(active["name"] if active else OFFLINE_ACCOUNT)
+
+def on_account_selected(event=None):
+    name = account_var.get()
+    login = next((login for login in account_manager.accounts() if login["name"] == name), None)
+    account_manager.set_active(login["id"] if login else None)
+    if login:
+        username_var.set(login["name"])
+
+def on_account_change(login):
+    login_status_var.set(describe_login_state(login, account_manager.state(login) if login else None))
+    update_account_choices()
+
+account_combo.bind("<<ComboboxSelected>>", on_account_selected)
+update_account_choices()
+
 # === Launch ===
+# Sessions of games started from this window (finished ones are dropped on the next launch)
+game_sessions = []
+
 def launch():
     username = username_var.get().strip()
     if not username:
@@ -1681,89 +1265,23 @@ def launch():
     def run():
         try:
             version = version_var.get()
-            append_terminal(f"Preparing to launch Minecraft {version}...")
-
-            # Check if version is already installed
-            if not minecraft_launcher_lib.install.is_version_installed(version, MINECRAFT_DIR):
-                append_terminal("Version not installed. Starting download...")
-                progress_var.set(0)  # Reset progress bar
-
-                # Create progress callback
-                def progress_callback(current, total=None):
-                    if total and total > 0:
-                        progress = int((current / total) * 100)
-                        progress_var.set(progress)  # Update progress bar
-                        append_terminal(f"Download progress: {progress}% ({current}/{total} bytes)")
-
-                # Install with progress callback
-                minecraft_launcher_lib.install.install_minecraft_version(
-                    version,
-                    MINECRAFT_DIR,
-                    callback={"setStatus": lambda status: append_terminal(f"Status: {status}"),
-                             "setProgress": progress_callback,
-                             "setMax": lambda max_val: append_terminal(f"Total size: {max_val} bytes")}
-                )
-                progress_var.set(100)  # Set to complete
-                append_terminal("Installation completed!")
-            else:
-                append_terminal("Version already installed. Skipping download.")
+            event_bus.progress("launch", 0, 100)  # Reset progress bar
 
-            # Prepare login options
-            if "microsoft_login" in config_data:
-                login = config_data["microsoft_login"]
-                try:
-                    valid = minecraft_launcher_lib.microsoft_account.validate_login(login)
-                    if not valid:
-                        append_terminal("Refreshing Microsoft login token...")
-                        refreshed = minecraft_launcher_lib.microsoft_account.refresh_login(login)
-                        config_data["microsoft_login"] = refreshed
-                        save_json(CONFIG_FILE, config_data)
-                        login = refreshed
-                        append_terminal("Microsoft login token refreshed successfully.")
-                except Exception as e:
-                    append_terminal(f"Failed to refresh Microsoft login: {e}. Falling back to offline mode.")
-                    config_data.pop("microsoft_login", None)
-                    save_json(CONFIG_FILE, config_data)
-                    login = None
-                if login:
-                    options = {
-                        "username": login["name"],
-                        "uuid": login["uuid"],
-                        "token": login["access_token"],
-                        "launcherName": LAUNCHER_NAME,
-                        "launcherVersion": LAUNCHER_VERSION,
-                    }
-                    append_terminal(f"Using Microsoft account: {login['name']}")
-                else:
-                    options = {
-                        "username": username,
-                        "uuid": offline_uuid(username),
-                        "token": "",
-                        "launcherName": LAUNCHER_NAME,
-                        "launcherVersion": LAUNCHER_VERSION,
-                    }
-                    append_terminal("Using offline mode")
-            else:
-                options = {
-                    "username": username,
-                    "uuid": offline_uuid(username),
-                    "token": "",
-                    "launcherName": LAUNCHER_NAME,
-                    "launcherVersion": LAUNCHER_VERSION,
-                }
-                append_terminal("Using offline mode")
-
-            append_terminal("Generating launch command...")
-            command = minecraft_launcher_lib.command.get_minecraft_command(version, MINECRAFT_DIR, options)
-            jvm = jvm_args_var.get().strip().split()
-            if jvm:
-                command = command[:1] + jvm + command[1:]
-                append_terminal(f"JVM arguments applied: {' '.join(jvm)}")
-
-            append_terminal("Launching Minecraft...")
-            append_terminal(f"Command: {' '.join(command)}")
-            subprocess.Popen(command, cwd=MINECRAFT_DIR)
-            append_terminal("Minecraft launched successfully!")
+            # The installer reports bytes done against the plan's total; the bus merges these per frame
+            callback = event_bus.callback("install")
+            set_max = callback["setMax"]
+
+            def set_progress_max(max_val):
+                append_terminal(f"Total size: {max_val} bytes")
+                set_max(max_val)
+
+            callback["setMax"] = set_progress_max
+
+            launcher = GameLauncher(MINECRAFT_DIR, config_data, append_terminal, lambda: save_json(CONFIG_FILE, config_data),
+                                    accounts=account_manager)
+            session = launcher.launch(version, username, jvm_args_var.get(), callback=callback)
+            game_sessions[:] = [running for running in game_sessions if running.running] + [session]
+            event_bus.progress("launch", 100, 100)  # Set to complete
 
         except Exception as e:
             append_terminal(f"Launch failed: {traceback.format_exc()}")
@@ -1891,7 +1409,8 @@ def save_profile():
         "custom_button_bg": custom_button_bg_var.get(),
         "custom_button_fg": custom_button_fg_var.get(),
         "auto_save": auto_save_var.get(),
-        "save_username": save_username_var.get()
+        "save_username": save_username_var.get(),
+        "launch_policy": config_data.get("launch_policy", {})
     }
 
     profiles_dir = "profiles"
@@ -1929,6 +1448,8 @@ def load_profile():
     custom_button_fg_var.set(profile_data.get("custom_button_fg", ""))
     auto_save_var.set(profile_data.get("auto_save", True))
     save_username_var.set(profile_data.get("save_username", True))
+    config_data["launch_policy"] = profile_data.get("launch_policy", {})
+    load_launch_policy(config_data["launch_policy"])
 
     append_terminal(f"Profile '{profile_name}' loaded successfully.")
     messagebox.showinfo("Profile Loaded", f"Profile '{profile_name}' loaded successfully.")
@@ -2078,7 +1599,7 @@ def remove_version():
             confirm = messagebox.askyesno("Confirm Removal", f"Are you sure you want to remove Minecraft version '{version_to_remove}'?\n\nThis action cannot be undone.")
             if confirm:
                 try:
-                    minecraft_launcher_lib.utils.delete_version_data(version_to_remove, MINECRAFT_DIR)
+                    GameLauncher(MINECRAFT_DIR, config_data, append_terminal).delete_version(version_to_remove)
                     append_terminal(f"Version '{version_to_remove}' removed successfully.")
                     messagebox.showinfo("Success", f"Minecraft version '{version_to_remove}' has been removed.")
                 except Exception as e:
@@ -2204,16 +1725,20 @@ tk.Label(settings_scrollable_frame, text="Performance Monitoring:", bg=current_t
 performance_frame = tk.Frame(settings_scrollable_frame, bg=current_theme["bg"])
 performance_frame.pack(fill="x", padx=20, pady=5)
 
+# Samples the launcher itself so the stats dialog never waits on a CPU measurement
+launcher_sampler = ProcessSampler(os.getpid(), interval=2, capacity=60).start()
+
 def show_performance_stats():
     """Show performance statistics for the launcher."""
     try:
         import psutil
         import platform
 
-        # Get current process info
+        # Get current process info; CPU comes from the background sampler instead of blocking for a second
         process = psutil.Process()
         memory_usage = process.memory_info().rss / 1024 / 1024  # MB
-        cpu_percent = process.cpu_percent(interval=1)
+        latest = launcher_sampler.ring.latest() if launcher_sampler else None
+        cpu_percent = latest["cpu_percent"] if latest else process.cpu_percent(None)
 
         # System info
         system_memory = psutil.virtual_memory()
@@ -2277,9 +1802,119 @@ def optimize_launcher():
     except Exception as e:
         messagebox.showerror("Optimization Error", f"Failed to perform optimizations: {str(e)}")
 
+def show_launch_timings():
+    """Show p50/p95 launch phase timings over recent launches."""
+    summary = launch_timing_summary()
+    if not summary:
+        messagebox.showinfo("Launch Timings", "No launches recorded yet.")
+        return
+    timings_window = tk.Toplevel(root)
+    timings_window.title("Launch Timings")
+    timings_window.geometry("600x400")
+    text_widget = tk.Text(timings_window, wrap="none", font=("Courier", 10))
+    text_widget.insert("1.0", format_span_summary(summary))
+    text_widget.config(state="disabled")
+    text_widget.pack(expand=1, fill="both")
+    RoundedButton(timings_window, text="Close", command=timings_window.destroy).pack(pady=5)
+
+CHART_WIDTH, CHART_HEIGHT, CHART_SECONDS = 480, 160, 300
+CHART_SERIES = (("cpu_percent", "#e0533d", "CPU {:.0f}%"), ("rss_mb", "#3d8be0", "Memory {:.0f} MB"))
+
+def show_game_monitor():
+    """Live CPU and memory chart of the most recently launched running game."""
+    running = [session for session in game_sessions if session.running and session.sampler]
+    if not running:
+        messagebox.showinfo("Game Monitor", "No running game is being sampled.")
+        return
+    session = running[-1]
+    ring = session.sampler.ring
+    monitor_window = tk.Toplevel(root)
+    monitor_window.title(f"Game Monitor - {session.record['version']}")
+    canvas = tk.Canvas(monitor_window, width=CHART_WIDTH, height=CHART_HEIGHT * len(CHART_SERIES), bg="black")
+    canvas.pack(padx=5, pady=5)
+    # One line and one label per series, created once; redraws only move their coordinates
+    items = []
+    for index, (field, color, label) in enumerate(CHART_SERIES):
+        top = index * CHART_HEIGHT
+        line = canvas.create_line(0, top + CHART_HEIGHT, 0, top + CHART_HEIGHT, fill=color, width=2)
+        text = canvas.create_text(5, top + 5, anchor="nw", fill=color, text="")
+        items.append((field, label, top, line, text))
+
+    def redraw():
+        if not monitor_window.winfo_exists():
+            return
+        samples = max(int(CHART_SECONDS / session.sampler.interval), 2)
+        for field, label, top, line, text in items:
+            values = ring.series(field, samples)
+            if len(values) >= 2:
+                scale = max(max(values), 1.0)
+                step = CHART_WIDTH / (samples - 1)
+                coords = []
+                for i, value in enumerate(values):
+                    coords += (i * step, top + CHART_HEIGHT - value / scale * (CHART_HEIGHT - 20))
+                canvas.coords(line, *coords)
+                canvas.itemconfig(text, text=f"{label.format(values[-1])} (max {scale:.0f})")
+        if session.running:
+            monitor_window.after(int(session.sampler.interval * 1000), redraw)
+        else:
+            monitor_window.title(f"Game Monitor - {session.record['version']} (exited)")
+
+    redraw()
+    RoundedButton(monitor_window, text="Close", command=monitor_window.destroy).pack(pady=5)
+
 RoundedButton(performance_frame, text="Show Performance", command=show_performance_stats).pack(side="left", padx=(5, 0))
+RoundedButton(performance_frame, text="Game Monitor", command=show_game_monitor).pack(side="left", padx=(5, 0))
+RoundedButton(performance_frame, text="Launch Timings", command=show_launch_timings).pack(side="left", padx=(5, 0))
 RoundedButton(performance_frame, text="Optimize Launcher", command=optimize_launcher).pack(side="left", padx=(5, 0))
 
+# === Launch Policy Section ===
+tk.Label(settings_scrollable_frame, text="Launch Policy:", bg=current_theme["bg"], fg=current_theme["fg"], font=current_theme["font_bold"]).pack(anchor="w", padx=20, pady=(20, 5))
+
+policy_frame = tk.Frame(settings_scrollable_frame, bg=current_theme["bg"])
+policy_frame.pack(fill="x", padx=20, pady=5)
+
+# (config key, label, choices or None for free text)
+LAUNCH_POLICY_FIELDS = (
+    ("nice", "Priority (nice, -20 to 19):", None),
+    ("ionice", "I/O priority:", ("", "idle", "best_effort", "realtime")),
+    ("affinity", "CPU cores (e.g. 0-3, or auto):", None),
+    ("cores", "Cores per instance (auto):", None),
+    ("memory_max_mb", "Memory limit (MB, Linux):", None),
+    ("cpu_max_percent", "CPU limit (%, Linux):", None),
+)
+launch_policy_vars = {}
+for row, (key, label, choices) in enumerate(LAUNCH_POLICY_FIELDS):
+    tk.Label(policy_frame, text=label, bg=current_theme["bg"], fg=current_theme["fg"]).grid(row=row, column=0, sticky="w")
+    launch_policy_vars[key] = tk.StringVar()
+    if choices:
+        ttk.Combobox(policy_frame, textvariable=launch_policy_vars[key], values=choices, state="readonly", width=12).grid(row=row, column=1, sticky="w", padx=(10, 0))
+    else:
+        tk.Entry(policy_frame, textvariable=launch_policy_vars[key], bg=current_theme["entry_bg"], fg=current_theme["entry_fg"], width=14).grid(row=row, column=1, sticky="w", padx=(10, 0))
+
+def load_launch_policy(policy):
+    """Show a launch policy dict in the policy fields."""
+    for key, var in launch_policy_vars.items():
+        value = policy.get(key, "")
+        var.set(",".join(map(str, value)) if isinstance(value, list) else str(value))
+
+def apply_launch_policy():
+    policy = {key: var.get().strip() for key, var in launch_policy_vars.items() if var.get().strip()}
+    try:
+        for key in ("nice", "cores", "memory_max_mb", "cpu_max_percent"):
+            if key in policy:
+                policy[key] = int(policy[key])
+        if policy.get("affinity", "auto") != "auto":
+            parse_cpu_list(policy["affinity"])
+    except ValueError:
+        messagebox.showerror("Error", "Priority, cores and limits must be whole numbers; CPU cores a list like 0-3,8 or auto.")
+        return
+    config_data["launch_policy"] = policy
+    save_config()
+    append_terminal(f"Launch policy applied: {policy or 'defaults'}")
+
+load_launch_policy(config_data.get("launch_policy", {}))
+RoundedButton(policy_frame, text="Apply Policy", command=apply_launch_policy).grid(row=len(LAUNCH_POLICY_FIELDS), column=0, sticky="w", pady=(5, 0))
+
 # === Network Diagnostics Section ===
 tk.Label(settings_scrollable_frame, text="Network Diagnostics:", bg=current_theme["bg"], fg=current_theme["fg"], font=current_theme["font_bold"]).pack(anchor="w", padx=20, pady=(20, 5))
 
@@ -2327,28 +1962,12 @@ def check_launcher_updates():
     try:
         import packaging.version
 
-        github_repo = "itsnikoplayzyt/minecraft-launcher"
-        api_url = f"https://api.github.com/repos/{github_repo}/releases/latest"
-
-        append_terminal("Checking for launcher updates...")
-
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-
-        release_data = response.json()
-        latest_version = release_data["tag_name"].lstrip('v')
-        download_url = None
-
-        # Find the appropriate asset (assuming it's a zip file)
-        for asset in release_data.get("assets", []):
-            if asset["name"].endswith(".zip"):
-                download_url = asset["browser_download_url"]
-                break
-
-        if not download_url:
-            # Fallback to source code zip
-            download_url = release_data["zipball_url"]
+        updater = Updater(LAUNCHER_VERSION, LAUNCHER_NAME, append_terminal, github_repo="itsnikoplayzyt/minecraft-launcher")
+        update_info = updater.check_for_updates()
+        if not update_info:
+            raise RuntimeError("could not read the latest release")
 
+        latest_version = update_info["latest_version"]
         current_version = LAUNCHER_VERSION
 
         # Compare versions
@@ -2359,68 +1978,11 @@ def check_launcher_updates():
                                   f"A new version {latest_version} is available.\n\n"
                                   f"Current version: {current_version}\n\n"
                                   "Would you like to download and install the update now?"):
-                # Download and install update
-                try:
-                    # Download the update
-                    append_terminal("Downloading update...")
-                    response = requests.get(download_url, timeout=60)
-                    response.raise_for_status()
-
-                    # Save to temporary file
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as temp_file:
-                        temp_file.write(response.content)
-                        temp_path = temp_file.name
-
-                    append_terminal("Extracting update...")
-
-                    # Extract to temporary directory
-                    extract_dir = tempfile.mkdtemp()
-                    with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                        zip_ref.extractall(extract_dir)
-
-                    # Find the main directory (GitHub releases might have extra folder)
-                    contents = os.listdir(extract_dir)
-                    if len(contents) == 1 and os.path.isdir(os.path.join(extract_dir, contents[0])):
-                        source_dir = os.path.join(extract_dir, contents[0])
-                    else:
-                        source_dir = extract_dir
-
-                    # Get current launcher directory
-                    current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-                    # Backup current version
-                    backup_dir = os.path.join(current_dir, "backup")
-                    if os.path.exists(backup_dir):
-                        shutil.rmtree(backup_dir)
-                    shutil.copytree(current_dir, backup_dir, ignore=shutil.ignore_patterns("backup", "__pycache__", "*.pyc"))
-
-                    append_terminal("Installing update...")
-
-                    # Copy new files (excluding certain files)
-                    exclude_files = {"config.json", "logs", "screenshots", ".git"}
-                    for item in os.listdir(source_dir):
-                        if item in exclude_files:
-                            continue
-
-                        source_path = os.path.join(source_dir, item)
-                        dest_path = os.path.join(current_dir, item)
-
-                        if os.path.isdir(source_path):
-                            if os.path.exists(dest_path):
-                                shutil.rmtree(dest_path)
-                            shutil.copytree(source_path, dest_path)
-                        else:
-                            shutil.copy2(source_path, dest_path)
-
-                    # Clean up
-                    os.unlink(temp_path)
-                    shutil.rmtree(extract_dir)
-
-                    append_terminal("Update installed successfully!")
+                # Download (resumable, hash-checked) and install the update
+                if updater.download_and_install_update(update_info):
                     messagebox.showinfo("Update Installed", "Update installed successfully! Please restart the launcher.")
-                except Exception as e:
-                    append_terminal(f"Failed to install update: {e}")
-                    messagebox.showerror("Update Error", f"Failed to install update: {e}")
+                else:
+                    messagebox.showerror("Update Error", "Failed to install update. See the terminal for details.")
         else:
             append_terminal("No updates available.")
             messagebox.showinfo("Up to Date", "You are running the latest version.")
@@ -2443,4 +2005,24 @@ tk.Label(root, text=f"{LAUNCHER_NAME} v{LAUNCHER_VERSION}", bg=current_theme["bg
 if username_var.get() and not selected_skin_path:
     threading.Thread(target=lambda: fetch_skin(username_var.get()), daemon=True).start()
 
+# === Background Startup ===
+def on_startup_versions(new_catalog):
+    set_version_catalog(new_catalog)
+    append_terminal(f"Version list refreshed. Found {len(new_catalog)} versions.")
+
+def on_startup_login(login):
+    if login:
+        login_status_var.set(describe_login_state(login, "valid"))
+    else:
+        login_status_var.set(describe_login_state(None, None))
+        append_terminal("Saved Microsoft login is no longer valid. Using offline mode.")
+
+def on_first_window():
+    startup_timer.mark("first_window")
+    startup_pipeline.start(on_versions=on_startup_versions, on_login=on_startup_login)
+
+startup_timer.mark("ui_build")
+root.after_idle(on_first_window)
+root.after_idle(drain_events)
+
 root.mainloop()
@@ -0,0 +1,39 @@
+"""OmniLauncher engine: everything the launcher does that does not need a window.
+
+Importing this package must stay free of tkinter, PIL and psutil so headless
+hosts can install and launch versions and so import time can be measured on
+its own.
+"""
+from .accounts import (
+    MICROSOFT_CLIENT_ID, MICROSOFT_REDIRECT_URI, AccountSessionManager, get_token_expiry, offline_uuid, token_expires_at,
+)
+from .backup import BackupManager
+from .cds import ClassDataArchives, class_data_archives
+from .config import CACHE_DIR, CONFIG_FILE, LAUNCHER_NAME, LAUNCHER_VERSION, MINECRAFT_DIR, SCRIPT_DIR, load_json, save_json
+from .download import DownloadError, download_file
+from .events import FRAME_RATE, EventBus, progress_percent
+from .gclog import analyze_gc_log, format_gc_summary
+from .install import DownloadTask, InstallError, VersionInstaller, create_session, delete_version_data, is_version_installed
+from .jvm_flags import JVMFlagProbe, check_jvm_args, jvm_flag_probe
+from .jvm_presets import AUTO_PRESET, JVM_ARG_EXPLANATIONS, JVM_PRESETS, JVMPresetManager, auto_tune
+from .launch import CommandCache, GameLauncher, command_cache, launch_timing_summary
+from .modindex import ModIndex, mod_index, parse_mod_jar
+from .modpack import ModpackError, ModpackImporter, install_mod_loader, read_modpack
+from .mods import ModManager, mod_filename, parse_mod_urls
+from .objects import ObjectStore, shared_store
+from .overlap import ClassOverlapScanner, class_overlap_scanner, find_overlaps, format_overlap, jar_class_names
+from .policy import format_cpu_list, parse_cpu_list, resolve_policy
+from .process import GameSession, list_sessions, parse_log_line, save_session_record, spawn_game
+from .resolver import ModCheckError, ModResolver, check_mods, mod_resolver, version_matches
+from .sampler import ProcessSampler, SampleRing
+from .servers import ServerManager
+from .startup import StartupPipeline, StartupTimer
+from .terminal import TERMINAL_CAPACITY, TerminalBuffer
+from .timing import PhaseTimer, format_span_summary, summarize_spans
+from .updater import Updater
+from .versions import (
+    VERSION_TYPES, VersionCatalog, VersionManifestCache, clear_version_cache, fetch_versions, get_available_versions,
+    get_cached_versions, get_latest_release, get_version_catalog, get_version_info, get_versions, load_version_catalog,
+    manifest_cache,
+)
+from .watcher import DirectoryWatcher
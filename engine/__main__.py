@@ -0,0 +1,102 @@
+"""Headless entry point: ``python -m engine versions|install|launch|delete|store|timings|gc|check-mods|overlaps|import-pack``."""
+import argparse
+import os
+import sys
+
+from .config import CONFIG_FILE, MINECRAFT_DIR, load_json, save_json
+from .launch import GameLauncher, launch_timing_summary
+from .gclog import format_gc_summary
+from .modpack import ModpackImporter
+from .objects import shared_store
+from .overlap import class_overlap_scanner, format_overlap
+from .process import list_sessions
+from .resolver import mod_resolver
+from .timing import format_span_summary
+from .versions import get_versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="engine", description="OmniLauncher headless engine")
+    parser.add_argument("--minecraft-dir", default=MINECRAFT_DIR)
+    sub = parser.add_subparsers(dest="action", required=True)
+    sub.add_parser("versions", help="List available versions")
+    install_parser = sub.add_parser("install", help="Install a version")
+    install_parser.add_argument("version")
+    launch_parser = sub.add_parser("launch", help="Install if needed and launch a version")
+    launch_parser.add_argument("version")
+    launch_parser.add_argument("--username", default="Player")
+    launch_parser.add_argument("--jvm-args", default="")
+    delete_parser = sub.add_parser("delete", help="Remove an installed version")
+    delete_parser.add_argument("version")
+    store_parser = sub.add_parser("store", help="Show shared object store usage")
+    store_parser.add_argument("--gc", action="store_true", help="Remove objects no game directory uses")
+    timings_parser = sub.add_parser("timings", help="Show p50/p95 launch phase timings")
+    timings_parser.add_argument("--last", type=int, default=50, help="Number of recent launches to include")
+    gc_parser = sub.add_parser("gc", help="Show GC pause statistics of recent sessions")
+    gc_parser.add_argument("--last", type=int, default=10, help="Number of recent sessions to include")
+    check_parser = sub.add_parser("check-mods", help="Check installed mods against a version")
+    check_parser.add_argument("version")
+    sub.add_parser("overlaps", help="List mod jars that ship the same classes")
+    import_parser = sub.add_parser("import-pack", help="Import a .mrpack or CurseForge modpack zip")
+    import_parser.add_argument("archive")
+    import_parser.add_argument("--keep-mods", action="store_true", help="Keep installed mods the pack does not ship")
+    args = parser.parse_args(argv)
+
+    config_data = load_json(CONFIG_FILE, {})
+    launcher = GameLauncher(args.minecraft_dir, config_data, print, lambda: save_json(CONFIG_FILE, config_data))
+
+    if args.action == "versions":
+        for version in get_versions(args.minecraft_dir, print):
+            print(version)
+    elif args.action == "install":
+        launcher.install_version(args.version, {"setStatus": print})
+    elif args.action == "launch":
+        session = launcher.launch(args.version, args.username, args.jvm_args, {"setStatus": print})
+        # The game writes into our pipes, so stay alive until it exits
+        return session.wait() or 0
+    elif args.action == "delete":
+        launcher.delete_version(args.version)
+    elif args.action == "store":
+        if args.gc:
+            print(f"Freed {shared_store.gc()} objects")
+        stats = shared_store.stats()
+        print(f"{shared_store.root}: {stats['objects']} objects, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{stats['links']} linked files in {stats['game_dirs']} game directories")
+        if stats["copies"]:
+            print(f"{stats['copies']} linked files are full copies ({stats['copied_bytes'] / 1024 / 1024:.1f} MB), "
+                  "the store is on another filesystem or hardlinks are unsupported")
+    elif args.action == "timings":
+        summary = launch_timing_summary(args.last)
+        print(format_span_summary(summary) if summary else "No launches recorded yet.")
+    elif args.action == "gc":
+        records = [record for record in list_sessions(limit=args.last) if record.get("gc")]
+        for record in records:
+            print(f"{record['id']} {record['version']} ({record.get('jvm_args') or 'default JVM arguments'})")
+            print(f"  {format_gc_summary(record['gc'])}")
+        if not records:
+            print("No sessions with a GC log yet.")
+    elif args.action == "check-mods":
+        result = mod_resolver.check_version(args.version, args.minecraft_dir)
+        for issue in result["issues"]:
+            print(f"[{issue['severity']}] {issue['message']}")
+        print(f"{result['mods']} mods, {len(result['issues'])} problems" + (" (cached)" if result["cached"] else ""))
+        return 1 if any(issue["severity"] == "error" for issue in result["issues"]) else 0
+    elif args.action == "overlaps":
+        report = class_overlap_scanner.scan(os.path.join(args.minecraft_dir, "mods"))
+        for overlap in report["overlaps"]:
+            print(format_overlap(overlap))
+            print(f"  e.g. {', '.join(overlap['examples'])}")
+        for jar, error in report["errors"].items():
+            print(f"{jar}: could not read ({error})")
+        print(f"{report['jars']} jars, {report['classes']} classes, {len(report['overlaps'])} overlaps"
+              + (" (cached)" if report["cached"] else f" ({report['read']} jars read)"))
+    elif args.action == "import-pack":
+        result = ModpackImporter(args.minecraft_dir, config_data, print, lambda: save_json(CONFIG_FILE, config_data)) \
+            .import_pack(args.archive, replace_mods=not args.keep_mods)
+        if result["version"]:
+            print(f"Launch with: python -m engine launch {result['version']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Microsoft and offline account handling."""
+import base64
+import json
+import logging
+import threading
+import time
+import uuid
+
+import minecraft_launcher_lib
+
+logger = logging.getLogger(__name__)
+
+MICROSOFT_CLIENT_ID = "00000000402b5328"
+MICROSOFT_REDIRECT_URI = "https://login.microsoftonline.com/common/oauth2/nativeclient"
+DEFAULT_TOKEN_LIFETIME = 24 * 3600  # Minecraft access tokens last a day
+REFRESH_MARGIN = 30 * 60  # Refresh this long before a token expires
+RETRY_DELAY = 5 * 60  # Wait before retrying a refresh that failed on the network
+
+
+# === UUID for offline users ===
+def offline_uuid(username):
+    return str(uuid.uuid3(uuid.NAMESPACE_DNS, f"OfflinePlayer:{username}"))
+
+
+def get_token_expiry(login):
+    """Read the expiry timestamp from a Minecraft access token (a JWT), or None if it can't be decoded"""
+    try:
+        payload = login["access_token"].split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def token_expires_at(login):
+    """When a login's access token expires: the recorded expiry, the JWT's exp, or None"""
+    if not login:
+        return None
+    return login.get("expires_at") or get_token_expiry(login)
+
+
+class AccountSessionManager:
+    """Saved Microsoft accounts with locally tracked token expiry.
+
+    A token is used as-is until it is within ``refresh_margin`` of expiring,
+    so launches make no validation round-trip. ``start()`` keeps a timer that
+    refreshes each account in the background before that point; accounts
+    refresh on their own threads, so several can refresh at once.
+
+    Accounts live in ``config_data["microsoft_accounts"]`` keyed by UUID, and
+    the active one is mirrored to ``config_data["microsoft_login"]``.
+    ``on_change(login)`` is called from the refreshing thread after an account
+    is refreshed, added, removed or switched.
+    """
+
+    def __init__(self, config_data, save_config_callback=None, append_terminal_callback=None, on_change=None,
+                 refresh_margin=REFRESH_MARGIN):
+        self.config_data = config_data
+        self.save_config = save_config_callback
+        self.append_terminal = append_terminal_callback or (lambda text: None)
+        self.on_change = on_change
+        self.refresh_margin = refresh_margin
+        self._lock = threading.RLock()
+        self._refreshing = {}
+        self._retry_at = {}
+        self._timer = None
+        self._running = False
+        accounts = config_data.setdefault("microsoft_accounts", {})
+        active = config_data.get("microsoft_login")
+        if active and active.get("id") not in accounts:
+            accounts[active["id"]] = active
+
+    # === Accounts ===
+    def accounts(self):
+        with self._lock:
+            return list(self.config_data["microsoft_accounts"].values())
+
+    def active(self):
+        return self.config_data.get("microsoft_login")
+
+    def add(self, login):
+        """Store a freshly completed login and make it the active account"""
+        login = dict(login, expires_at=get_token_expiry(login) or time.time() + DEFAULT_TOKEN_LIFETIME)
+        with self._lock:
+            self.config_data["microsoft_accounts"][login["id"]] = login
+            self.config_data["microsoft_login"] = login
+            self._save()
+        self._changed(login)
+        self._schedule()
+        return login
+
+    def set_active(self, account_id):
+        """Switch the active account; None switches to offline mode"""
+        with self._lock:
+            login = self.config_data["microsoft_accounts"].get(account_id) if account_id else None
+            if login:
+                self.config_data["microsoft_login"] = login
+            else:
+                self.config_data.pop("microsoft_login", None)
+            self._save()
+        self._changed(login)
+        return login
+
+    def remove(self, account_id):
+        with self._lock:
+            self.config_data["microsoft_accounts"].pop(account_id, None)
+            self._retry_at.pop(account_id, None)
+            active = self.active()
+            if active and active.get("id") == account_id:
+                self.config_data.pop("microsoft_login", None)
+            self._save()
+        self._changed(self.active())
+
+    def _save(self):
+        if self.save_config:
+            try:
+                self.save_config()
+            except OSError as e:
+                logger.warning("Failed to save accounts: %s", e)
+
+    def _changed(self, login):
+        if self.on_change:
+            try:
+                self.on_change(login)
+            except Exception as e:
+                logger.warning("Account change callback failed: %s", e)
+
+    # === Expiry ===
+    def state(self, login=None):
+        """'none', 'valid', 'refresh_due' or 'expired', from the recorded expiry only"""
+        login = login or self.active()
+        if not login:
+            return "none"
+        expires_at = token_expires_at(login)
+        now = time.time()
+        if not expires_at or expires_at <= now:
+            return "expired"
+        if expires_at - now <= self.refresh_margin:
+            return "refresh_due"
+        return "valid"
+
+    def get_valid_login(self, account_id=None):
+        """The account's login with a usable token, refreshing over the network only if it has expired.
+
+        Returns None if there is no such account or it could not be refreshed.
+        """
+        login = self.config_data["microsoft_accounts"].get(account_id) if account_id else self.active()
+        if not login:
+            return None
+        state = self.state(login)
+        if state == "valid":
+            return login
+        if state == "refresh_due":
+            self.refresh_async(login["id"])
+            return login
+        return self.refresh(login["id"])
+
+    # === Refresh ===
+    def refresh(self, account_id):
+        """Refresh one account now; concurrent calls for the same account share one request"""
+        with self._lock:
+            event = self._refreshing.get(account_id)
+            owner = event is None
+            if owner:
+                event = self._refreshing[account_id] = threading.Event()
+        if not owner:
+            event.wait()
+            return self.config_data["microsoft_accounts"].get(account_id)
+
+        try:
+            return self._refresh(account_id)
+        finally:
+            with self._lock:
+                del self._refreshing[account_id]
+            event.set()
+            self._schedule()
+
+    def _refresh(self, account_id):
+        login = self.config_data["microsoft_accounts"].get(account_id)
+        if not login:
+            return None
+        try:
+            refreshed = minecraft_launcher_lib.microsoft_account.complete_refresh(
+                MICROSOFT_CLIENT_ID, None, MICROSOFT_REDIRECT_URI, login["refresh_token"])
+        except minecraft_launcher_lib.exceptions.InvalidRefreshToken:
+            self.append_terminal(f"Microsoft login for {login.get('name')} has expired. Please log in again.")
+            self.remove(account_id)
+            return None
+        except Exception as e:
+            with self._lock:
+                self._retry_at[account_id] = time.time() + RETRY_DELAY
+            self.append_terminal(f"Failed to refresh Microsoft login for {login.get('name')}: {e}")
+            return login if self.state(login) != "expired" else None
+
+        refreshed = dict(refreshed, expires_at=get_token_expiry(refreshed) or time.time() + DEFAULT_TOKEN_LIFETIME)
+        with self._lock:
+            self._retry_at.pop(account_id, None)
+            self.config_data["microsoft_accounts"][account_id] = refreshed
+            active = self.active()
+            if active and active.get("id") == account_id:
+                self.config_data["microsoft_login"] = refreshed
+            self._save()
+        logger.info("Refreshed Microsoft login for %s", refreshed.get("name"))
+        self._changed(refreshed)
+        return refreshed
+
+    def refresh_async(self, account_id):
+        with self._lock:
+            if account_id in self._refreshing:
+                return
+        threading.Thread(target=self.refresh, args=(account_id,), daemon=True).start()
+
+    def refresh_due(self):
+        """Start background refreshes for every account inside its refresh margin"""
+        now = time.time()
+        with self._lock:
+            retry_at = dict(self._retry_at)
+        for login in self.accounts():
+            if self.state(login) != "valid" and retry_at.get(login["id"], 0) <= now:
+                self.refresh_async(login["id"])
+
+    def start(self):
+        """Refresh accounts that are due now and keep refreshing them ahead of expiry"""
+        self._running = True
+        self._tick()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+    def _tick(self):
+        self.refresh_due()
+        self._schedule()
+
+    def _schedule(self):
+        """Arm one timer for the next account that will enter its refresh margin"""
+        with self._lock:
+            if not self._running:
+                return
+            if self._timer:
+                self._timer.cancel()
+            due_times = []
+            for login in self.config_data["microsoft_accounts"].values():
+                expires_at = token_expires_at(login)
+                if expires_at:
+                    due_times.append(max(expires_at - self.refresh_margin, self._retry_at.get(login["id"], 0)))
+            if not due_times:
+                self._timer = None
+                return
+            delay = max(min(due_times) - time.time(), 1)
+            self._timer = threading.Timer(delay, self._tick)
+            self._timer.daemon = True
+            self._timer.start()
@@ -0,0 +1,145 @@
+"""Backup and restore of launcher data."""
+import datetime
+import json
+import os
+import shutil
+import zipfile
+
+
+class BackupManager:
+    def __init__(self, minecraft_dir, config_data, append_terminal_callback):
+        self.minecraft_dir = minecraft_dir
+        self.config_data = config_data
+        self.append_terminal = append_terminal_callback
+        self.backup_dir = os.path.join(os.path.dirname(minecraft_dir), "launcher_backups")
+
+        # Ensure backup directory exists
+        os.makedirs(self.backup_dir, exist_ok=True)
+
+    def create_backup(self, include_mods=True, include_screenshots=True):
+        """Create a backup of launcher data"""
+        try:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = f"launcher_backup_{timestamp}.zip"
+            backup_path = os.path.join(self.backup_dir, backup_name)
+
+            self.append_terminal("Creating backup...")
+
+            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                # Backup config.json
+                config_path = os.path.join(os.path.dirname(self.minecraft_dir), "config.json")
+                if os.path.exists(config_path):
+                    zipf.write(config_path, "config.json")
+                    self.append_terminal("✓ Config backed up")
+
+                # Backup mods if requested
+                if include_mods:
+                    mods_dir = os.path.join(self.minecraft_dir, "mods")
+                    if os.path.exists(mods_dir):
+                        for root, dirs, files in os.walk(mods_dir):
+                            for file in files:
+                                if file.endswith('.jar'):
+                                    file_path = os.path.join(root, file)
+                                    arcname = os.path.join("mods", os.path.relpath(file_path, mods_dir))
+                                    zipf.write(file_path, arcname)
+                        self.append_terminal("✓ Mods backed up")
+
+                # Backup screenshots if requested
+                if include_screenshots:
+                    screenshots_dir = os.path.join(self.minecraft_dir, "screenshots")
+                    if os.path.exists(screenshots_dir):
+                        for root, dirs, files in os.walk(screenshots_dir):
+                            for file in files:
+                                if file.lower().endswith(('.png', '.jpg', '.jpeg')):
+                                    file_path = os.path.join(root, file)
+                                    arcname = os.path.join("screenshots", os.path.relpath(file_path, screenshots_dir))
+                                    zipf.write(file_path, arcname)
+                        self.append_terminal("✓ Screenshots backed up")
+
+                # Create backup info file
+                backup_info = {
+                    "timestamp": timestamp,
+                    "minecraft_version": self.config_data.get("last_version", "unknown"),
+                    "launcher_version": self.config_data.get("launcher_version", "unknown"),
+                    "included_mods": include_mods,
+                    "included_screenshots": include_screenshots
+                }
+                zipf.writestr("backup_info.json", json.dumps(backup_info, indent=2))
+
+            self.append_terminal(f"Backup created: {backup_name}")
+            return backup_path
+
+        except Exception as e:
+            self.append_terminal(f"Failed to create backup: {e}")
+            return None
+
+    def restore_backup(self, backup_path):
+        """Restore from a backup"""
+        try:
+            self.append_terminal("Restoring from backup...")
+
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                # Check backup info
+                if "backup_info.json" in zipf.namelist():
+                    with zipf.open("backup_info.json") as f:
+                        backup_info = json.load(f)
+                        self.append_terminal(f"Restoring backup from {backup_info.get('timestamp', 'unknown')}")
+
+                # Restore config.json
+                if "config.json" in zipf.namelist():
+                    extract_path = os.path.join(os.path.dirname(self.minecraft_dir), "config.json")
+                    with zipf.open("config.json") as source, open(extract_path, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                    self.append_terminal("✓ Config restored")
+
+                # Restore mods
+                mods_dir = os.path.join(self.minecraft_dir, "mods")
+                os.makedirs(mods_dir, exist_ok=True)
+
+                for item in zipf.namelist():
+                    if item.startswith("mods/") and item.endswith('.jar'):
+                        extract_path = os.path.join(self.minecraft_dir, item)
+                        os.makedirs(os.path.dirname(extract_path), exist_ok=True)
+                        with zipf.open(item) as source, open(extract_path, 'wb') as target:
+                            shutil.copyfileobj(source, target)
+
+                if any(item.startswith("mods/") for item in zipf.namelist()):
+                    self.append_terminal("✓ Mods restored")
+
+                # Restore screenshots
+                for item in zipf.namelist():
+                    if item.startswith("screenshots/"):
+                        extract_path = os.path.join(self.minecraft_dir, item)
+                        os.makedirs(os.path.dirname(extract_path), exist_ok=True)
+                        with zipf.open(item) as source, open(extract_path, 'wb') as target:
+                            shutil.copyfileobj(source, target)
+
+                if any(item.startswith("screenshots/") for item in zipf.namelist()):
+                    self.append_terminal("✓ Screenshots restored")
+
+            self.append_terminal("Backup restored successfully!")
+            return True
+
+        except Exception as e:
+            self.append_terminal(f"Failed to restore backup: {e}")
+            return False
+
+    def list_backups(self):
+        """List available backups"""
+        if not os.path.exists(self.backup_dir):
+            return []
+
+        backups = []
+        for file in os.listdir(self.backup_dir):
+            if file.startswith("launcher_backup_") and file.endswith(".zip"):
+                file_path = os.path.join(self.backup_dir, file)
+                backups.append({
+                    "name": file,
+                    "path": file_path,
+                    "size": os.path.getsize(file_path),
+                    "date": datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
+                })
+
+        # Sort by date (newest first)
+        backups.sort(key=lambda x: x["date"], reverse=True)
+        return backups
@@ -0,0 +1,244 @@
+"""AppCDS class-data-sharing archives, one per version, Java runtime and mod set.
+
+A cold client start spends much of its time loading and verifying the same
+classes from the same jars. The first launch of a combination runs with
+``-XX:ArchiveClassesAtExit`` so the JVM dumps the classes it loaded when the
+game exits; later launches map that archive with ``-XX:SharedArchiveFile``.
+On Java 19+ ``-XX:+AutoCreateSharedArchive`` does both in one flag and
+regenerates the archive itself when it no longer matches.
+
+Archives are keyed on the java binary, the classpath jars and the mods
+folder (paths, sizes and mtimes), so installing, updating or adding a mod
+picks a fresh archive. Archives of other keys are kept, so switching
+between Java runtimes, mod sets or game directories does not force a new
+dump; an archive is deleted when its java binary or one of its jars no
+longer exists, or when it is the least recently used one beyond
+``MAX_ARCHIVES`` / ``MAX_ARCHIVE_BYTES``. The JVM validates the archive on
+load and silently runs without it if it does not fit.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from .config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+CDS_DIR = os.path.join(CACHE_DIR, "cds")
+ARCHIVE_SUFFIX = ".jsa"
+# Next to each archive: the files its key was computed from; its mtime is the archive's last use
+INPUTS_SUFFIX = ".inputs.json"
+MAX_ARCHIVES = 16
+MAX_ARCHIVE_BYTES = 4 * 1024 * 1024 * 1024
+# Dynamic archives need JDK 13; JDK 19 can create and refresh them on its own
+MIN_DYNAMIC_ARCHIVE_JAVA = 13
+MIN_AUTO_ARCHIVE_JAVA = 19
+# User arguments that already decide how class data sharing is used
+CDS_ARGS = ("-Xshare", "-XX:SharedArchiveFile", "-XX:ArchiveClassesAtExit", "-XX:+AutoCreateSharedArchive")
+JAVA_VERSION = re.compile(r'version "(?P<version>[^"]+)"')
+
+
+def java_major_version(version):
+    """Major version of a Java version string ("1.8.0_51" -> 8, "17.0.8" -> 17), or None"""
+    parts = version.split(".")
+    try:
+        major = int(re.match(r"\d+", parts[0]).group())
+        if major == 1 and len(parts) > 1:
+            major = int(re.match(r"\d+", parts[1]).group())
+    except (AttributeError, ValueError):
+        return None
+    return major
+
+
+def resolve_java(java):
+    """Absolute path of the java binary a command starts with, or None"""
+    if os.path.isabs(java):
+        return java if os.path.exists(java) else None
+    return shutil.which(java)
+
+
+def classpath_of(command):
+    """Classpath entries of a launch command"""
+    for flag in ("-cp", "-classpath", "--class-path"):
+        if flag in command:
+            index = command.index(flag)
+            if index + 1 < len(command):
+                return [entry for entry in command[index + 1].split(os.pathsep) if entry]
+    return []
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{path}:missing\n"
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n"
+
+
+class ClassDataArchives:
+    """Creates and reuses AppCDS archives under ``root/<version>/<key>.jsa``"""
+
+    def __init__(self, root=CDS_DIR):
+        self.root = root
+        self._java_versions = {}
+        self._lock = threading.Lock()
+
+    def java_version(self, java_path):
+        """Major version of a java binary, read from the runtime's release file or ``java -version``; cached by mtime"""
+        try:
+            mtime = os.stat(java_path).st_mtime_ns
+        except OSError:
+            return None
+        key = (java_path, mtime)
+        with self._lock:
+            if key in self._java_versions:
+                return self._java_versions[key]
+
+        version = None
+        release = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(java_path))), "release")
+        try:
+            with open(release, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("JAVA_VERSION="):
+                        version = java_major_version(line.split("=", 1)[1].strip().strip('"'))
+                        break
+        except OSError:
+            pass
+        if version is None:
+            try:
+                result = subprocess.run([java_path, "-version"], capture_output=True, text=True, timeout=15)
+                match = JAVA_VERSION.search(result.stderr or result.stdout)
+                version = java_major_version(match.group("version")) if match else None
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning("Could not determine Java version of %s: %s", java_path, e)
+
+        with self._lock:
+            self._java_versions[key] = version
+        return version
+
+    @staticmethod
+    def key_inputs(java_path, command, minecraft_dir):
+        """The java binary, classpath entries and mod jars an archive depends on"""
+        mods_dir = os.path.join(minecraft_dir, "mods")
+        try:
+            mods = sorted(name for name in os.listdir(mods_dir) if name.endswith(".jar"))
+        except OSError:
+            mods = []
+        return [java_path] + classpath_of(command) + [os.path.join(mods_dir, name) for name in mods]
+
+    def archive_key(self, java_path, command, minecraft_dir):
+        """Hash of the java binary, the classpath jars and the mods folder"""
+        digest = hashlib.sha1()
+        for path in self.key_inputs(java_path, command, minecraft_dir):
+            digest.update(_file_state(path).encode())
+        return digest.hexdigest()[:16]
+
+    def archive_path(self, version, key):
+        return os.path.join(self.root, version, key + ARCHIVE_SUFFIX)
+
+    def prepare(self, version, command, minecraft_dir):
+        """(JVM arguments, mode) for a launch command; mode is "auto", "use", "create" or None when CDS is not used"""
+        java_path = resolve_java(command[0]) if command else None
+        if not java_path:
+            return [], None
+        java_version = self.java_version(java_path)
+        if not java_version or java_version < MIN_DYNAMIC_ARCHIVE_JAVA:
+            return [], None
+
+        key = self.archive_key(java_path, command, minecraft_dir)
+        archive = self.archive_path(version, key)
+        try:
+            os.makedirs(os.path.dirname(archive), exist_ok=True)
+        except OSError as e:
+            logger.warning("Cannot create class data archive directory: %s", e)
+            return [], None
+        self._record_use(archive, self.key_inputs(java_path, command, minecraft_dir))
+        self._prune(keep=archive)
+
+        if java_version >= MIN_AUTO_ARCHIVE_JAVA:
+            return ["-XX:+AutoCreateSharedArchive", f"-XX:SharedArchiveFile={archive}"], "auto"
+        if os.path.exists(archive):
+            return [f"-XX:SharedArchiveFile={archive}"], "use"
+        return [f"-XX:ArchiveClassesAtExit={archive}"], "create"
+
+    @staticmethod
+    def _record_use(archive, inputs):
+        """Write the archive's key inputs once, and mark it as just used"""
+        inputs_file = archive[:-len(ARCHIVE_SUFFIX)] + INPUTS_SUFFIX
+        try:
+            if os.path.exists(inputs_file):
+                os.utime(inputs_file)
+            else:
+                with open(inputs_file, "w", encoding="utf-8") as f:
+                    json.dump(inputs, f)
+        except OSError as e:
+            logger.warning("Could not record class data archive use: %s", e)
+
+    def _prune(self, keep=None):
+        """Delete archives whose java or jars are gone, then the least recently used beyond the count and size limits"""
+        entries = []  # (last use, size, archive path, inputs file)
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(ARCHIVE_SUFFIX) and name[:-len(ARCHIVE_SUFFIX)] + INPUTS_SUFFIX not in files:
+                    archive = os.path.join(dirpath, name)
+                    if archive != keep:
+                        self._delete(archive, archive[:-len(ARCHIVE_SUFFIX)] + INPUTS_SUFFIX, "no recorded inputs")
+                    continue
+                if not name.endswith(INPUTS_SUFFIX):
+                    continue
+                inputs_file = os.path.join(dirpath, name)
+                archive = inputs_file[:-len(INPUTS_SUFFIX)] + ARCHIVE_SUFFIX
+                try:
+                    with open(inputs_file, "r", encoding="utf-8") as f:
+                        inputs = json.load(f)
+                    last_use = os.stat(inputs_file).st_mtime
+                except (OSError, ValueError):
+                    inputs, last_use = [], 0
+                if archive != keep and (not inputs or not all(os.path.exists(path) for path in inputs)):
+                    self._delete(archive, inputs_file, "its Java runtime or jars were removed")
+                    continue
+                size = os.path.getsize(archive) if os.path.exists(archive) else 0
+                entries.append((last_use, size, archive, inputs_file))
+        entries.sort(reverse=True)
+        count = total = 0
+        for last_use, size, archive, inputs_file in entries:
+            count += 1
+            total += size
+            if archive != keep and (count > MAX_ARCHIVES or total > MAX_ARCHIVE_BYTES):
+                self._delete(archive, inputs_file, "least recently used")
+
+    def _delete(self, archive, inputs_file, reason):
+        for path in (archive, inputs_file):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove %s: %s", path, e)
+        logger.info("Removed class data archive %s (%s)", os.path.relpath(archive, self.root), reason)
+
+    def remove(self, version):
+        """Delete every archive of a version"""
+        shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+    def stats(self):
+        archives = size = 0
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(ARCHIVE_SUFFIX):
+                    archives += 1
+                    size += os.path.getsize(os.path.join(dirpath, name))
+        return {"archives": archives, "bytes": size}
+
+
+class_data_archives = ClassDataArchives()
+
+
+def uses_own_cds_args(jvm_args):
+    """Whether the user's JVM arguments already configure class data sharing"""
+    return any(arg.startswith(CDS_ARGS) for arg in jvm_args.split())
@@ -0,0 +1,26 @@
+"""Launcher paths, constants and config file helpers."""
+import json
+import os
+
+import minecraft_launcher_lib
+
+# === Constants ===
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(SCRIPT_DIR, "config.json")
+CACHE_DIR = os.path.join(SCRIPT_DIR, "cache")
+MINECRAFT_DIR = minecraft_launcher_lib.utils.get_minecraft_directory()
+LAUNCHER_NAME = "OmniLauncher"
+LAUNCHER_VERSION = "1.6.0"
+
+
+# === Load config ===
+def load_json(file, default):
+    if not os.path.exists(file):
+        return default
+    with open(file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(file, data):
+    with open(file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
@@ -0,0 +1,159 @@
+"""Resumable, integrity-checked file downloads.
+
+Data streams into ``<dest>.part`` and is hashed as it arrives. An interrupted
+download resumes from the partial file with an HTTP Range request, and the
+file is renamed into place only once it is complete and verified, so memory
+use stays at one chunk however large the file is.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from .config import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+# One lock per partial file being written, so two downloads to the same destination take turns
+_part_locks = {}
+_part_locks_guard = threading.Lock()
+
+
+class DownloadError(Exception):
+    pass
+
+
+def split_digest(digest):
+    """Split a "sha256:<hex>" style digest into (hash name, hex); bare hex is taken as SHA1"""
+    if digest and ":" in digest:
+        name, value = digest.split(":", 1)
+        return name.lower(), value.lower()
+    return "sha1", digest.lower() if digest else None
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _hash_file(path, digest):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+def _acquire_part(part_path):
+    key = os.path.normcase(os.path.abspath(part_path))
+    with _part_locks_guard:
+        lock, users = _part_locks.get(key, (None, 0))
+        lock = lock or threading.Lock()
+        _part_locks[key] = (lock, users + 1)
+    lock.acquire()
+    return key
+
+
+def _release_part(key):
+    with _part_locks_guard:
+        lock, users = _part_locks[key]
+        if users > 1:
+            _part_locks[key] = (lock, users - 1)
+        else:
+            del _part_locks[key]
+    lock.release()
+
+
+def _stream(http, url, part_path, meta_path, hash_name, progress, timeout, headers):
+    """One request: resume part_path if the server still serves the same file, else restart it"""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    try:
+        meta = load_json(meta_path, {}) if offset else {}
+    except ValueError:
+        meta = {}
+    request_headers = dict(headers or {})
+    if offset and meta.get("url") == url and meta.get("validator"):
+        request_headers["Range"] = f"bytes={offset}-"
+        request_headers["If-Range"] = meta["validator"]
+
+    digest = hashlib.new(hash_name)
+    with http.get(url, stream=True, timeout=timeout, headers=request_headers) as response:
+        if response.status_code == 416:
+            # The partial file does not fit what the server has now; start over
+            _remove(part_path, meta_path)
+            return _stream(http, url, part_path, meta_path, hash_name, progress, timeout, headers)
+        response.raise_for_status()
+        if response.status_code == 206:
+            _hash_file(part_path, digest)
+            mode = "ab"
+        else:
+            offset, mode = 0, "wb"
+
+        length = int(response.headers.get("content-length", 0))
+        total = offset + length if length else 0
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if validator and not validator.startswith("W/"):
+            save_json(meta_path, {"url": url, "validator": validator})
+        else:
+            _remove(meta_path)
+
+        done = offset
+        if progress:
+            progress(done, total)
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+    return digest
+
+
+def download_file(url, dest_path, expected_hash=None, hash_name="sha1", session=None, progress=None,
+                  timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, headers=None):
+    """Download url to dest_path, resuming an earlier partial download of the same file.
+
+    ``progress(done, total)`` is called per chunk; total is 0 when the size is
+    unknown. Returns the hex digest. Raises DownloadError when the content does
+    not match ``expected_hash``, and the last network error once ``retries``
+    resumes have failed. Concurrent calls for the same dest_path run one
+    after the other instead of writing the same partial file.
+    """
+    part_path = dest_path + ".part"
+    meta_path = part_path + ".json"
+    os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+    http = session or requests
+
+    key = _acquire_part(part_path)
+    try:
+        attempt = 0
+        while True:
+            try:
+                digest = _stream(http, url, part_path, meta_path, hash_name, progress, timeout, headers)
+                break
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                logger.info("Download of %s interrupted (%s), resuming (attempt %d/%d)", url, e, attempt, retries)
+                time.sleep(min(0.5 * 2 ** attempt, 5))
+
+        actual = digest.hexdigest()
+        if expected_hash and actual != expected_hash.lower():
+            _remove(part_path, meta_path)
+            raise DownloadError(f"{hash_name} mismatch for {url}: expected {expected_hash}, got {actual}")
+        os.replace(part_path, dest_path)
+        _remove(meta_path)
+        return actual
+    finally:
+        _release_part(key)
@@ -0,0 +1,62 @@
+"""Event bus between worker threads and the UI.
+
+Workers publish log lines and progress from any thread; publishing only
+appends to a list or overwrites a dict entry under a lock. The UI drains the
+bus at a fixed frame rate, so however many events arrive it does one batched
+terminal insert and one progress update per frame.
+"""
+import threading
+from collections import namedtuple
+
+FRAME_RATE = 30
+
+Progress = namedtuple("Progress", "current total")
+Frame = namedtuple("Frame", "lines progress")
+
+
+def progress_percent(progress):
+    """Whole percent done for a Progress, or None when the total is unknown"""
+    if not progress.total:
+        return None
+    return min(int(progress.current * 100 / progress.total), 100)
+
+
+class EventBus:
+    """Collects events between frames; repeated progress updates for a key collapse into the latest one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lines = []
+        self._progress = {}
+        self._totals = {}
+        self.published = 0
+
+    def log(self, text):
+        with self._lock:
+            self._lines.append(str(text))
+            self.published += 1
+
+    def progress(self, key, current, total=None):
+        """Report progress for key; total=None keeps the last known total"""
+        with self._lock:
+            if total is None:
+                total = self._totals.get(key, 0)
+            else:
+                self._totals[key] = total
+            self._progress[key] = Progress(current, total)
+            self.published += 1
+
+    def drain(self):
+        """Take everything published since the last drain"""
+        with self._lock:
+            lines, self._lines = self._lines, []
+            progress, self._progress = self._progress, {}
+        return Frame(lines, progress)
+
+    def callback(self, key, status_prefix="Status: "):
+        """A minecraft_launcher_lib style callback dict that publishes into this bus under key"""
+        return {
+            "setStatus": lambda status: self.log(f"{status_prefix}{status}"),
+            "setProgress": lambda current: self.progress(key, current),
+            "setMax": lambda total: self.progress(key, 0, total),
+        }
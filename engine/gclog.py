@@ -0,0 +1,112 @@
+"""Unified GC logging for launched sessions and its pause-time analysis.
+
+Every session runs with ``-Xlog:gc*`` writing to ``gc.log`` in the session
+directory. After the game exits the log is read line by line (it can grow
+large over a long session, so it is never loaded whole) into pause-time
+percentiles, allocation rate, heap occupancy after GC and the number of full
+collections, which are stored in the session record under ``"gc"``.
+"""
+import logging
+import os
+import re
+
+from .timing import percentile
+
+logger = logging.getLogger(__name__)
+
+GC_LOG_FILE = "gc.log"
+# Unified logging needs Java 9
+MIN_GC_LOG_JAVA = 9
+# [12.345s][info][gc] GC(7) Pause Young (Normal) (G1 Evacuation Pause) 180M->42M(512M) 6.789ms
+# [12.345s][info][gc,phases] GC(3) Pause Mark Start 0.021ms    (ZGC)
+GC_PAUSE = re.compile(
+    r"^\[(?P<uptime>[\d.]+)s\]\[\w+\s*\]\[gc(?:,phases)?\s*\] GC\(\d+\) Pause (?P<kind>.*?)"
+    r"(?: (?P<before>\d+)(?P<before_unit>[KMG])->(?P<after>\d+)(?P<after_unit>[KMG])\(\d+[KMG]\))? (?P<ms>[\d.]+)ms$"
+)
+GC_USING = re.compile(r"\]\[gc(?:,init)?\s*\] Using (?P<collector>.+)$")
+UNITS_MB = {"K": 1 / 1024, "M": 1, "G": 1024}
+
+
+def gc_log_args(path):
+    """JVM arguments that write the unified GC log to path"""
+    # Quoted, since ':' separates -Xlog fields and Windows paths contain one
+    return [f'-Xlog:gc*:file="{path}":uptime,level,tags:filecount=0']
+
+
+def uses_own_gc_log(jvm_args):
+    """Whether the user's JVM arguments already send GC logging to a file"""
+    return any(arg.startswith("-Xloggc") or (arg.startswith("-Xlog:gc") and "file=" in arg) for arg in jvm_args.split())
+
+
+def analyze_gc_log(path):
+    """Summary of a unified GC log, or None when it holds no pauses"""
+    collector = None
+    pauses = []
+    heap_after = []
+    full_gcs = 0
+    allocated_mb = 0.0
+    last_after = 0.0
+    last_uptime = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = GC_PAUSE.match(line.rstrip("\n"))
+            if not match:
+                if collector is None:
+                    using = GC_USING.search(line)
+                    if using:
+                        collector = using.group("collector")
+                continue
+            uptime = float(match.group("uptime"))
+            last_uptime = uptime
+            pauses.append(float(match.group("ms")))
+            if match.group("kind").startswith("Full"):
+                full_gcs += 1
+            if match.group("before"):
+                before = int(match.group("before")) * UNITS_MB[match.group("before_unit")]
+                after = int(match.group("after")) * UNITS_MB[match.group("after_unit")]
+                # Whatever the heap grew by since the last collection was allocated by the game
+                allocated_mb += max(before - last_after, 0)
+                last_after = after
+                heap_after.append(after)
+    if not pauses:
+        return None
+
+    stats = {
+        "collector": collector,
+        "pauses": len(pauses),
+        "pause_p50_ms": round(percentile(pauses, 50), 2),
+        "pause_p95_ms": round(percentile(pauses, 95), 2),
+        "pause_p99_ms": round(percentile(pauses, 99), 2),
+        "pause_max_ms": round(max(pauses), 2),
+        "pause_total_ms": round(sum(pauses), 1),
+        "full_gc_count": full_gcs,
+        "uptime_s": last_uptime,
+    }
+    if heap_after:
+        stats["heap_after_gc_p50_mb"] = round(percentile(heap_after, 50), 1)
+        stats["heap_after_gc_max_mb"] = round(max(heap_after), 1)
+        if last_uptime:
+            stats["allocation_rate_mb_s"] = round(allocated_mb / last_uptime, 1)
+    return stats
+
+
+def summarize_session_gc(session_dir):
+    """analyze_gc_log for a session directory's gc.log, logging instead of raising"""
+    path = os.path.join(session_dir, GC_LOG_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        return analyze_gc_log(path)
+    except OSError as e:
+        logger.warning("Could not read GC log %s: %s", path, e)
+        return None
+
+
+def format_gc_summary(stats):
+    """One-line summary for the terminal"""
+    text = (f"GC ({stats.get('collector') or 'unknown'}): {stats['pauses']} pauses, "
+            f"p50 {stats['pause_p50_ms']:.1f} ms, p95 {stats['pause_p95_ms']:.1f} ms, max {stats['pause_max_ms']:.1f} ms, "
+            f"{stats['full_gc_count']} full")
+    if "allocation_rate_mb_s" in stats:
+        text += f", {stats['allocation_rate_mb_s']:.0f} MB/s allocated, {stats['heap_after_gc_max_mb']:.0f} MB max after GC"
+    return text
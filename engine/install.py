@@ -0,0 +1,326 @@
+"""Parallel version installer.
+
+The version JSON, library list and asset index are resolved into a flat
+download plan up front, then the plan runs on a bounded thread pool that
+shares one keep-alive ``requests.Session``. Every file goes through
+engine.download, so it is SHA1-checked while it streams and resumes after
+interruptions. With an ObjectStore, checksummed files
+are downloaded into the shared store once and linked into the game directory.
+"""
+import hashlib
+import json
+import os
+import platform
+import shutil
+import threading
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import minecraft_launcher_lib
+import requests
+from requests.adapters import HTTPAdapter
+
+from .download import download_file
+from .versions import manifest_cache
+
+LIBRARIES_URL = "https://libraries.minecraft.net"
+RESOURCES_URL = "https://resources.download.minecraft.net"
+DEFAULT_MAX_WORKERS = 16
+CHUNK_SIZE = 64 * 1024
+
+DownloadTask = namedtuple("DownloadTask", "url path sha1 size")
+
+
+class InstallError(Exception):
+    pass
+
+
+def create_session(max_workers=DEFAULT_MAX_WORKERS):
+    """A requests session whose connection pool can serve max_workers threads per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["user-agent"] = f"minecraft-launcher-lib/{minecraft_launcher_lib.utils.get_library_version()}"
+    return session
+
+
+def is_version_installed(version, minecraft_dir):
+    """Check that a version's JSON and client jar (or the parent it inherits from) are present"""
+    version_dir = os.path.join(minecraft_dir, "versions", version)
+    json_path = os.path.join(version_dir, version + ".json")
+    if not os.path.isfile(json_path):
+        return False
+    if os.path.isfile(os.path.join(version_dir, version + ".jar")):
+        return True
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            inherits_from = json.load(f).get("inheritsFrom")
+    except (OSError, ValueError):
+        return False
+    return bool(inherits_from) and is_version_installed(inherits_from, minecraft_dir)
+
+
+def sha1_of_file(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _os_name():
+    return {"Windows": "windows", "Darwin": "osx"}.get(platform.system(), "linux")
+
+
+def library_allowed(library):
+    """Evaluate a library's OS rules for this machine (feature rules never apply to libraries)"""
+    rules = library.get("rules")
+    if not rules:
+        return True
+    allowed = False
+    for rule in rules:
+        os_rule = rule.get("os", {})
+        if "name" in os_rule and os_rule["name"] != _os_name():
+            continue
+        if os_rule.get("arch") == "x86" and platform.architecture()[0] != "32bit":
+            continue
+        if rule.get("features"):
+            continue
+        allowed = rule["action"] == "allow"
+    return allowed
+
+
+def library_natives(library):
+    """Classifier name of the library's natives jar for this OS, or ''"""
+    natives = library.get("natives", {}).get(_os_name(), "")
+    return natives.replace("${arch}", "32" if platform.architecture()[0] == "32bit" else "64")
+
+
+def _maven_path(name):
+    group, artifact, version = name.split(":")[0:3]
+    extension = "jar"
+    if "@" in version:
+        version, extension = version.split("@", 1)
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}.{extension}"])
+
+
+class VersionInstaller:
+    """Installs a version by running its resolved download plan in parallel.
+
+    ``callback`` is a minecraft_launcher_lib style dict: ``setStatus`` gets text,
+    ``setMax`` the total bytes of the plan and ``setProgress`` the bytes done.
+    ``store`` is an optional engine.objects.ObjectStore shared between game directories.
+    """
+
+    def __init__(self, minecraft_dir, callback=None, max_workers=DEFAULT_MAX_WORKERS, session=None,
+                 resources_url=RESOURCES_URL, manifest=None, store=None):
+        self.minecraft_dir = minecraft_dir
+        self.resources_url = resources_url
+        self.manifest = manifest
+        self.callback = callback or {}
+        self.max_workers = max_workers
+        self.store = store
+        self.owners = {}
+        self.existing = set()
+        self.session = session or create_session(max_workers)
+        self._lock = threading.Lock()
+        self._done_bytes = 0
+
+    def _status(self, text):
+        self.callback.get("setStatus", lambda _: None)(text)
+
+    # === Plan resolution ===
+    def _fetch_json(self, task):
+        self.download(task, shared=False)
+        with open(task.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_version_json(self, version):
+        """Read a version JSON, downloading it from the manifest when it isn't on disk"""
+        path = os.path.join(self.minecraft_dir, "versions", version, version + ".json")
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        manifest = self.manifest or manifest_cache.get_manifest() or {"versions": []}
+        for entry in manifest["versions"]:
+            if entry["id"] == version:
+                return self._fetch_json(DownloadTask(entry["url"], path, entry.get("sha1"), 0))
+        raise InstallError(f"Version {version} was not found")
+
+    def resolve_chain(self, version):
+        """Version JSONs from the requested version up through everything it inherits from"""
+        chain = [self.load_version_json(version)]
+        while chain[-1].get("inheritsFrom"):
+            chain.append(self.load_version_json(chain[-1]["inheritsFrom"]))
+        return chain
+
+    def library_tasks(self, libraries):
+        tasks, natives = [], []
+        libraries_dir = os.path.join(self.minecraft_dir, "libraries")
+        for library in libraries:
+            if not library_allowed(library):
+                continue
+            downloads = library.get("downloads", {})
+            artifact = downloads.get("artifact")
+            if artifact and artifact.get("url") and artifact.get("path"):
+                tasks.append(DownloadTask(artifact["url"], os.path.join(libraries_dir, artifact["path"]),
+                                          artifact.get("sha1"), artifact.get("size", 0)))
+            elif not downloads and "name" in library:
+                # Maven-style entries (Fabric, Quilt) only carry a name and repository url
+                relative_path = _maven_path(library["name"])
+                base_url = library.get("url", LIBRARIES_URL).rstrip("/")
+                tasks.append(DownloadTask(f"{base_url}/{relative_path}", os.path.join(libraries_dir, *relative_path.split("/")),
+                                          library.get("sha1"), library.get("size", 0)))
+            classifier = library_natives(library)
+            native = downloads.get("classifiers", {}).get(classifier) if classifier else None
+            if native:
+                task = DownloadTask(native["url"], os.path.join(libraries_dir, native["path"]), native.get("sha1"), native.get("size", 0))
+                tasks.append(task)
+                natives.append((task.path, library.get("extract", {"exclude": []})))
+        return tasks, natives
+
+    def asset_tasks(self, version_data):
+        if "assetIndex" not in version_data:
+            return []
+        index = version_data["assetIndex"]
+        index_path = os.path.join(self.minecraft_dir, "assets", "indexes", version_data["assets"] + ".json")
+        assets = self._fetch_json(DownloadTask(index["url"], index_path, index.get("sha1"), index.get("size", 0)))
+        objects_dir = os.path.join(self.minecraft_dir, "assets", "objects")
+        tasks = {}
+        for obj in assets["objects"].values():
+            digest = obj["hash"]
+            tasks[digest] = DownloadTask(f"{self.resources_url}/{digest[:2]}/{digest}", os.path.join(objects_dir, digest[:2], digest),
+                                         digest, obj.get("size", 0))
+        return list(tasks.values())
+
+    def resolve_plan(self, version):
+        """Resolve a version into (version JSON chain, download tasks, natives to extract)"""
+        self._status("Resolving download plan")
+        chain = self.resolve_chain(version)
+        owned = []  # (version id, tasks), so each version in the chain holds references to its own files
+        natives = []
+        for data in chain:
+            tasks, library_natives_list = self.library_tasks(data.get("libraries", []))
+            natives.extend(library_natives_list)
+            logging_file = data.get("logging", {}).get("client", {}).get("file")
+            if logging_file:
+                tasks.append(DownloadTask(logging_file["url"], os.path.join(self.minecraft_dir, "assets", "log_configs", logging_file["id"]),
+                                          logging_file.get("sha1"), logging_file.get("size", 0)))
+            client = data.get("downloads", {}).get("client")
+            if client:
+                tasks.append(DownloadTask(client["url"], os.path.join(self.minecraft_dir, "versions", data["id"], data["id"] + ".jar"),
+                                          client.get("sha1"), client.get("size", 0)))
+            owned.append((data["id"], tasks))
+        asset_source = next((data for data in chain if "assetIndex" in data), None)
+        if asset_source:
+            owned.append((asset_source["id"], self.asset_tasks(asset_source)))
+
+        unique = {}
+        self.owners = {}
+        self.existing = set()
+        for owner, tasks in owned:
+            for task in tasks:
+                unique.setdefault(os.path.normcase(task.path), task)
+                self.owners.setdefault(owner, {})[task.path] = task.sha1
+        return chain, list(unique.values()), natives
+
+    # === Download execution ===
+    def _advance(self, amount):
+        with self._lock:
+            self._done_bytes += amount
+            done = self._done_bytes
+        self.callback.get("setProgress", lambda _: None)(done)
+
+    def download(self, task, shared=True):
+        """Download one task, verifying SHA1 while streaming. Returns False if it was already present."""
+        store = self.store if shared and task.sha1 else None
+        if not store:
+            return self._fetch(task, None)
+        # Another thread (or installer) fetching the same object finishes first; this one then only links it
+        with store.claim(task.sha1):
+            return self._fetch(task, store)
+
+    def _fetch(self, task, store):
+        if store and os.path.lexists(task.path):
+            # Possibly placed by another launcher for versions the store does not track
+            with self._lock:
+                self.existing.add(task.path)
+        if store and store.has(task.sha1):
+            store.link(task.sha1, task.path)
+            self._advance(task.size)
+            return False
+        if os.path.isfile(task.path) and (task.sha1 is None or sha1_of_file(task.path) == task.sha1):
+            if store:
+                store.adopt(task.path, task.sha1)
+            self._advance(task.size)
+            return False
+
+        target = store.object_path(task.sha1) if store else task.path
+        reported = [0]
+
+        def progress(done, total):
+            self._advance(done - reported[0])
+            reported[0] = done
+
+        download_file(task.url, target, task.sha1, session=self.session, progress=progress)
+        if store:
+            store.link(task.sha1, task.path)
+        return True
+
+    def run_plan(self, tasks):
+        """Download all tasks on the thread pool; returns the number of files fetched"""
+        self._done_bytes = 0
+        self.callback.get("setMax", lambda _: None)(sum(task.size for task in tasks))
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.download, task) for task in tasks]
+            for future in as_completed(futures):
+                if future.result():
+                    fetched += 1
+        return fetched
+
+    def extract_natives(self, version, natives):
+        natives_dir = os.path.join(self.minecraft_dir, "versions", version, "natives")
+        os.makedirs(natives_dir, exist_ok=True)
+        for jar_path, extract in natives:
+            with zipfile.ZipFile(jar_path) as zf:
+                for name in zf.namelist():
+                    if not any(name.startswith(prefix) for prefix in extract.get("exclude", [])):
+                        zf.extract(name, natives_dir)
+
+    def install(self, version):
+        """Install a version and everything it inherits from"""
+        chain, tasks, natives = self.resolve_plan(version)
+        self._status(f"Downloading {len(tasks)} files")
+        fetched = self.run_plan(tasks)
+        if self.store:
+            for owner, files in self.owners.items():
+                self.store.add_version(self.minecraft_dir, owner, {path: sha1 for path, sha1 in files.items() if sha1},
+                                       existing=self.existing)
+        if natives:
+            self._status("Extracting natives")
+            self.extract_natives(version, natives)
+
+        java_version = next((data["javaVersion"] for data in chain if "javaVersion" in data), None)
+        if java_version:
+            self._status("Install java runtime")
+            minecraft_launcher_lib.runtime.install_jvm_runtime(java_version["component"], self.minecraft_dir, callback=self.callback)
+
+        self._status("Installation complete")
+        return fetched
+
+
+def delete_version_data(version, minecraft_dir, store=None):
+    """Remove an installed version, releasing its shared objects.
+
+    Returns (files removed from the game directory, objects freed from the store).
+    """
+    version_dir = os.path.join(minecraft_dir, "versions", version)
+    if not os.path.isdir(version_dir):
+        raise InstallError(f"Version {version} is not installed")
+    shutil.rmtree(version_dir)
+    if store is None:
+        return 0, 0
+    return store.release_version(minecraft_dir, version)
@@ -0,0 +1,194 @@
+"""Check JVM arguments against the flags the selected Java runtime actually has.
+
+``java -XX:+PrintFlagsFinal -version`` lists every -XX flag a runtime knows,
+with its kind (product, experimental, diagnostic). The list is probed once
+per java binary and cached in ``cache/jvm_flags.json`` keyed by the binary's
+path and mtime. Before a launch, -XX flags the runtime does not know are
+replaced with their modern equivalent or dropped, since one unrecognized
+option makes the JVM refuse to start.
+"""
+import logging
+import os
+import re
+import subprocess
+import threading
+
+from .cds import JAVA_VERSION, java_major_version
+from .config import CACHE_DIR, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+JVM_FLAGS_CACHE_FILE = os.path.join(CACHE_DIR, "jvm_flags.json")
+PROBE_TIMEOUT = 30
+#      bool UseG1GC                                  = true                                   {product} {ergonomic}
+FLAG_LINE = re.compile(r"^\s*\S+\s+(?P<name>\w+)\s+:?=.*?\{(?P<kind>[^}]*)\}", re.M)
+XX_FLAG = re.compile(r"^-XX:(?P<sign>[+-]?)(?P<name>\w+)(?P<value>=.*)?$")
+UNLOCK_FLAGS = {
+    "experimental": "-XX:+UnlockExperimentalVMOptions",
+    "diagnostic": "-XX:+UnlockDiagnosticVMOptions",
+}
+# Removed flags and what replaces them on newer runtimes (None: drop). A bare name is the flag's new name and
+# keeps the +/- sign; a full option only stands in for a flag that was switched on.
+FLAG_REPLACEMENTS = {
+    "UseFastAccessorMethods": None,
+    "AggressiveOpts": None,
+    "UseAdaptiveGCBoundary": None,
+    "PrintGCTimeStamps": None,
+    "PrintGCDateStamps": None,
+    "UseCGroupMemoryLimitForHeap": "UseContainerSupport",
+    "UseConcMarkSweepGC": "UseG1GC",
+    "CMSIncrementalMode": None,
+    "UseParNewGC": None,
+    "PrintGC": "-Xlog:gc",
+    "PrintGCDetails": "-Xlog:gc*",
+}
+# Flags that select the garbage collector; only one may be switched on
+GC_FLAGS = {"UseSerialGC", "UseParallelGC", "UseParallelOldGC", "UseG1GC", "UseZGC", "UseShenandoahGC",
+            "UseEpsilonGC", "UseConcMarkSweepGC"}
+
+
+class JVMFlagProbe:
+    """Supported -XX flags per java binary, probed once and cached on disk"""
+
+    def __init__(self, cache_file=JVM_FLAGS_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = load_json(self.cache_file, {})
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable JVM flag cache: %s", e)
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            save_json(tmp_file, self._entries)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Failed to save JVM flag cache: %s", e)
+
+    def probe(self, java_path):
+        """{"java_version": major, "flags": {name: kind}} for a java binary, or None if it cannot be run"""
+        try:
+            mtime = os.stat(java_path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(java_path)
+            if entry and entry.get("mtime") == mtime:
+                return entry
+
+        try:
+            # Locked experimental and diagnostic flags are left out of the listing unless unlocked
+            result = subprocess.run([java_path, *UNLOCK_FLAGS.values(), "-XX:+PrintFlagsFinal", "-version"],
+                                    capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("Could not probe JVM flags of %s: %s", java_path, e)
+            return None
+        flags = {}
+        for match in FLAG_LINE.finditer(result.stdout):
+            kind = match.group("kind")
+            flags[match.group("name")] = next((k for k in UNLOCK_FLAGS if k in kind), "product")
+        if not flags:
+            logger.warning("No JVM flags reported by %s (exit code %s)", java_path, result.returncode)
+            return None
+        version = JAVA_VERSION.search(result.stderr)
+        entry = {
+            "mtime": mtime,
+            "java_version": java_major_version(version.group("version")) if version else None,
+            "flags": flags,
+        }
+        with self._lock:
+            self._load()[java_path] = entry
+            self._save()
+        return entry
+
+    def check_args(self, java_path, jvm_args):
+        """(checked argument list, notes) with unsupported flags replaced or dropped and unlock flags added as needed.
+
+        The arguments come back unchanged when the runtime cannot be probed.
+        """
+        args = jvm_args.split() if isinstance(jvm_args, str) else list(jvm_args)
+        entry = self.probe(java_path) if java_path else None
+        if not entry:
+            return args, []
+        return check_jvm_args(args, entry["flags"], entry.get("java_version"))
+
+
+jvm_flag_probe = JVMFlagProbe()
+
+
+def check_jvm_args(args, flags, java_version=None):
+    """Filter args against a probed flag table; see JVMFlagProbe.check_args"""
+    checked, notes, unlocks = [], [], []
+    for arg in args:
+        if arg in UNLOCK_FLAGS.values():
+            # The JVM applies options in order, so unlocks go first
+            if arg not in unlocks:
+                unlocks.append(arg)
+            continue
+        if arg.startswith("-Xlog") and java_version and java_version < 9:
+            notes.append(f"dropped {arg} (needs Java 9+)")
+            continue
+        match = XX_FLAG.match(arg)
+        if not match:
+            checked.append(arg)
+            continue
+        name = match.group("name")
+        if name in flags:
+            unlock = UNLOCK_FLAGS.get(flags[name])
+            if unlock and unlock not in args and unlock not in unlocks:
+                unlocks.append(unlock)
+                notes.append(f"added {unlock} for {arg}")
+            checked.append(arg)
+            continue
+        replacement = _replacement(match.group("sign"), name, args)
+        if replacement and not _sets(args + checked, replacement) and _supported(replacement, flags, java_version):
+            checked.append(replacement)
+            notes.append(f"replaced {arg} with {replacement}")
+        else:
+            notes.append(f"dropped {arg} (not supported by this Java)")
+    return unlocks + checked, notes
+
+
+def _replacement(sign, name, args):
+    """The option standing in for a removed -XX flag given its sign, or None to drop it"""
+    replacement = FLAG_REPLACEMENTS.get(name)
+    if replacement is None:
+        return None
+    if replacement.startswith("-"):
+        return replacement if sign != "-" else None
+    if replacement in GC_FLAGS:
+        # Switching the old collector off selects nothing, and another selected collector wins over the stand-in
+        if sign == "-" or any(_gc_flag(arg) not in (None, name) for arg in args):
+            return None
+    return f"-XX:{sign or '+'}{replacement}"
+
+
+def _gc_flag(arg):
+    """Name of the collector an argument switches on, if any"""
+    match = XX_FLAG.match(arg)
+    if match and match.group("sign") == "+" and match.group("name") in GC_FLAGS:
+        return match.group("name")
+    return None
+
+
+def _sets(args, option):
+    """Whether args already set option, for -XX flags with either sign"""
+    match = XX_FLAG.match(option)
+    if not match:
+        return option in args
+    return any(m and m.group("name") == match.group("name") for m in map(XX_FLAG.match, args))
+
+
+def _supported(arg, flags, java_version):
+    if arg.startswith("-Xlog"):
+        return bool(java_version and java_version >= 9)
+    match = XX_FLAG.match(arg)
+    return not match or match.group("name") in flags
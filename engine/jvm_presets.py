@@ -0,0 +1,216 @@
+"""JVM argument presets, including an "Auto" preset sized for this machine and mod load."""
+import logging
+import os
+
+from .config import MINECRAFT_DIR
+from .process import list_sessions
+
+logger = logging.getLogger(__name__)
+
+AUTO_PRESET = "Auto"
+
+JVM_PRESETS = {
+    "Default": {
+        "args": "",
+        "description": "No custom JVM arguments - uses Minecraft defaults"
+    },
+    AUTO_PRESET: {
+        "args": "",
+        "description": "Heap and GC sized from this machine's memory and CPUs, the mods folder, running instances and past GC pauses"
+    },
+    "Performance": {
+        "args": "-Xmx4G -Xms4G -XX:+UseG1GC -XX:+UnlockExperimentalVMOptions -XX:+DisableExplicitGC -XX:+UseAdaptiveGCBoundary -XX:MaxGCPauseMillis=100 -XX:+UseStringDeduplication -XX:+UseCompressedOops -XX:+OptimizeStringConcat -XX:+UseFastAccessorMethods",
+        "description": "Optimized for performance with G1GC and memory management"
+    },
+    "Low Memory": {
+        "args": "-Xmx2G -Xms1G -XX:+UseSerialGC -XX:+OptimizeStringConcat",
+        "description": "Minimal memory usage for low-end systems"
+    },
+    "High Performance": {
+        "args": "-Xmx8G -Xms4G -XX:+UseG1GC -XX:+UnlockExperimentalVMOptions -XX:+DisableExplicitGC -XX:G1NewSizePercent=20 -XX:G1ReservePercent=20 -XX:MaxGCPauseMillis=50 -XX:G1HeapRegionSize=32M -XX:+UseStringDeduplication -XX:+UseCompressedOops -XX:+OptimizeStringConcat -XX:+UseFastAccessorMethods -XX:+AggressiveOpts",
+        "description": "High-performance settings for powerful systems with 8GB+ RAM"
+    },
+    "Debug": {
+        "args": "-Xmx4G -Xms2G -XX:+UnlockDiagnosticVMOptions -XX:+DebugNonSafepoints",
+        "description": "Debug settings for troubleshooting; GC activity goes to the session's gc.log (Java 9+)"
+    },
+    "Server": {
+        "args": "-Xmx6G -Xms3G -XX:+UseG1GC -XX:MaxGCPauseMillis=200 -XX:+UnlockExperimentalVMOptions -XX:+UseCGroupMemoryLimitForHeap -XX:+UseLargePages -XX:LargePageSizeInBytes=2m",
+        "description": "Server-optimized settings for dedicated server environments"
+    }
+}
+
+JVM_ARG_EXPLANATIONS = {
+    "-Xmx": "Maximum heap size (e.g., -Xmx4G for 4GB)",
+    "-Xms": "Initial heap size (e.g., -Xms2G for 2GB)",
+    "-XX:+UseG1GC": "Use G1 Garbage Collector (recommended for most cases)",
+    "-XX:+UseSerialGC": "Use Serial Garbage Collector (for low memory systems)",
+    "-XX:+UseParallelGC": "Use Parallel Garbage Collector",
+    "-XX:+UseConcMarkSweepGC": "Use Concurrent Mark Sweep Garbage Collector",
+    "-XX:+UnlockExperimentalVMOptions": "Allow experimental JVM options",
+    "-XX:+DisableExplicitGC": "Disable explicit garbage collection calls",
+    "-XX:MaxGCPauseMillis": "Maximum GC pause time in milliseconds",
+    "-XX:+UseStringDeduplication": "Enable string deduplication to save memory",
+    "-XX:+UseCompressedOops": "Use compressed object pointers (64-bit systems)",
+    "-XX:+OptimizeStringConcat": "Optimize string concatenation",
+    "-XX:+UseFastAccessorMethods": "Use fast accessor methods",
+    "-XX:+AggressiveOpts": "Enable aggressive optimizations",
+    "-XX:+PrintGC": "Print GC information",
+    "-XX:+PrintGCDetails": "Print detailed GC information",
+    "-XX:+PrintGCTimeStamps": "Print GC timestamps",
+    "-XX:G1NewSizePercent": "Percentage of heap for young generation (G1GC)",
+    "-XX:G1ReservePercent": "Reserved heap percentage (G1GC)",
+    "-XX:G1HeapRegionSize": "Heap region size for G1GC",
+    "-XX:+UseCGroupMemoryLimitForHeap": "Use cgroup memory limits for heap sizing",
+    "-XX:+UseLargePages": "Use large pages for better performance",
+    "-XX:LargePageSizeInBytes": "Large page size in bytes"
+}
+
+# === Auto Tuning ===
+MIN_HEAP_MB = 1024
+MAX_HEAP_MB = 16384
+BASE_HEAP_MB = 2048
+PER_MOD_HEAP_MB = 32
+OS_RESERVE_MB = 2048
+PAUSE_TARGET_MS = 50
+GC_HISTORY_SESSIONS = 20
+MINECRAFT_MAIN_CLASSES = ("net.minecraft.client.main.Main", "net.fabricmc.loader.impl.launch.knot.KnotClient",
+                          "org.quiltmc.loader.impl.launch.knot.KnotClient", "cpw.mods.bootstraplauncher.BootstrapLauncher")
+
+
+def mods_load(minecraft_dir=MINECRAFT_DIR):
+    """(number of jars, total MB) in the mods folder"""
+    count = size = 0
+    try:
+        with os.scandir(os.path.join(minecraft_dir, "mods")) as entries:
+            for entry in entries:
+                if entry.name.endswith(".jar") and entry.is_file():
+                    count += 1
+                    size += entry.stat().st_size
+    except OSError:
+        pass
+    return count, size / 1024 / 1024
+
+
+def count_running_instances():
+    """Number of Minecraft clients running on this machine"""
+    import psutil
+    count = 0
+    for process in psutil.process_iter(["cmdline"]):
+        cmdline = process.info.get("cmdline") or []
+        if any(main_class in cmdline for main_class in MINECRAFT_MAIN_CLASSES):
+            count += 1
+    return count
+
+
+def recent_gc_stats(limit=GC_HISTORY_SESSIONS):
+    """GC summaries of recent sessions that recorded one"""
+    return [record["gc"] for record in list_sessions(limit=limit) if record.get("gc")]
+
+
+def _round_heap(mb):
+    return max(MIN_HEAP_MB, min(MAX_HEAP_MB, int(mb) // 256 * 256))
+
+
+def auto_tune(total_mb, available_mb, cpus, mod_count=0, mods_mb=0, instances=0, gc_history=()):
+    """(JVM arguments, reasons) for a heap and GC that fit the machine and the mod load"""
+    reasons = []
+    need = BASE_HEAP_MB + PER_MOD_HEAP_MB * mod_count + 2 * mods_mb
+    reasons.append(f"{mod_count} mods ({mods_mb:.0f} MB of jars): about {need:.0f} MB of heap wanted")
+
+    live_peak = max((stats.get("heap_after_gc_max_mb") or 0 for stats in gc_history), default=0)
+    if live_peak * 1.5 > need:
+        need = live_peak * 1.5
+        reasons.append(f"past sessions kept up to {live_peak:.0f} MB live after GC: raised to {need:.0f} MB")
+    full_gcs = sum(stats.get("full_gc_count") or 0 for stats in gc_history)
+    if full_gcs:
+        need *= 1.25
+        reasons.append(f"{full_gcs} full GCs in recent sessions: 25% more headroom")
+
+    budget = min((total_mb - OS_RESERVE_MB) / (instances + 1), available_mb - 1024)
+    heap = _round_heap(min(need, budget))
+    if need > MAX_HEAP_MB and budget > MAX_HEAP_MB:
+        reasons.append(f"capped at {heap} MB: larger heaps mostly lengthen G1 pauses")
+    elif need > budget:
+        reasons.append(f"capped at {heap} MB to leave {OS_RESERVE_MB} MB for the system"
+                       + (f" and room for {instances} running instance(s)" if instances else "")
+                       + f" ({total_mb:.0f} MB total, {available_mb:.0f} MB free)")
+    if instances or heap > available_mb - 1024:
+        initial = _round_heap(heap / 2)
+        reasons.append(f"-Xms{initial}M: only half the heap is committed up front because memory is shared")
+    else:
+        initial = heap
+        reasons.append("-Xms equals -Xmx so the heap never has to grow during play")
+    args = [f"-Xmx{heap}M", f"-Xms{initial}M"]
+
+    if cpus <= 2 or heap < 2048:
+        young = heap // 3
+        args += ["-XX:+UseSerialGC", f"-Xmn{young}M"]
+        reasons.append(f"SerialGC with a {young} MB young generation: with {cpus} CPU(s) and a {heap} MB heap, "
+                       "concurrent GC threads would only compete with the game")
+        return " ".join(args), reasons
+
+    args += ["-XX:+UseG1GC", f"-XX:MaxGCPauseMillis={PAUSE_TARGET_MS}", "-XX:+UnlockExperimentalVMOptions"]
+    reasons.append(f"G1GC with a {PAUSE_TARGET_MS} ms pause target: {cpus} CPUs, {heap} MB heap")
+    pause_p95 = max((stats.get("pause_p95_ms") or 0 for stats in gc_history), default=0)
+    if pause_p95 > 2 * PAUSE_TARGET_MS:
+        args += ["-XX:G1NewSizePercent=20", "-XX:G1MaxNewSizePercent=30"]
+        reasons.append(f"past p95 GC pause {pause_p95:.0f} ms: smaller young generation (20-30%) for shorter pauses")
+    else:
+        args += ["-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40"]
+        reasons.append("young generation 30-40%: the game allocates mostly short-lived objects")
+    region = 16 if heap >= 8192 else 8
+    args += [f"-XX:G1HeapRegionSize={region}M", "-XX:G1ReservePercent=20"]
+    reasons.append(f"{region} MB regions so chunk data is not allocated as humongous objects")
+    if instances:
+        threads = max(2, cpus // (instances + 1))
+        args.append(f"-XX:ParallelGCThreads={threads}")
+        reasons.append(f"{threads} GC threads to share {cpus} CPUs with {instances} running instance(s)")
+    return " ".join(args), reasons
+
+
+class JVMPresetManager:
+    def __init__(self, current_jvm_args_var, append_terminal_callback, minecraft_dir=MINECRAFT_DIR):
+        self.current_jvm_args_var = current_jvm_args_var
+        self.append_terminal = append_terminal_callback
+        self.minecraft_dir = minecraft_dir
+        self.auto_reasons = []
+
+    def auto_preset(self):
+        """(JVM arguments, reasons) tuned for this machine, mods folder, running instances and past GC data"""
+        import psutil
+        memory = psutil.virtual_memory()
+        mod_count, mods_mb = mods_load(self.minecraft_dir)
+        try:
+            instances = count_running_instances()
+        except psutil.Error as e:
+            logger.warning("Could not count running instances: %s", e)
+            instances = 0
+        return auto_tune(memory.total / 1024 / 1024, memory.available / 1024 / 1024, os.cpu_count() or 1,
+                         mod_count, mods_mb, instances, recent_gc_stats())
+
+    def apply_preset(self, preset_name):
+        """Apply a JVM preset"""
+        if preset_name == AUTO_PRESET:
+            try:
+                args, self.auto_reasons = self.auto_preset()
+            except Exception as e:
+                self.append_terminal(f"Auto JVM tuning failed: {e}")
+                return False
+            self.current_jvm_args_var.set(args)
+            self.append_terminal(f"JVM preset '{AUTO_PRESET}' applied: {args}")
+            for reason in self.auto_reasons:
+                self.append_terminal(f"  - {reason}")
+            return True
+        if preset_name in JVM_PRESETS:
+            preset = JVM_PRESETS[preset_name]
+            self.current_jvm_args_var.set(preset["args"])
+            self.append_terminal(f"JVM preset '{preset_name}' applied")
+            return True
+        return False
+
+    def get_preset_description(self, preset_name):
+        """Get description for a preset"""
+        if preset_name in JVM_PRESETS:
+            return JVM_PRESETS[preset_name]["description"]
+        return ""
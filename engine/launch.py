@@ -0,0 +1,364 @@
+"""Version installation, login options and game process startup."""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import minecraft_launcher_lib
+
+from .accounts import AccountSessionManager, offline_uuid
+from .cds import class_data_archives, resolve_java, uses_own_cds_args
+from .config import CACHE_DIR, LAUNCHER_NAME, LAUNCHER_VERSION, load_json, save_json
+from .gclog import GC_LOG_FILE, MIN_GC_LOG_JAVA, gc_log_args, uses_own_gc_log
+from .install import VersionInstaller, delete_version_data, is_version_installed
+from .jvm_flags import jvm_flag_probe
+from .objects import shared_store
+from .policy import apply_after_spawn, format_cpu_list, limit_command, resolve_policy, schedule_command
+from .process import (
+    DEFAULT_MAX_LINES_PER_SECOND, DEFAULT_MIN_LEVEL, GameSession, list_sessions, new_session_id, save_session_record,
+    session_dir, spawn_game,
+)
+from .resolver import ModCheckError, mod_resolver
+from .sampler import DEFAULT_SAMPLE_INTERVAL
+from .timing import PhaseTimer, summarize_spans
+
+logger = logging.getLogger(__name__)
+
+# === Command Caching ===
+COMMAND_CACHE_FILE = os.path.join(CACHE_DIR, "launch_commands.json")
+MAX_COMMAND_CACHE_SIZE = 50
+# Account fields change between launches and must never be written to disk;
+# commands are generated with these placeholders and filled in at launch time
+AUTH_PLACEHOLDERS = {
+    "username": "${omni_username}",
+    "uuid": "${omni_uuid}",
+    "token": "${omni_token}",
+}
+
+
+def version_chain_files(version, minecraft_dir):
+    """Paths of a version's JSON and every JSON it inherits from"""
+    paths = []
+    while version and len(paths) < 10:
+        path = os.path.join(minecraft_dir, "versions", version, version + ".json")
+        paths.append(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                version = json.load(f).get("inheritsFrom")
+        except (OSError, ValueError):
+            break
+    return paths
+
+
+def command_cache_key(version, minecraft_dir, options):
+    """Hash of the version JSON chain (content and mtimes), installed Java runtimes and non-auth options"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([version, os.path.abspath(minecraft_dir)]).encode())
+    for path in version_chain_files(version, minecraft_dir):
+        try:
+            stat = os.stat(path)
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}:".encode())
+        digest.update(content)
+    # A list of runtime directory names, e.g. ["java-runtime-gamma"]
+    runtimes = sorted(minecraft_launcher_lib.runtime.get_installed_jvm_runtimes(minecraft_dir))
+    options = {k: v for k, v in options.items() if k not in AUTH_PLACEHOLDERS}
+    digest.update(json.dumps([runtimes, options], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class CommandCache:
+    """Generated launch commands on disk, keyed by command_cache_key, with auth fields left as placeholders"""
+
+    def __init__(self, cache_file=COMMAND_CACHE_FILE, max_size=MAX_COMMAND_CACHE_SIZE):
+        self.cache_file = cache_file
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = load_json(self.cache_file, {})
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable launch command cache: %s", e)
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            save_json(tmp_file, self._entries)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Failed to save launch command cache: %s", e)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._load().get(key) if key else None
+            return list(entry["command"]) if entry else None
+
+    def put(self, key, version, command):
+        if not key:
+            return
+        with self._lock:
+            entries = self._load()
+            entries.pop(key, None)
+            while len(entries) >= self.max_size:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del entries[next(iter(entries))]
+            entries[key] = {"version": version, "command": command, "created_at": time.time()}
+            self._save()
+
+    def invalidate(self, version):
+        """Drop every cached command for a version (after it is reinstalled or removed)"""
+        with self._lock:
+            entries = self._load()
+            stale = [key for key, entry in entries.items() if entry["version"] == version]
+            for key in stale:
+                del entries[key]
+            if stale:
+                self._save()
+
+
+command_cache = CommandCache()
+
+
+def fill_auth(command, options):
+    """Substitute the real account fields into a cached command template"""
+    replacements = [(placeholder, str(options.get(field, ""))) for field, placeholder in AUTH_PLACEHOLDERS.items()]
+    filled = []
+    for arg in command:
+        if "${omni_" in arg:
+            for placeholder, value in replacements:
+                arg = arg.replace(placeholder, value)
+        filled.append(arg)
+    return filled
+
+
+class GameLauncher:
+    def __init__(self, minecraft_dir, config_data, append_terminal_callback, save_config_callback=None, accounts=None):
+        self.minecraft_dir = minecraft_dir
+        self.config_data = config_data
+        self.append_terminal = append_terminal_callback
+        self.save_config = save_config_callback
+        self.accounts = accounts or AccountSessionManager(config_data, save_config_callback, append_terminal_callback)
+        self.command_cached = False
+
+    def is_installed(self, version):
+        """Check whether a version is already installed"""
+        return is_version_installed(version, self.minecraft_dir)
+
+    @property
+    def store(self):
+        """The shared object store, unless disabled with the "use_shared_store" config option"""
+        return shared_store if self.config_data.get("use_shared_store", True) else None
+
+    def install_version(self, version, callback=None):
+        """Install a version with the parallel installer, reporting through a minecraft_launcher_lib callback dict"""
+        command_cache.invalidate(version)
+        fetched = VersionInstaller(self.minecraft_dir, callback, store=self.store).install(version)
+        self.append_terminal(f"Downloaded {fetched} files.")
+
+    def delete_version(self, version):
+        """Remove an installed version and release the shared objects only it used"""
+        command_cache.invalidate(version)
+        class_data_archives.remove(version)
+        removed, freed = delete_version_data(version, self.minecraft_dir, self.store)
+        self.append_terminal(f"Removed {version}: {removed} linked files, {freed} shared objects freed.")
+
+    def get_login_options(self, username):
+        """Build launch options from the active Microsoft account's cached token, refreshing it only if it expired"""
+        active = self.accounts.active()
+        login = self.accounts.get_valid_login() if active else None
+        if active and not login:
+            self.append_terminal("Microsoft login could not be refreshed. Falling back to offline mode.")
+
+        if login:
+            self.append_terminal(f"Using Microsoft account: {login['name']}")
+            return {
+                "username": login["name"],
+                "uuid": login["id"],
+                "token": login["access_token"],
+                "launcherName": LAUNCHER_NAME,
+                "launcherVersion": LAUNCHER_VERSION,
+            }
+
+        self.append_terminal("Using offline mode")
+        return {
+            "username": username,
+            "uuid": offline_uuid(username),
+            "token": "",
+            "launcherName": LAUNCHER_NAME,
+            "launcherVersion": LAUNCHER_VERSION,
+        }
+
+    def generate_command(self, version, options):
+        """The launch command for options, from the command cache when possible"""
+        key = command_cache_key(version, self.minecraft_dir, options)
+        template = command_cache.get(key)
+        self.command_cached = template is not None
+        if self.command_cached:
+            self.append_terminal("Using cached launch command.")
+        else:
+            self.append_terminal("Generating launch command...")
+            template = minecraft_launcher_lib.command.get_minecraft_command(version, self.minecraft_dir, dict(options, **AUTH_PLACEHOLDERS))
+            command_cache.put(key, version, template)
+        return fill_auth(template, options)
+
+    def check_mods(self, version):
+        """Report missing, conflicting and duplicate mods for this version unless disabled with "check_mods".
+
+        Raises ModCheckError when "block_on_mod_errors" is set and errors were found.
+        """
+        if not self.config_data.get("check_mods", True) or not os.path.isdir(os.path.join(self.minecraft_dir, "mods")):
+            return None
+        result = mod_resolver.check_version(version, self.minecraft_dir)
+        errors = [issue for issue in result["issues"] if issue["severity"] == "error"]
+        for issue in result["issues"]:
+            self.append_terminal(f"Mod check {issue['severity']}: {issue['message']}")
+        if errors and self.config_data.get("block_on_mod_errors", False):
+            raise ModCheckError(f"{len(errors)} mod problem(s) found; not launching")
+        return {"mods": result["mods"], "errors": len(errors), "warnings": len(result["issues"]) - len(errors)}
+
+    def check_jvm_args(self, command, jvm_args=""):
+        """Replace or drop JVM arguments the command's Java does not support, unless "check_jvm_flags" is off"""
+        if not jvm_args.strip() or not self.config_data.get("check_jvm_flags", True):
+            return jvm_args
+        args, notes = jvm_flag_probe.check_args(resolve_java(command[0]), jvm_args)
+        for note in notes:
+            self.append_terminal(f"JVM argument check: {note}")
+        return " ".join(args)
+
+    def merge_jvm_args(self, command, jvm_args=""):
+        """Insert custom JVM arguments right after the java binary"""
+        jvm = jvm_args.strip().split()
+        if jvm:
+            command = command[:1] + jvm + command[1:]
+            self.append_terminal(f"JVM arguments applied: {' '.join(jvm)}")
+        return command
+
+    def apply_class_data_archive(self, version, command, jvm_args=""):
+        """Add AppCDS arguments for this version, java and mod set unless disabled with "use_cds" or set by the user"""
+        if not self.config_data.get("use_cds", True) or uses_own_cds_args(jvm_args):
+            return command, None
+        cds_args, mode = class_data_archives.prepare(version, command, self.minecraft_dir)
+        if mode == "use":
+            self.append_terminal("Using class data archive.")
+        elif mode == "create":
+            self.append_terminal("Class data archive will be created when the game exits.")
+        elif mode == "auto":
+            self.append_terminal("Using self-updating class data archive.")
+        return command[:1] + cds_args + command[1:], mode
+
+    def apply_gc_log(self, session_id, command, jvm_args=""):
+        """Log GC to the session directory on Java 9+, unless disabled with "gc_logging" or logged by the user"""
+        if not self.config_data.get("gc_logging", True) or uses_own_gc_log(jvm_args):
+            return command
+        java_path = resolve_java(command[0])
+        java_version = class_data_archives.java_version(java_path) if java_path else None
+        if not java_version or java_version < MIN_GC_LOG_JAVA:
+            return command
+        path = os.path.join(session_dir(session_id), GC_LOG_FILE)
+        return command[:1] + gc_log_args(path) + command[1:]
+
+    def apply_launch_policy(self, command):
+        """(command, resolved policy, settings to apply after spawning, cgroup limits) for the "launch_policy" config entry"""
+        policy = self.config_data.get("launch_policy") or {}
+        if not policy:
+            return command, {}, {}, None
+        resolved = resolve_policy(policy)
+        command, after_spawn = schedule_command(command, resolved)
+        command, cgroup = limit_command(command, resolved)
+        if "affinity" in resolved:
+            self.append_terminal(f"CPU affinity: {format_cpu_list(resolved['affinity'])}")
+        if cgroup:
+            self.append_terminal(f"Resource limits: {cgroup}")
+        elif resolved.get("memory_max_mb") or resolved.get("cpu_max_percent"):
+            self.append_terminal("Resource limits need cgroup v2 and a systemd user session; starting without them.")
+        return command, resolved, after_spawn, cgroup
+
+    def build_command(self, version, options, jvm_args=""):
+        """Generate the launch command (or reuse the cached one) and merge custom JVM arguments after the java binary"""
+        return self.merge_jvm_args(self.generate_command(version, options), jvm_args)
+
+    def launch(self, version, username, jvm_args="", callback=None, on_exit=None):
+        """Install if needed, then start Minecraft and return its supervising GameSession.
+
+        Each phase is timed as a span; the spans are saved with the session
+        record, or on their own with the error if the launch fails before spawning.
+        """
+        self.append_terminal(f"Preparing to launch Minecraft {version}...")
+        timer = PhaseTimer()
+        details = {"jvm_args": jvm_args, "library_version": minecraft_launcher_lib.utils.get_library_version()}
+        session_id = new_session_id()
+        try:
+            with timer.phase("install_check"):
+                installed = self.is_installed(version)
+            if not installed:
+                self.append_terminal("Version not installed. Starting download...")
+                with timer.phase("install"):
+                    self.install_version(version, callback)
+                self.append_terminal("Installation completed!")
+            else:
+                self.append_terminal("Version already installed. Skipping download.")
+
+            with timer.phase("mod_check"):
+                details["mod_check"] = self.check_mods(version)
+
+            with timer.phase("auth"):
+                options = self.get_login_options(username)
+            t0 = time.perf_counter()
+            command = self.generate_command(version, options)
+            timer.record("command_cached" if self.command_cached else "command", (time.perf_counter() - t0) * 1000,
+                         (t0 - timer.start) * 1000)
+            with timer.phase("jvm_args"):
+                checked = self.check_jvm_args(command, jvm_args)
+                if checked != jvm_args:
+                    details["jvm_args_checked"] = jvm_args = checked
+                command = self.merge_jvm_args(command, jvm_args)
+            with timer.phase("cds"):
+                command, details["cds"] = self.apply_class_data_archive(version, command, jvm_args)
+            with timer.phase("gc_log"):
+                command = self.apply_gc_log(session_id, command, jvm_args)
+
+            with timer.phase("policy"):
+                command, policy, after_spawn, cgroup = self.apply_launch_policy(command)
+
+            self.append_terminal("Launching Minecraft...")
+            token = options.get("token")
+            self.append_terminal(f"Command: {' '.join(arg.replace(token, '***') for arg in command) if token else ' '.join(command)}")
+            with timer.phase("spawn"):
+                process = spawn_game(command, self.minecraft_dir)
+            if policy:
+                try:
+                    apply_after_spawn(process.pid, after_spawn)
+                except Exception as e:
+                    self.append_terminal(f"Could not apply launch policy: {e}")
+                # Read by the session at the game's first log line, once the wrappers have exec'd the JVM
+                details["launch_policy"] = {"requested": policy, "applied": None, "cgroup": cgroup}
+        except Exception as e:
+            save_session_record(dict(details, id=session_id, version=version, started_at=time.time(), error=str(e),
+                                     spans=timer.to_list()))
+            raise
+        session = GameSession(
+            process, version, self.append_terminal, on_exit,
+            min_level=self.config_data.get("game_log_level", DEFAULT_MIN_LEVEL),
+            max_lines_per_second=self.config_data.get("game_log_rate", DEFAULT_MAX_LINES_PER_SECOND),
+            session_id=session_id, timer=timer, details=details,
+            sample_interval=self.config_data.get("sample_interval", DEFAULT_SAMPLE_INTERVAL),
+        ).start()
+        self.append_terminal("Minecraft launched successfully!")
+        self.append_terminal(f"Launch timings: {timer.summary()}")
+        return session
+
+
+def launch_timing_summary(limit=50):
+    """p50/p95 per launch phase over the most recent launches"""
+    return summarize_spans(record.get("spans", []) for record in list_sessions(limit=limit))
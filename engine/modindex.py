@@ -0,0 +1,393 @@
+"""Persistent index of mod jar metadata.
+
+Each jar's metadata (id, version, loader, Minecraft range, dependencies) is
+parsed from ``fabric.mod.json``, ``quilt.mod.json``,
+``META-INF/neoforge.mods.toml``, ``META-INF/mods.toml`` or the manifest, along
+with the ids and versions of the mods nested inside it (jar-in-jar), and
+stored in SQLite under ``cache/`` keyed by path, size and mtime. A rescan only
+opens jars whose size or mtime changed; SHA1 is computed the first time
+someone asks for it and kept until the file changes.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+
+from .config import CACHE_DIR
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+logger = logging.getLogger(__name__)
+
+MOD_INDEX_FILE = os.path.join(CACHE_DIR, "mods.sqlite")
+SCHEMA_VERSION = 3
+METADATA_FIELDS = ("mod_id", "name", "version", "loader", "minecraft", "dependencies", "breaks", "provides", "bundled",
+                   "error")
+JSON_FIELDS = ("dependencies", "breaks", "provides", "bundled")
+# Where Fabric/Quilt (Loom) and Forge/NeoForge (JarJar) put nested jars
+NESTED_JAR_DIRS = ("META-INF/jars/", "META-INF/jarjar/")
+MAX_NESTING = 3
+# Dependencies every mod of a loader has; they say nothing about other mods
+PLATFORM_IDS = {"minecraft", "java", "fabricloader", "quilt_loader", "forge", "neoforge"}
+
+
+# === Parsing ===
+def _json_entry(zip_ref, name):
+    with zip_ref.open(name) as f:
+        # Some mods ship raw control characters inside strings
+        return json.loads(f.read().decode("utf-8", errors="replace"), strict=False)
+
+
+def _read_manifest(zip_ref):
+    try:
+        with zip_ref.open("META-INF/MANIFEST.MF") as f:
+            text = f.read().decode("utf-8", errors="replace")
+    except KeyError:
+        return {}
+    manifest = {}
+    for line in text.splitlines():
+        if ":" in line and not line.startswith(" "):
+            key, value = line.split(":", 1)
+            manifest[key.strip()] = value.strip()
+    return manifest
+
+
+def _split_depends(depends):
+    """(minecraft range, other dependencies) from a loader's dependency mapping"""
+    minecraft = depends.get("minecraft")
+    if isinstance(minecraft, list):
+        minecraft = " || ".join(map(str, minecraft))
+    return minecraft, {mod_id: rng for mod_id, rng in depends.items() if mod_id not in PLATFORM_IDS}
+
+
+def _parse_fabric(data):
+    minecraft, dependencies = _split_depends(data.get("depends") or {})
+    provides = data.get("provides") or []
+    return {
+        "mod_id": data.get("id"),
+        "name": data.get("name") or data.get("id"),
+        "version": str(data.get("version", "")),
+        "loader": "Fabric",
+        "minecraft": minecraft,
+        "dependencies": dependencies,
+        "breaks": dict(data.get("breaks") or {}),
+        "provides": [p if isinstance(p, str) else p.get("id") for p in provides],
+    }
+
+
+def _parse_quilt(data):
+    loader = data.get("quilt_loader") or {}
+    depends = {}
+    for dep in loader.get("depends") or []:
+        if isinstance(dep, str):
+            depends[dep] = "*"
+        elif isinstance(dep, dict) and dep.get("id") and not dep.get("optional"):
+            versions = dep.get("versions", "*")
+            depends[dep["id"]] = " || ".join(versions) if isinstance(versions, list) else versions
+    breaks = {}
+    for dep in loader.get("breaks") or []:
+        if isinstance(dep, str):
+            breaks[dep] = "*"
+        elif isinstance(dep, dict) and dep.get("id"):
+            breaks[dep["id"]] = dep.get("versions", "*")
+    minecraft, dependencies = _split_depends(depends)
+    return {
+        "mod_id": loader.get("id"),
+        "name": (loader.get("metadata") or {}).get("name") or loader.get("id"),
+        "version": str(loader.get("version", "")),
+        "loader": "Quilt",
+        "minecraft": minecraft,
+        "dependencies": dependencies,
+        "breaks": breaks,
+        "provides": [p if isinstance(p, str) else p.get("id") for p in loader.get("provides") or []],
+    }
+
+
+TOML_TABLE = re.compile(r"^\[\[?\s*(?P<name>[\w.\-\"]+)\s*\]\]?")
+TOML_PAIR = re.compile(r"^(?P<key>[\w\-\"]+)\s*=\s*(?P<value>.+?)\s*(?:#.*)?$")
+
+
+def _toml_value(text):
+    if text[:1] in "\"'":
+        return text[1:text.find(text[0], 1)] if text.find(text[0], 1) > 0 else text[1:]
+    if text in ("true", "false"):
+        return text == "true"
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def _parse_toml_subset(text):
+    """The parts of mods.toml we read, for interpreters without tomllib: top-level keys, [[mods]] and [[dependencies.id]]"""
+    data, current, in_multiline = {}, None, None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if in_multiline:
+            if in_multiline in line:
+                in_multiline = None
+            continue
+        if not line or line.startswith("#"):
+            continue
+        table = TOML_TABLE.match(line)
+        if table:
+            path = [part.strip('"') for part in table.group("name").split(".")]
+            parent = data
+            for part in path[:-1]:
+                parent = parent.setdefault(part, {})
+            if line.startswith("[["):
+                current = {}
+                parent.setdefault(path[-1], []).append(current)
+            else:
+                current = parent.setdefault(path[-1], {})
+            continue
+        pair = TOML_PAIR.match(line)
+        if pair:
+            value = pair.group("value")
+            for quote in ("'''", '"""'):
+                if value.startswith(quote) and value.count(quote) == 1:
+                    in_multiline = quote
+            (current if current is not None else data)[pair.group("key").strip('"')] = _toml_value(value)
+    return data
+
+
+def _load_toml(text):
+    if tomllib:
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError:
+            pass
+    return _parse_toml_subset(text)
+
+
+def _parse_mods_toml(text, loader, manifest):
+    data = _load_toml(text)
+    mods = data.get("mods") or [{}]
+    mod = mods[0]
+    mod_id = mod.get("modId")
+    version = str(mod.get("version", ""))
+    if "${" in version:
+        # "${file.jarVersion}" is filled in from the manifest at runtime
+        version = manifest.get("Implementation-Version", version)
+    depends, breaks = {}, {}
+    for dep in (data.get("dependencies") or {}).get(mod_id) or []:
+        dep_type = str(dep.get("type", "")).lower()
+        target = breaks if dep_type in ("incompatible", "discouraged") else depends
+        if dep_type in ("required", "incompatible", "discouraged") or (not dep_type and dep.get("mandatory", False)):
+            target[dep.get("modId")] = dep.get("versionRange", "*")
+    minecraft, dependencies = _split_depends(depends)
+    return {
+        "mod_id": mod_id,
+        "name": mod.get("displayName") or mod_id,
+        "version": version,
+        "loader": loader,
+        "minecraft": minecraft,
+        "dependencies": dependencies,
+        "breaks": breaks,
+        "provides": [m.get("modId") for m in mods[1:] if m.get("modId")],
+    }
+
+
+def _parse_manifest(manifest):
+    text = " ".join(f"{k} {v}" for k, v in manifest.items()).lower()
+    if "neoforge" in text:
+        loader = "NeoForge"
+    elif "forge" in text or "fml" in text:
+        loader = "Forge"
+    elif "fabric" in text:
+        loader = "Fabric"
+    else:
+        loader = None
+    return {
+        "mod_id": None,
+        "name": manifest.get("Implementation-Title") or manifest.get("Specification-Title"),
+        "version": manifest.get("Implementation-Version") or manifest.get("Specification-Version"),
+        "loader": loader,
+    }
+
+
+PARSE_ERRORS = (OSError, zipfile.BadZipFile, ValueError, KeyError, AttributeError, TypeError)
+
+
+def _parse_zip(zip_ref, depth=0):
+    metadata = dict.fromkeys(METADATA_FIELDS)
+    names = set(zip_ref.namelist())
+    manifest = _read_manifest(zip_ref)
+    if "fabric.mod.json" in names:
+        metadata.update(_parse_fabric(_json_entry(zip_ref, "fabric.mod.json")))
+    elif "quilt.mod.json" in names:
+        metadata.update(_parse_quilt(_json_entry(zip_ref, "quilt.mod.json")))
+    elif "META-INF/neoforge.mods.toml" in names:
+        text = zip_ref.read("META-INF/neoforge.mods.toml").decode("utf-8", errors="replace")
+        metadata.update(_parse_mods_toml(text, "NeoForge", manifest))
+    elif "META-INF/mods.toml" in names:
+        text = zip_ref.read("META-INF/mods.toml").decode("utf-8", errors="replace")
+        loader = "NeoForge" if re.search(r'modId\s*=\s*"neoforge"', text) else "Forge"
+        metadata.update(_parse_mods_toml(text, loader, manifest))
+    else:
+        metadata.update(_parse_manifest(manifest))
+    metadata["bundled"] = _parse_nested(zip_ref, names, depth) if depth < MAX_NESTING else {}
+    return metadata
+
+
+def _parse_nested(zip_ref, names, depth):
+    """{mod id: version} of the jars nested in a jar, with what they provide and nest in turn"""
+    bundled = {}
+    for name in sorted(names):
+        if not name.startswith(NESTED_JAR_DIRS) or not name.endswith(".jar"):
+            continue
+        try:
+            with zipfile.ZipFile(io.BytesIO(zip_ref.read(name))) as nested_ref:
+                nested = _parse_zip(nested_ref, depth + 1)
+        except PARSE_ERRORS as e:
+            logger.debug("Skipping nested jar %s: %s", name, e)
+            continue
+        if nested["mod_id"]:
+            bundled.setdefault(nested["mod_id"], nested["version"])
+        for mod_id in nested["provides"] or []:
+            bundled.setdefault(mod_id, nested["version"])
+        for mod_id, version in nested["bundled"].items():
+            bundled.setdefault(mod_id, version)
+    return bundled
+
+
+def parse_mod_jar(path):
+    """Metadata of one mod jar; unknown fields are None and read errors are reported in "error" """
+    try:
+        with zipfile.ZipFile(path) as zip_ref:
+            return _parse_zip(zip_ref)
+    except PARSE_ERRORS as e:
+        return dict(dict.fromkeys(METADATA_FIELDS), error=str(e) or type(e).__name__)
+
+
+def sha1_of(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# === Index ===
+class ModIndex:
+    """Jar metadata in SQLite, reparsed only when a jar's size or mtime changes"""
+
+    def __init__(self, db_path=MOD_INDEX_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS mods")
+                db.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS mods (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha1 TEXT, "
+                + ", ".join(f"{field} TEXT" for field in METADATA_FIELDS) + ", scanned_at REAL)"
+            )
+            db.commit()
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def _entry(row):
+        entry = dict(row)
+        for field in JSON_FIELDS:
+            entry[field] = json.loads(entry[field]) if entry[field] else ([] if field == "provides" else {})
+        entry["file"] = os.path.basename(entry["path"])
+        return entry
+
+    def _store(self, db, path, stat, metadata):
+        values = [json.dumps(metadata[f]) if f in JSON_FIELDS and metadata[f] is not None else metadata[f]
+                  for f in METADATA_FIELDS]
+        db.execute(
+            "INSERT OR REPLACE INTO mods (path, size, mtime_ns, sha1, " + ", ".join(METADATA_FIELDS)
+            + ", scanned_at) VALUES (?, ?, ?, NULL, " + ", ".join("?" * len(METADATA_FIELDS)) + ", ?)",
+            [path, stat.st_size, stat.st_mtime_ns] + values + [time.time()],
+        )
+        return db.execute("SELECT * FROM mods WHERE path = ?", (path,)).fetchone()
+
+    def scan(self, mods_dir):
+        """Entries for every jar in mods_dir, parsing only new or changed jars and forgetting removed ones"""
+        mods_dir = os.path.abspath(mods_dir)
+        try:
+            with os.scandir(mods_dir) as it:
+                jars = {entry.path: entry.stat() for entry in it if entry.name.endswith(".jar") and entry.is_file()}
+        except OSError:
+            jars = {}
+        with self._lock:
+            db = self._connect()
+            prefix = os.path.join(mods_dir, "")
+            known = {row["path"]: row for row in db.execute(
+                "SELECT * FROM mods WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))}
+
+        # Jars are parsed without the lock, so a slow scan does not hold up lookups from other threads
+        stale = [path for path, stat in jars.items() if path not in known
+                 or (known[path]["size"], known[path]["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns)]
+        parsed = {path: parse_mod_jar(path) for path in stale}
+
+        with self._lock:
+            db = self._connect()
+            entries = []
+            for path, stat in sorted(jars.items()):
+                row = self._store(db, path, stat, parsed[path]) if path in parsed else known[path]
+                entries.append(self._entry(row))
+            removed = [path for path in known if path not in jars and os.path.dirname(path) == mods_dir]
+            db.executemany("DELETE FROM mods WHERE path = ?", [(path,) for path in removed])
+            db.commit()
+        if parsed or removed:
+            logger.info("Mod index: %d jars, %d parsed, %d removed", len(entries), len(parsed), len(removed))
+        return entries
+
+    def get(self, path):
+        """Entry for one jar (parsed now if it is new or changed), or None if it does not exist"""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM mods WHERE path = ?", (path,)).fetchone()
+        if row is not None and row["size"] == stat.st_size and row["mtime_ns"] == stat.st_mtime_ns:
+            return self._entry(row)
+        metadata = parse_mod_jar(path)
+        with self._lock:
+            db = self._connect()
+            row = self._store(db, path, stat, metadata)
+            db.commit()
+        return self._entry(row)
+
+    def sha1(self, path):
+        """SHA1 of a jar, computed on first request and cached until the jar changes"""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        if entry["sha1"]:
+            return entry["sha1"]
+        digest = sha1_of(entry["path"])
+        with self._lock:
+            self._connect().execute("UPDATE mods SET sha1 = ? WHERE path = ? AND size = ? AND mtime_ns = ?",
+                                    (digest, entry["path"], entry["size"], entry["mtime_ns"]))
+            self._db.commit()
+        return digest
+
+    def forget(self, path):
+        with self._lock:
+            self._connect().execute("DELETE FROM mods WHERE path = ?", (os.path.abspath(path),))
+            self._db.commit()
+
+
+mod_index = ModIndex()
@@ -0,0 +1,391 @@
+"""Modpack import from Modrinth (``.mrpack``) and CurseForge (``.zip``) archives.
+
+The pack's index is read from the archive, the listed files are downloaded
+concurrently (hash-checked while streaming, at most a few per host) into a
+staging directory next to the game files, and ``overrides/`` entries are
+streamed from the archive into the same staging directory while the
+downloads run. Nothing in the game directory changes until every file has
+arrived intact; the staged files are then moved into place by renames on
+the same filesystem, the mods the pack does not ship are moved to a backup,
+and any failure during that step moves everything back. The Minecraft
+version and mod loader are installed after that commit, since installing
+them writes straight into ``versions/`` and ``libraries/``.
+"""
+import json
+import logging
+import os
+import secrets
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import minecraft_launcher_lib
+
+from .download import download_file, split_digest
+from .install import VersionInstaller, create_session, is_version_installed, sha1_of_file
+from .mods import BULK_DOWNLOAD_WORKERS, BULK_DOWNLOADS_PER_HOST
+from .objects import shared_store
+
+logger = logging.getLogger(__name__)
+
+MODRINTH_INDEX = "modrinth.index.json"
+CURSEFORGE_MANIFEST = "manifest.json"
+# Index dependency keys and CurseForge modLoader prefixes, by minecraft_launcher_lib mod loader id
+MODRINTH_LOADERS = {"fabric-loader": "fabric", "quilt-loader": "quilt", "forge": "forge", "neoforge": "neoforge"}
+CURSEFORGE_LOADERS = ("fabric", "quilt", "forge", "neoforge")
+CURSEFORGE_API_URL = "https://api.curseforge.com/v1"
+# CurseForge class ids of the projects a pack can list, by game folder
+CURSEFORGE_CLASS_FOLDERS = {6: "mods", 12: "resourcepacks", 6552: "shaderpacks"}
+STAGING_PREFIX = ".modpack-staging-"
+BACKUP_DIR = "modpack-backups"
+STALE_STAGING_AGE = 24 * 3600
+# Where files that must be downloaded by hand are looked for, besides their folder in the game directory
+MANUAL_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "Downloads")
+
+
+class ModpackError(Exception):
+    pass
+
+
+def safe_path(root, relative):
+    """root joined with a path from a pack, refusing absolute paths and anything that escapes root"""
+    relative = relative.replace("\\", "/")
+    if not relative or relative.startswith("/") or ":" in relative.split("/")[0]:
+        raise ModpackError(f"Unsafe path in modpack: {relative!r}")
+    path = os.path.normpath(os.path.join(root, relative))
+    if os.path.commonpath([os.path.abspath(root), os.path.abspath(path)]) != os.path.abspath(root):
+        raise ModpackError(f"Unsafe path in modpack: {relative!r}")
+    return path
+
+
+def read_modpack(zip_ref):
+    """The pack description from an open archive's index.
+
+    Returns {"format", "name", "version", "minecraft", "loader",
+    "loader_version", "files", "overrides"}; files are {"path", "urls",
+    "hash", "size"} for Modrinth and {"project", "file"} for CurseForge.
+    """
+    names = set(zip_ref.namelist())
+    if MODRINTH_INDEX in names:
+        index = json.loads(zip_ref.read(MODRINTH_INDEX).decode("utf-8"))
+        if index.get("game", "minecraft") != "minecraft":
+            raise ModpackError(f"Not a Minecraft modpack: {index.get('game')}")
+        dependencies = index.get("dependencies") or {}
+        loader = next((MODRINTH_LOADERS[key] for key in MODRINTH_LOADERS if key in dependencies), None)
+        files = []
+        for entry in index.get("files") or []:
+            if (entry.get("env") or {}).get("client") == "unsupported":
+                continue
+            hashes = entry.get("hashes") or {}
+            digest = f"sha512:{hashes['sha512']}" if "sha512" in hashes else hashes.get("sha1")
+            files.append({"path": entry["path"], "urls": list(entry.get("downloads") or []), "hash": digest,
+                          "size": entry.get("fileSize", 0)})
+        return {
+            "format": "modrinth", "name": index.get("name", "Modpack"), "version": index.get("versionId"),
+            "minecraft": dependencies.get("minecraft"), "loader": loader,
+            "loader_version": dependencies.get(next((k for k, v in MODRINTH_LOADERS.items() if v == loader), "")),
+            "files": files, "overrides": ["overrides/", "client-overrides/"],
+        }
+    if CURSEFORGE_MANIFEST in names:
+        manifest = json.loads(zip_ref.read(CURSEFORGE_MANIFEST).decode("utf-8"))
+        minecraft = manifest.get("minecraft") or {}
+        loaders = minecraft.get("modLoaders") or []
+        primary = next((entry for entry in loaders if entry.get("primary")), loaders[0] if loaders else None)
+        loader = loader_version = None
+        if primary:
+            loader, _, loader_version = primary["id"].partition("-")
+            if loader not in CURSEFORGE_LOADERS:
+                raise ModpackError(f"Unsupported mod loader: {primary['id']}")
+        files = [{"project": f["projectID"], "file": f["fileID"]} for f in manifest.get("files") or []
+                 if f.get("required", True)]
+        return {
+            "format": "curseforge", "name": manifest.get("name", "Modpack"), "version": manifest.get("version"),
+            "minecraft": minecraft.get("version"), "loader": loader, "loader_version": loader_version,
+            "files": files, "overrides": [manifest.get("overrides", "overrides").rstrip("/") + "/"],
+        }
+    raise ModpackError(f"No {MODRINTH_INDEX} or {CURSEFORGE_MANIFEST} in the archive")
+
+
+def install_mod_loader(loader, minecraft_version, loader_version, minecraft_dir, callback=None):
+    """Install "fabric", "quilt", "forge" or "neoforge" for a Minecraft version; returns the version id to launch"""
+    mod_loader = getattr(minecraft_launcher_lib, "mod_loader", None)
+    if mod_loader is None:
+        raise ModpackError(f"Installing {loader} needs minecraft-launcher-lib 7.0 or newer")
+    return mod_loader.get_mod_loader(loader).install(minecraft_version, minecraft_dir, loader_version=loader_version,
+                                                     callback=callback or {})
+
+
+class ModpackImporter:
+    """Imports a modpack archive into a game directory, see the module docstring"""
+
+    def __init__(self, minecraft_dir, config_data, append_terminal_callback, save_config_callback=None,
+                 max_workers=BULK_DOWNLOAD_WORKERS, per_host=BULK_DOWNLOADS_PER_HOST):
+        self.minecraft_dir = minecraft_dir
+        self.config_data = config_data
+        self.append_terminal = append_terminal_callback
+        self.save_config = save_config_callback
+        self.max_workers = max_workers
+        self.per_host = per_host
+
+    # === Download tasks ===
+    def _curseforge_tasks(self, files, session):
+        """Download tasks for CurseForge file ids, resolved in two API calls with "curseforge_api_key".
+
+        Files whose authors do not allow third-party downloads have no URL;
+        they are taken from the Downloads folder or their game folder when a
+        copy with the right hash is there, and otherwise get a "page" to send
+        the user to.
+        """
+        api_key = self.config_data.get("curseforge_api_key")
+        if not api_key:
+            # Only the API gives each file's hash and folder
+            raise ModpackError('Importing CurseForge modpacks needs a CurseForge API key ("curseforge_api_key" '
+                               'in the config); without it the downloads cannot be verified')
+        headers = {"x-api-key": api_key, "accept": "application/json"}
+        response = session.post(f"{CURSEFORGE_API_URL}/mods/files", json={"fileIds": [f["file"] for f in files]},
+                                headers=headers, timeout=30)
+        response.raise_for_status()
+        found = response.json()["data"]
+        response = session.post(f"{CURSEFORGE_API_URL}/mods", json={"modIds": sorted({f["modId"] for f in found})},
+                                headers=headers, timeout=30)
+        response.raise_for_status()
+        mods = {mod["id"]: mod for mod in response.json()["data"]}
+        missing = {f["file"] for f in files} - {f["id"] for f in found}
+        if missing:
+            raise ModpackError(f"CurseForge does not list file(s) {', '.join(map(str, sorted(missing)))}")
+        tasks = []
+        for entry in found:
+            mod = mods.get(entry["modId"]) or {}
+            folder = CURSEFORGE_CLASS_FOLDERS.get(mod.get("classId"))
+            if folder is None:
+                raise ModpackError(f"{entry['fileName']} is a kind of CurseForge project this launcher cannot place "
+                                   f"(class {mod.get('classId')})")
+            sha1 = next((h["value"] for h in entry.get("hashes") or [] if h.get("algo") == 1), None)
+            task = {"urls": [entry["downloadUrl"]] if entry.get("downloadUrl") else [],
+                    "path": f"{folder}/{entry['fileName']}", "hash": sha1, "size": entry.get("fileLength", 0)}
+            if not task["urls"]:
+                task["source"] = self._find_manual_download(entry["fileName"], folder, sha1)
+                task["page"] = f"{(mod.get('links') or {}).get('websiteUrl', '').rstrip('/')}/files/{entry['id']}"
+            tasks.append(task)
+        return tasks
+
+    def _find_manual_download(self, file_name, folder, sha1):
+        """A copy of a file the user downloaded by hand, if one with the expected SHA1 is where we look"""
+        if not sha1:
+            return None
+        for directory in (MANUAL_DOWNLOAD_DIR, os.path.join(self.minecraft_dir, folder)):
+            path = os.path.join(directory, file_name)
+            try:
+                if os.path.isfile(path) and sha1_of_file(path) == sha1.lower():
+                    return path
+            except OSError:
+                pass
+        return None
+
+    # === Staging ===
+    def _extract_overrides(self, zip_ref, prefixes, stage):
+        """Stream override entries from the archive into stage; later prefixes win. Returns the staged paths"""
+        written = set()
+        for prefix in prefixes:
+            for info in zip_ref.infolist():
+                if info.is_dir() or not info.filename.startswith(prefix) or info.filename == prefix:
+                    continue
+                relative = info.filename[len(prefix):]
+                dest = safe_path(stage, relative)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                with zip_ref.open(info) as src, open(dest, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                written.add(relative.replace("\\", "/"))
+        return written
+
+    def _remove_stale_stages(self):
+        try:
+            with os.scandir(self.minecraft_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(STAGING_PREFIX) and time.time() - entry.stat().st_mtime > STALE_STAGING_AGE:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass
+
+    def _install_game(self, pack, callback):
+        """Install the pack's Minecraft version with the parallel installer, then its loader; returns the version id"""
+        minecraft = pack["minecraft"]
+        if not minecraft:
+            return None
+        if not is_version_installed(minecraft, self.minecraft_dir):
+            store = shared_store if self.config_data.get("use_shared_store", True) else None
+            VersionInstaller(self.minecraft_dir, callback, store=store).install(minecraft)
+        if not pack["loader"]:
+            return minecraft
+        status = {"setStatus": lambda text: logger.info("%s install: %s", pack["loader"], text)}
+        return install_mod_loader(pack["loader"], minecraft, pack["loader_version"], self.minecraft_dir, status)
+
+    # === Commit ===
+    def _commit(self, stage, backup_root, replace_mods):
+        """Move every staged file into the game directory, backing up what it replaces; all or nothing.
+
+        With replace_mods, top-level files in mods/ that the pack does not
+        ship are moved to the backup as well. Returns the number of files backed up.
+        """
+        moves = []  # (source, destination) in the order they were done
+        staged = []
+        for root, _, files in os.walk(stage):
+            for name in files:
+                path = os.path.join(root, name)
+                staged.append(os.path.relpath(path, stage))
+        mods_dir = os.path.join(self.minecraft_dir, "mods")
+        pack_mods = {os.path.basename(p) for p in staged if os.path.dirname(p) == "mods"}
+        retired = []
+        if replace_mods and os.path.isdir(mods_dir):
+            retired = [os.path.join("mods", entry.name) for entry in os.scandir(mods_dir)
+                       if entry.is_file() and entry.name not in pack_mods]
+
+        def move(src, dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+            moves.append((src, dst))
+
+        try:
+            for relative in retired:
+                move(os.path.join(self.minecraft_dir, relative), os.path.join(backup_root, relative))
+            backed_up = len(retired)
+            for relative in staged:
+                dest = os.path.join(self.minecraft_dir, relative)
+                if os.path.isfile(dest):
+                    move(dest, os.path.join(backup_root, relative))
+                    backed_up += 1
+                move(os.path.join(stage, relative), dest)
+        except OSError:
+            for src, dst in reversed(moves):
+                try:
+                    os.replace(dst, src)
+                except OSError as e:
+                    logger.error("Could not roll back %s: %s", dst, e)
+            raise
+        return backed_up
+
+    # === Import ===
+    def import_pack(self, archive_path, progress=None, replace_mods=True):
+        """Import a .mrpack or CurseForge .zip; returns {"name", "version", "files", "overrides", "backup"}.
+
+        ``progress(done_bytes, total_bytes, files_done, files_total)`` reports
+        the downloads. Raises ModpackError (or the download error) without
+        having changed the game directory when anything fails before the commit.
+        A failed version or loader install afterwards raises ModpackError with
+        the pack's files already in place; importing again retries it.
+        """
+        t0 = time.perf_counter()
+        self._remove_stale_stages()
+        stage = os.path.join(self.minecraft_dir, STAGING_PREFIX + secrets.token_hex(4))
+        os.makedirs(stage)
+        session = create_session(self.max_workers)
+        try:
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                pack = read_modpack(zip_ref)
+                self.append_terminal(f"Importing modpack {pack['name']} {pack['version'] or ''} for Minecraft "
+                                     f"{pack['minecraft']}" + (f" with {pack['loader']} {pack['loader_version']}"
+                                                               if pack["loader"] else ""))
+                if pack["format"] == "curseforge":
+                    tasks = self._curseforge_tasks(pack["files"], session)
+                else:
+                    tasks = pack["files"]
+                for task in tasks:
+                    safe_path(stage, task["path"])
+                override_names = {
+                    info.filename[len(prefix):] for prefix in pack["overrides"] for info in zip_ref.infolist()
+                    if info.filename.startswith(prefix) and not info.is_dir()
+                }
+                # Overrides replace downloaded files of the same path, so those are not downloaded at all
+                tasks = [task for task in tasks if task["path"] not in override_names]
+                unverifiable = [task["path"] for task in tasks if not task["hash"]]
+                if unverifiable:
+                    raise ModpackError(f"The pack lists {len(unverifiable)} file(s) without a hash to verify: "
+                                       + ", ".join(unverifiable))
+                manual = [task for task in tasks if not task["urls"] and not task.get("source")]
+                if manual:
+                    raise ModpackError(
+                        f"{len(manual)} file(s) can only be downloaded from CurseForge by hand. Save them to "
+                        f"{MANUAL_DOWNLOAD_DIR} and import again:\n"
+                        + "\n".join(f"{os.path.basename(task['path'])}: {task['page']}" for task in manual))
+
+                lock = threading.Lock()
+                host_limits, finished = {}, []
+                sizes = [(0, task["size"] or 0) for task in tasks]
+
+                def report():
+                    if progress:
+                        progress(sum(d for d, _ in sizes), sum(t for _, t in sizes), len(finished), len(tasks))
+
+                def fetch(number, task):
+                    dest = safe_path(stage, task["path"])
+
+                    def file_progress(done, total):
+                        with lock:
+                            sizes[number] = (done, total or task["size"] or 0)
+                            report()
+
+                    if task.get("source"):
+                        # A hand-downloaded copy, already checked against the pack's hash
+                        os.makedirs(os.path.dirname(dest), exist_ok=True)
+                        shutil.copyfile(task["source"], dest)
+                        file_progress(task["size"], task["size"])
+                        return task["path"]
+                    with lock:
+                        limit = host_limits.setdefault(urlparse(task["urls"][0]).netloc,
+                                                       threading.BoundedSemaphore(self.per_host))
+
+                    with limit:
+                        hash_name, hash_value = split_digest(task["hash"])
+                        # Mirrors are tried in order; the last error is reported
+                        for position, url in enumerate(task["urls"]):
+                            try:
+                                download_file(url, dest, hash_value, hash_name, session=session, progress=file_progress)
+                                return task["path"]
+                            except Exception:
+                                if position == len(task["urls"]) - 1:
+                                    raise
+
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = {executor.submit(fetch, number, task): task for number, task in enumerate(tasks)}
+                    # The archive is read on this thread while the downloads run
+                    overrides = self._extract_overrides(zip_ref, pack["overrides"], stage)
+                    failed = []
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            task = futures[future]
+                            failed.append(task["path"] or task["urls"][0])
+                            self.append_terminal(f"Failed to download {task['path'] or task['urls'][0]}: {e}")
+                        with lock:
+                            finished.append(futures[future])
+                            report()
+                if failed:
+                    raise ModpackError(f"{len(failed)} of {len(tasks)} files failed to download; nothing was changed")
+
+            backup_root = os.path.join(self.minecraft_dir, BACKUP_DIR,
+                                       time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(2))
+            backed_up = self._commit(stage, backup_root, replace_mods)
+        finally:
+            session.close()
+            shutil.rmtree(stage, ignore_errors=True)
+
+        mods_dir = os.path.join(self.minecraft_dir, "mods")
+        self.config_data["mod_list"] = sorted(name for name in os.listdir(mods_dir) if name.endswith(".jar")) \
+            if os.path.isdir(mods_dir) else []
+        if self.save_config:
+            self.save_config()
+        self.append_terminal(f"Modpack {pack['name']} imported in {time.perf_counter() - t0:.1f} s: {len(tasks)} "
+                             f"downloads, {len(overrides)} override files"
+                             + (f"; {backed_up} replaced files moved to {backup_root}" if backed_up else ""))
+        install_callback = {"setStatus": lambda text: logger.info("Modpack install: %s", text)}
+        try:
+            version_id = self._install_game(pack, install_callback)
+        except Exception as e:
+            target = f"Minecraft {pack['minecraft']}" + (f" with {pack['loader']}" if pack["loader"] else "")
+            raise ModpackError(f"The pack's files are in place, but installing {target} failed: {e}")
+        return {"name": pack["name"], "version": version_id, "files": len(tasks), "overrides": len(overrides),
+                "backup": backup_root if backed_up else None}
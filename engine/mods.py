@@ -0,0 +1,311 @@
+"""Installed mod management for the launcher."""
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote, urlparse
+
+from .download import download_file, split_digest
+from .install import create_session
+from .modindex import mod_index
+from .overlap import class_overlap_scanner
+from .watcher import DirectoryWatcher
+
+logger = logging.getLogger(__name__)
+
+BULK_DOWNLOAD_WORKERS = 8
+BULK_DOWNLOADS_PER_HOST = 4
+
+
+def mod_filename(url):
+    """File name for a mod URL: the last path segment, unquoted, with .jar added if missing"""
+    filename = unquote(os.path.basename(urlparse(url).path)) or "mod"
+    return filename if filename.endswith(".jar") else filename + ".jar"
+
+
+def parse_mod_urls(text):
+    """URLs from pasted text or a list file: one or more per line, lines starting with # are skipped"""
+    urls = []
+    for line in text.splitlines():
+        if line.strip().startswith("#"):
+            continue
+        for word in line.split():
+            if word.startswith(("http://", "https://")) and word not in urls:
+                urls.append(word)
+    return urls
+
+
+class ModManager:
+    def __init__(self, minecraft_dir, config_data, append_terminal_callback, save_config_callback=None, index=None):
+        self.minecraft_dir = minecraft_dir
+        self.config_data = config_data
+        self.append_terminal = append_terminal_callback
+        self.save_config = save_config_callback
+        self.mods_dir = os.path.join(minecraft_dir, "mods")
+        self.mod_list = self.config_data.get("mod_list", [])
+        self.index = index or mod_index
+        # In-memory view of the mods folder, {filename: lowercase filename}; kept current by the watcher
+        self._view = None
+        self._view_lock = threading.Lock()
+        self.watcher = None
+
+        # Ensure mods directory exists
+        os.makedirs(self.mods_dir, exist_ok=True)
+
+    def get_mods_list(self):
+        """Get list of installed mods"""
+        with self._view_lock:
+            if self._view is not None:
+                return sorted(self._view)
+        if not os.path.exists(self.mods_dir):
+            return []
+        return [f for f in os.listdir(self.mods_dir) if f.endswith('.jar')]
+
+    def start_watching(self, on_change=None):
+        """Keep the mod list in memory and update it from filesystem events.
+
+        ``on_change(events)`` is called from the watcher thread with
+        ("added" | "removed" | "modified", filename) tuples, including for
+        jars copied into the folder by hand.
+        """
+        if self.watcher:
+            return self.watcher
+        self.watcher = DirectoryWatcher(self.mods_dir, lambda events, files: self._on_mods_changed(events, on_change),
+                                        suffix=".jar")
+        with self._view_lock:
+            self._view = {name: name.lower() for name in self.watcher.files}
+        return self.watcher.start()
+
+    def stop_watching(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        with self._view_lock:
+            self._view = None
+
+    def _on_mods_changed(self, events, on_change):
+        with self._view_lock:
+            if self._view is not None:
+                for kind, name in events:
+                    if kind == "removed":
+                        self._view.pop(name, None)
+                    else:
+                        self._view[name] = name.lower()
+        for kind, name in events:
+            logger.info("Mod %s: %s", kind, name)
+        if on_change:
+            on_change(events)
+
+    def _note_mod(self, filename, present=True):
+        """Update the in-memory view right away for changes the launcher makes itself"""
+        with self._view_lock:
+            if self._view is not None:
+                if present:
+                    self._view[filename] = filename.lower()
+                else:
+                    self._view.pop(filename, None)
+
+    def install_mod_from_file(self, file_path):
+        """Install a mod from a local file"""
+        try:
+            if not file_path.endswith('.jar'):
+                raise ValueError("Only .jar files are supported")
+
+            filename = os.path.basename(file_path)
+            dest_path = os.path.join(self.mods_dir, filename)
+
+            shutil.copy2(file_path, dest_path)
+            self._note_mod(filename)
+            self.append_terminal(f"Mod installed: {filename}")
+            entry = self.index.get(dest_path)
+            if entry and not entry["error"]:
+                self.append_terminal(f"Mod {filename}: Loader {entry['loader'] or 'Unknown'}, "
+                                     f"Version {entry['version'] or 'Unknown'}")
+            elif entry:
+                self.append_terminal(f"Could not scan mod file {filename}: {entry['error']}")
+
+            # Add to mod list if not already present
+            if filename not in self.mod_list:
+                self.mod_list.append(filename)
+                self.config_data["mod_list"] = self.mod_list
+                if self.save_config:
+                    self.save_config()
+
+            return True
+        except Exception as e:
+            self.append_terminal(f"Failed to install mod: {e}")
+            return False
+
+    def remove_mod(self, mod_name):
+        """Remove a mod"""
+        try:
+            mod_path = os.path.join(self.mods_dir, mod_name)
+            if os.path.exists(mod_path):
+                os.remove(mod_path)
+                self.index.forget(mod_path)
+                self._note_mod(mod_name, present=False)
+                self.append_terminal(f"Mod removed: {mod_name}")
+
+                # Remove from mod list
+                if mod_name in self.mod_list:
+                    self.mod_list.remove(mod_name)
+                    self.config_data["mod_list"] = self.mod_list
+                    if self.save_config:
+                        self.save_config()
+
+                return True
+            else:
+                self.append_terminal(f"Mod not found: {mod_name}")
+                return False
+        except Exception as e:
+            self.append_terminal(f"Failed to remove mod: {e}")
+            return False
+
+    def download_mod_from_url(self, url, filename=None, expected_hash=None, progress=None):
+        """Download and install a mod from URL.
+
+        expected_hash may be bare SHA1 hex or "sha512:<hex>"; an interrupted download resumes next time.
+        """
+        try:
+            if not filename:
+                filename = os.path.basename(url)
+                if not filename.endswith('.jar'):
+                    filename += '.jar'
+
+            dest_path = os.path.join(self.mods_dir, filename)
+
+            self.append_terminal(f"Downloading mod from: {url}")
+
+            hash_name, hash_value = split_digest(expected_hash)
+            download_file(url, dest_path, hash_value, hash_name, progress=progress)
+            self._note_mod(filename)
+
+            self.append_terminal(f"Mod downloaded: {filename}")
+
+            # Add to mod list if not already present
+            if filename not in self.mod_list:
+                self.mod_list.append(filename)
+                self.config_data["mod_list"] = self.mod_list
+                if self.save_config:
+                    self.save_config()
+
+            return True
+        except Exception as e:
+            self.append_terminal(f"Failed to download mod: {e}")
+            return False
+
+    def download_mods(self, items, progress=None, max_workers=BULK_DOWNLOAD_WORKERS, per_host=BULK_DOWNLOADS_PER_HOST):
+        """Download many mods concurrently over one pooled session.
+
+        items are URLs or {"url", "filename", "hash"} dicts. At most per_host
+        downloads run against the same host at once. ``progress(done_bytes,
+        total_bytes, files_done, files_total)`` reports the whole batch, and
+        mod_list is saved once at the end. Returns (installed filenames,
+        [(url, error)]).
+        """
+        tasks, seen = [], set()
+        for item in items:
+            item = {"url": item} if isinstance(item, str) else dict(item)
+            item.setdefault("filename", mod_filename(item["url"]))
+            if item["filename"] not in seen:
+                seen.add(item["filename"])
+                tasks.append(item)
+
+        lock = threading.Lock()
+        host_limits = {}
+        sizes = {}  # filename -> (done, total)
+        finished = []
+
+        def report():
+            if progress:
+                done = sum(d for d, _ in sizes.values())
+                total = sum(t for _, t in sizes.values())
+                progress(done, total, len(finished), len(tasks))
+
+        def fetch(task):
+            host = urlparse(task["url"]).netloc
+            with lock:
+                limit = host_limits.setdefault(host, threading.BoundedSemaphore(per_host))
+
+            def file_progress(done, total):
+                with lock:
+                    sizes[task["filename"]] = (done, total)
+                    report()
+
+            hash_name, hash_value = split_digest(task.get("hash"))
+            with limit:
+                download_file(task["url"], os.path.join(self.mods_dir, task["filename"]), hash_value, hash_name,
+                              session=session, progress=file_progress)
+            return task["filename"]
+
+        installed, failed = [], []
+        self.append_terminal(f"Downloading {len(tasks)} mods...")
+        session = create_session(max_workers)
+        t0 = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(fetch, task): task for task in tasks}
+                for future in as_completed(futures):
+                    task = futures[future]
+                    try:
+                        filename = future.result()
+                    except Exception as e:
+                        failed.append((task["url"], str(e)))
+                        self.append_terminal(f"Failed to download {task['url']}: {e}")
+                    else:
+                        installed.append(filename)
+                        self._note_mod(filename)
+                    with lock:
+                        finished.append(task["filename"])
+                        report()
+        finally:
+            session.close()
+
+        new = [filename for filename in installed if filename not in self.mod_list]
+        if new:
+            self.mod_list.extend(new)
+            self.config_data["mod_list"] = self.mod_list
+            if self.save_config:
+                self.save_config()
+        self.append_terminal(f"Downloaded {len(installed)} of {len(tasks)} mods in {time.perf_counter() - t0:.1f} s"
+                             + (f", {len(failed)} failed." if failed else "."))
+        return installed, failed
+
+    def search_mods(self, query):
+        """Search for mods in the installed list"""
+        if not query:
+            return self.get_mods_list()
+        query = query.lower()
+        with self._view_lock:
+            if self._view is not None:
+                return sorted(name for name, lowered in self._view.items() if query in lowered)
+        return [mod for mod in self.get_mods_list() if query in mod.lower()]
+
+    def get_mods_metadata(self):
+        """Indexed metadata of every installed mod; only new or changed jars are opened"""
+        return self.index.scan(self.mods_dir)
+
+    def find_class_overlaps(self):
+        """Jars in the mods folder that ship the same classes, see ClassOverlapScanner.scan"""
+        try:
+            return class_overlap_scanner.scan(self.mods_dir)
+        except Exception as e:
+            self.append_terminal(f"Error scanning mod classes: {e}")
+            return None
+
+    def get_mod_info(self, mod_name):
+        """Get info about a mod file, with the metadata parsed from the jar"""
+        try:
+            mod_path = os.path.join(self.mods_dir, mod_name)
+            entry = self.index.get(mod_path)
+            if entry:
+                info = dict(entry)
+                info.update(name=entry["name"] or mod_name, size=f"{entry['size'] / 1024:.1f} KB",
+                            modified=time.ctime(entry["mtime_ns"] / 1e9))
+                return info
+            return None
+        except Exception as e:
+            self.append_terminal(f"Failed to get mod info: {e}")
+            return None
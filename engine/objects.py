@@ -0,0 +1,296 @@
+"""SHA1-addressed object store shared by every game directory.
+
+Libraries, client jars and asset objects are stored once and linked into each
+game directory (hardlink, then reflink, then copy). The index records which
+files of which version point at which object, so deleting a version only
+frees objects nothing else uses.
+"""
+import errno
+import logging
+import os
+import shutil
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from .config import MINECRAFT_DIR, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+# Next to the default game directory so hardlinks usually stay on one filesystem
+SHARED_STORE_DIR = os.path.join(os.path.dirname(MINECRAFT_DIR), ".omnilauncher-store")
+LINK_MODES = ("hardlink", "reflink", "copy")
+FICLONE = 0x40049409  # Linux ioctl, supported by btrfs and XFS
+# Files next to objects that are not objects: download leftovers and temporary links
+NON_OBJECT_SUFFIXES = (".tmp", ".part", ".part.json")
+
+
+def reflink(src, dst):
+    """Copy-on-write clone of src at dst; raises OSError where unsupported"""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform")
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+
+
+_LINKERS = {"hardlink": os.link, "reflink": reflink, "copy": shutil.copyfile}
+
+
+def _same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+class ObjectStore:
+    """Objects under ``root/objects/<sha1[:2]>/<sha1>`` plus a reference index.
+
+    The index maps each game directory to the files linked into it
+    (``links``: relative path -> sha1) and to the files each installed version
+    uses (``versions``: version -> relative paths). An object's reference count
+    is the number of linked files pointing at it. Files that were already in
+    the game directory when the store took them over (``external``) may be
+    used by versions the store does not know about, such as ones installed by
+    another launcher, so releasing a version never deletes them.
+    """
+
+    def __init__(self, root=SHARED_STORE_DIR, link_modes=LINK_MODES):
+        self.root = root
+        self.index_file = os.path.join(root, "index.json")
+        self.link_modes = tuple(link_modes)
+        self._lock = threading.RLock()
+        self._index = None
+        self._refs = Counter()
+        self._device_modes = {}
+        self._claims = {}
+
+    def object_path(self, sha1):
+        return os.path.join(self.root, "objects", sha1[:2], sha1)
+
+    def has(self, sha1):
+        return os.path.isfile(self.object_path(sha1))
+
+    @contextmanager
+    def claim(self, sha1):
+        """Hold while fetching an object, so concurrent installs of the same sha1 download it once"""
+        with self._lock:
+            lock, users = self._claims.get(sha1, (None, 0))
+            lock = lock or threading.Lock()
+            self._claims[sha1] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._claims[sha1]
+                if users > 1:
+                    self._claims[sha1] = (lock, users - 1)
+                else:
+                    del self._claims[sha1]
+
+    # === Index ===
+    def _load(self):
+        if self._index is None:
+            try:
+                index = load_json(self.index_file, None) or {}
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable object store index: %s", e)
+                index = {}
+            self._index = {"links": index.get("links", {}), "versions": index.get("versions", {}),
+                           "external": index.get("external", {})}
+            self._refs = Counter(sha1 for links in self._index["links"].values() for sha1 in links.values())
+        return self._index
+
+    def _save(self):
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_file = self.index_file + ".tmp"
+            save_json(tmp_file, self._index)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.warning("Failed to save object store index: %s", e)
+
+    def refcount(self, sha1):
+        with self._lock:
+            self._load()
+            return self._refs[sha1]
+
+    # === Objects ===
+    def adopt(self, path, sha1):
+        """Take an already verified file from a game directory into the store"""
+        if self.has(sha1):
+            return
+        object_path = self.object_path(sha1)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        tmp_path = f"{object_path}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                os.link(path, tmp_path)
+            except OSError as e:
+                logger.info("Copying %s into the object store, it cannot be hardlinked (%s)", path, e)
+                shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, object_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def link(self, sha1, dst):
+        """Place an object at dst, returning the link mode used (None if dst already is the object)"""
+        src = self.object_path(sha1)
+        if _same_file(src, dst):
+            return None
+        directory = os.path.dirname(dst)
+        os.makedirs(directory, exist_ok=True)
+        device = os.stat(directory).st_dev
+        preferred = self._device_modes.get(device)
+        modes = ((preferred,) if preferred else ()) + tuple(m for m in self.link_modes if m != preferred)
+        tmp_path = f"{dst}.{threading.get_ident()}.tmp"
+        error = None
+        for mode in modes:
+            try:
+                _LINKERS[mode](src, tmp_path)
+                os.replace(tmp_path, dst)
+            except OSError as e:
+                error = e
+                continue
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            if mode != preferred:
+                self._device_modes[device] = mode
+                if mode == "copy" and error:
+                    logger.warning("Objects cannot be hardlinked or reflinked into %s (%s); storing full copies",
+                                   directory, error)
+            return mode
+        raise error
+
+    # === References ===
+    def add_version(self, minecraft_dir, version, files, existing=()):
+        """Record that a version in minecraft_dir uses files ({absolute path: sha1}).
+
+        ``existing`` lists the paths that were in the game directory before
+        the store placed them; those are kept when the version is released.
+        """
+        minecraft_dir = os.path.abspath(minecraft_dir)
+        existing = {os.path.normcase(os.path.abspath(path)) for path in existing}
+        with self._lock:
+            index = self._load()
+            links = index["links"].setdefault(minecraft_dir, {})
+            versions = index["versions"].setdefault(minecraft_dir, {})
+            external = set(index["external"].get(minecraft_dir, []))
+            used = set(versions.get(version, []))
+            for path, sha1 in files.items():
+                relative_path = os.path.relpath(path, minecraft_dir).replace(os.sep, "/")
+                if relative_path not in links and os.path.normcase(os.path.abspath(path)) in existing:
+                    external.add(relative_path)
+                old = links.get(relative_path)
+                if old != sha1:
+                    if old:
+                        self._refs[old] -= 1
+                    links[relative_path] = sha1
+                    self._refs[sha1] += 1
+                used.add(relative_path)
+            versions[version] = sorted(used)
+            if external:
+                index["external"][minecraft_dir] = sorted(external)
+            self._save()
+
+    def release_version(self, minecraft_dir, version):
+        """Drop a version's references; unlinks files and frees objects no longer used.
+
+        Returns (files removed from minecraft_dir, objects freed from the store).
+        """
+        minecraft_dir = os.path.abspath(minecraft_dir)
+        with self._lock:
+            index = self._load()
+            versions = index["versions"].get(minecraft_dir, {})
+            released = versions.pop(version, None)
+            if released is None:
+                return 0, 0
+            still_used = {path for paths in versions.values() for path in paths}
+            links = index["links"].get(minecraft_dir, {})
+            external = set(index["external"].get(minecraft_dir, []))
+            removed, freed = 0, 0
+            for relative_path in released:
+                if relative_path in still_used or relative_path not in links:
+                    continue
+                sha1 = links.pop(relative_path)
+                self._refs[sha1] -= 1
+                if relative_path in external:
+                    # Not created by the store; it stays for whatever else uses it
+                    external.discard(relative_path)
+                else:
+                    try:
+                        os.remove(os.path.join(minecraft_dir, *relative_path.split("/")))
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                if self._refs[sha1] <= 0:
+                    del self._refs[sha1]
+                    freed += self._remove_object(sha1)
+            if external:
+                index["external"][minecraft_dir] = sorted(external)
+            else:
+                index["external"].pop(minecraft_dir, None)
+            if not versions:
+                index["versions"].pop(minecraft_dir, None)
+                index["links"].pop(minecraft_dir, None)
+                index["external"].pop(minecraft_dir, None)
+            self._save()
+            return removed, freed
+
+    def _remove_object(self, sha1):
+        try:
+            os.remove(self.object_path(sha1))
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def gc(self):
+        """Remove objects no game directory references (e.g. left by an interrupted install)"""
+        freed = 0
+        with self._lock:
+            self._load()
+            for sha1 in self._object_ids():
+                if self._refs[sha1] <= 0:
+                    freed += self._remove_object(sha1)
+        return freed
+
+    def _object_ids(self):
+        objects_dir = os.path.join(self.root, "objects")
+        if not os.path.isdir(objects_dir):
+            return []
+        return [name for prefix in os.listdir(objects_dir)
+                for name in os.listdir(os.path.join(objects_dir, prefix)) if not name.endswith(NON_OBJECT_SUFFIXES)]
+
+    def stats(self):
+        """Object count, stored bytes, linked file count across all game directories and how many of those
+        links are full copies (or reflinks) rather than hardlinks"""
+        with self._lock:
+            self._load()
+            object_ids = self._object_ids()
+            size, copies, copied_bytes = 0, 0, 0
+            for sha1 in object_ids:
+                try:
+                    stat = os.stat(self.object_path(sha1))
+                except OSError:
+                    continue
+                size += stat.st_size
+                # Every hardlinked file adds to the object's link count; copied ones do not
+                unlinked = max(0, self._refs[sha1] - (stat.st_nlink - 1))
+                copies += unlinked
+                copied_bytes += unlinked * stat.st_size
+            return {
+                "objects": len(object_ids),
+                "bytes": size,
+                "links": sum(self._refs.values()),
+                "copies": copies,
+                "copied_bytes": copied_bytes,
+                "game_dirs": len(self._index["links"]),
+            }
+
+
+shared_store = ObjectStore()
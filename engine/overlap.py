@@ -0,0 +1,230 @@
+"""Detection of classes shipped by more than one mod jar.
+
+Only each jar's zip central directory is read: the end-of-central-directory
+record at the end of the file gives the directory's offset and size, and
+the directory itself lists every entry name, so no entry is decompressed.
+Class names are stored per jar in SQLite under ``cache/`` keyed by path,
+size and mtime; a rescan only reads jars that changed, and the overlap
+report for an unchanged folder is reused as a whole.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+CLASS_INDEX_FILE = os.path.join(CACHE_DIR, "classes.sqlite")
+SCHEMA_VERSION = 1
+MAX_SCAN_WORKERS = 16
+MAX_CACHED_REPORTS = 20
+OVERLAP_EXAMPLES = 5
+
+# <APPNOTE.TXT> records
+EOCD = b"PK\x05\x06"
+EOCD_SIZE = 22
+ZIP64_LOCATOR = b"PK\x06\x07"
+ZIP64_EOCD = b"PK\x06\x06"
+ZIP64_EOCD_SIZE = 56
+ZIP64_LOCATOR_SIZE = 20
+CENTRAL_HEADER = b"PK\x01\x02"
+CENTRAL_HEADER_SIZE = 46
+# File name, extra field and comment lengths at offset 28 of a central directory header
+HEADER_LENGTHS = struct.Struct("<HHH")
+MAX_COMMENT = 0xFFFF
+MULTI_RELEASE_PREFIX = "META-INF/versions/"
+IGNORED_CLASSES = ("module-info", "package-info")
+
+
+def _central_directory(f, file_size):
+    """Raw bytes of the central directory of an open zip file"""
+    tail_size = min(file_size, EOCD_SIZE + MAX_COMMENT)
+    f.seek(file_size - tail_size)
+    tail = f.read(tail_size)
+    pos = tail.rfind(EOCD)
+    if pos < 0 or pos + EOCD_SIZE > len(tail):
+        raise ValueError("no end of central directory record")
+    eocd_offset = file_size - tail_size + pos
+    entries, cd_size, cd_offset = struct.unpack_from("<HII", tail, pos + 10)
+    if entries == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+        if pos < ZIP64_LOCATOR_SIZE or tail[pos - ZIP64_LOCATOR_SIZE:pos - 16] != ZIP64_LOCATOR:
+            raise ValueError("missing zip64 locator")
+        f.seek(struct.unpack_from("<Q", tail, pos - 12)[0])
+        record = f.read(ZIP64_EOCD_SIZE)
+        if len(record) < ZIP64_EOCD_SIZE or record[:4] != ZIP64_EOCD:
+            raise ValueError("bad zip64 end of central directory record")
+        cd_size, cd_offset = struct.unpack_from("<QQ", record, 40)
+        eocd_offset -= ZIP64_LOCATOR_SIZE + ZIP64_EOCD_SIZE
+    # Archives with data prepended (self-extracting jars) have offsets relative to the zip start
+    cd_offset = eocd_offset - cd_size if cd_offset + cd_size != eocd_offset else cd_offset
+    f.seek(cd_offset)
+    return f.read(cd_size)
+
+
+def jar_class_names(path):
+    """Class names of a jar ("a/b/C", without ".class"), read from the central directory only"""
+    try:
+        with open(path, "rb") as f:
+            directory = _central_directory(f, os.fstat(f.fileno()).st_size)
+        names, pos, end = [], 0, len(directory)
+        unpack, startswith, endswith = HEADER_LENGTHS.unpack_from, directory.startswith, directory.endswith
+        while pos + CENTRAL_HEADER_SIZE <= end:
+            if not startswith(CENTRAL_HEADER, pos):
+                raise ValueError("bad central directory header")
+            name_len, extra_len, comment_len = unpack(directory, pos + 28)
+            name_end = pos + CENTRAL_HEADER_SIZE + name_len
+            if endswith(b".class", 0, name_end):
+                names.append(directory[pos + CENTRAL_HEADER_SIZE:name_end - 6])
+            pos = name_end + extra_len + comment_len
+        # One decode for the whole jar instead of one per entry
+        names = b"\n".join(names).decode("utf-8", errors="replace").split("\n") if names else []
+    except (ValueError, struct.error):
+        # Unusual layouts (split archives, junk after the directory) go through zipfile, which also reads
+        # only the central directory
+        with zipfile.ZipFile(path) as zip_ref:
+            names = [name[:-6] for name in zip_ref.namelist() if name.endswith(".class")]
+    classes = set(names)
+    for name in [name for name in classes if name.startswith("META-INF/")]:
+        classes.discard(name)
+        # META-INF/versions/17/a/B.class is another build of a/B.class in the same jar
+        if name.startswith(MULTI_RELEASE_PREFIX) and name.count("/") >= 3:
+            classes.add(name.split("/", 3)[3])
+    return [name for name in classes if not name.endswith(IGNORED_CLASSES)]
+
+
+def find_overlaps(jar_classes):
+    """Groups of jars shipping the same classes, largest first: {"jars", "classes", "packages", "examples"}"""
+    owner, shared = {}, {}
+    for jar, classes in sorted(jar_classes.items()):
+        for name in classes:
+            first = owner.setdefault(name, jar)
+            if first != jar:
+                shared.setdefault(name, [first]).append(jar)
+    groups = {}
+    for name, jars in shared.items():
+        groups.setdefault(tuple(jars), []).append(name)
+    overlaps = []
+    for jars, names in groups.items():
+        names.sort()
+        overlaps.append({
+            "jars": list(jars),
+            "classes": len(names),
+            "packages": sorted({name.rpartition("/")[0].replace("/", ".") or "(default package)" for name in names}),
+            "examples": [name.replace("/", ".") for name in names[:OVERLAP_EXAMPLES]],
+        })
+    overlaps.sort(key=lambda overlap: (-overlap["classes"], overlap["jars"]))
+    return overlaps
+
+
+def format_overlap(overlap):
+    packages = overlap["packages"]
+    shown = ", ".join(packages[:3]) + (f" and {len(packages) - 3} more" if len(packages) > 3 else "")
+    jars = overlap["jars"]
+    owners = f"{jars[0]} and {jars[1]} both" if len(jars) == 2 else f"{', '.join(jars[:-1])} and {jars[-1]} all"
+    return f"{owners} contain {overlap['classes']} classes in {shown}"
+
+
+class ClassOverlapScanner:
+    """Class names per jar in SQLite, read again only when a jar's size or mtime changes"""
+
+    def __init__(self, db_path=CLASS_INDEX_FILE):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS jars")
+                db.execute("DROP TABLE IF EXISTS reports")
+                db.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+            db.execute("CREATE TABLE IF NOT EXISTS jars (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                       "classes BLOB, error TEXT)")
+            db.execute("CREATE TABLE IF NOT EXISTS reports (digest TEXT PRIMARY KEY, report TEXT, created_at REAL)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def _read(path):
+        try:
+            return jar_class_names(path), None
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            return [], str(e) or type(e).__name__
+
+    def scan(self, mods_dir, max_workers=None):
+        """{"jars", "classes", "overlaps", "errors", "read", "cached"} for the jars in mods_dir"""
+        mods_dir = os.path.abspath(mods_dir)
+        try:
+            with os.scandir(mods_dir) as it:
+                jars = {entry.path: entry.stat() for entry in it if entry.name.endswith(".jar") and entry.is_file()}
+        except OSError:
+            jars = {}
+        digest = hashlib.sha1(json.dumps(sorted(
+            (path, stat.st_size, stat.st_mtime_ns) for path, stat in jars.items())).encode()).hexdigest()
+        with self._lock:
+            db = self._connect()
+            row = db.execute("SELECT report FROM reports WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                return dict(json.loads(row[0]), read=0, cached=True)
+            prefix = os.path.join(mods_dir, "")
+            known = {row[0]: row[1:] for row in db.execute(
+                "SELECT path, size, mtime_ns, classes, error FROM jars WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix))}
+
+        stale = [path for path, stat in jars.items()
+                 if known.get(path, (None, None))[:2] != (stat.st_size, stat.st_mtime_ns)]
+        if stale:
+            # Threads rather than processes: a worker process would re-import the launcher's main script on
+            # platforms that spawn, and each jar only costs one seek and one read plus a short header walk
+            workers = max(1, min(max_workers or MAX_SCAN_WORKERS, len(stale)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = dict(zip(stale, pool.map(self._read, stale)))
+        else:
+            results = {}
+
+        jar_classes, errors = {}, {}
+        for path in jars:
+            if path in results:
+                classes, error = results[path]
+            else:
+                blob, error = known[path][2:]
+                classes = zlib.decompress(blob).decode("utf-8").split("\n") if blob else []
+            jar_classes[os.path.basename(path)] = classes
+            if error:
+                errors[os.path.basename(path)] = error
+        overlaps = find_overlaps(jar_classes)
+        report = {"jars": len(jars), "classes": sum(map(len, jar_classes.values())), "overlaps": overlaps,
+                  "errors": errors}
+
+        with self._lock:
+            db = self._connect()
+            db.executemany("INSERT OR REPLACE INTO jars (path, size, mtime_ns, classes, error) VALUES (?, ?, ?, ?, ?)", [
+                (path, jars[path].st_size, jars[path].st_mtime_ns,
+                 zlib.compress("\n".join(classes).encode("utf-8")), error)
+                for path, (classes, error) in results.items()
+            ])
+            removed = [path for path in known if path not in jars and os.path.dirname(path) == mods_dir]
+            db.executemany("DELETE FROM jars WHERE path = ?", [(path,) for path in removed])
+            db.execute("INSERT OR REPLACE INTO reports (digest, report, created_at) VALUES (?, ?, ?)",
+                       (digest, json.dumps(report), time.time()))
+            db.execute("DELETE FROM reports WHERE digest NOT IN "
+                       "(SELECT digest FROM reports ORDER BY created_at DESC LIMIT ?)", (MAX_CACHED_REPORTS,))
+            db.commit()
+        if stale or removed:
+            logger.info("Class index: %d jars, %d read, %d removed", len(jars), len(stale), len(removed))
+        return dict(report, read=len(stale), cached=False)
+
+
+class_overlap_scanner = ClassOverlapScanner()
@@ -0,0 +1,195 @@
+"""Launch policies: priority, I/O priority, CPU affinity and resource limits for the game process.
+
+A policy is a plain dict kept in the config (and saved with profiles)::
+
+    {"nice": 5, "ionice": "idle", "affinity": "auto", "cores": 4,
+     "memory_max_mb": 6144, "cpu_max_percent": 200}
+
+On Linux, niceness, I/O class and affinity are per thread and inherited by
+new threads, so they are set before the JVM starts any threads by running it
+through ``nice``, ``taskset`` and ``ionice``, which exec the game in place.
+Where a tool is missing (and on Windows) they are set through psutil right
+after the spawn. Memory and CPU limits use a cgroup v2 scope created with
+``systemd-run --user --scope``, which needs no root and puts only the game
+in the limited cgroup. ``"affinity": "auto"`` pins the game to the block of
+``cores`` CPUs that other running instances use least.
+"""
+import logging
+import os
+import shutil
+import sys
+
+logger = logging.getLogger(__name__)
+
+# In the order of ionice's class numbers, from 1
+IONICE_CLASSES = ("realtime", "best_effort", "idle")
+# Windows priority classes by nice value ranges
+WINDOWS_PRIORITIES = ((10, "IDLE_PRIORITY_CLASS"), (1, "BELOW_NORMAL_PRIORITY_CLASS"), (0, "NORMAL_PRIORITY_CLASS"),
+                      (-10, "ABOVE_NORMAL_PRIORITY_CLASS"), (-20, "HIGH_PRIORITY_CLASS"))
+
+
+def parse_cpu_list(text):
+    """CPU ids from a "0-3,8" style list"""
+    cpus = set()
+    for part in str(text).replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus):
+    """Inverse of parse_cpu_list, with runs collapsed"""
+    ranges, cpus = [], sorted(cpus)
+    for cpu in cpus:
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def running_instance_affinities():
+    """CPU affinity of every Minecraft client running on this machine"""
+    import psutil
+    from .jvm_presets import MINECRAFT_MAIN_CLASSES
+    affinities = []
+    for process in psutil.process_iter(["cmdline"]):
+        cmdline = process.info.get("cmdline") or []
+        if any(main_class in cmdline for main_class in MINECRAFT_MAIN_CLASSES):
+            try:
+                affinities.append(process.cpu_affinity())
+            except (psutil.Error, AttributeError):
+                pass
+    return affinities
+
+
+def pick_cores(cores, cpus, busy):
+    """The block of ``cores`` consecutive CPUs from cpus that the affinity lists in busy overlap least"""
+    cores = max(1, min(cores, len(cpus)))
+    load = {cpu: sum(cpu in affinity for affinity in busy) for cpu in cpus}
+    blocks = [cpus[i:i + cores] for i in range(0, len(cpus) - cores + 1, cores)]
+    return min(blocks, key=lambda block: sum(load[cpu] for cpu in block))
+
+
+def resolve_policy(policy):
+    """The concrete settings for one launch: "auto" affinity becomes a CPU list, invalid fields are dropped"""
+    resolved = {}
+    if policy.get("nice") not in (None, ""):
+        resolved["nice"] = max(-20, min(19, int(policy["nice"])))
+    if policy.get("ionice") in IONICE_CLASSES:
+        resolved["ionice"] = policy["ionice"]
+    affinity = policy.get("affinity")
+    if affinity == "auto":
+        try:
+            busy = running_instance_affinities()
+        except Exception as e:
+            logger.warning("Could not read running instances' affinity: %s", e)
+            busy = []
+        resolved["affinity"] = pick_cores(int(policy.get("cores") or 2), available_cpus(), busy)
+    elif affinity:
+        cpus = set(available_cpus())
+        chosen = [cpu for cpu in (parse_cpu_list(affinity) if isinstance(affinity, str) else affinity) if cpu in cpus]
+        if chosen:
+            resolved["affinity"] = chosen
+    for key in ("memory_max_mb", "cpu_max_percent"):
+        if policy.get(key):
+            resolved[key] = int(policy[key])
+    return resolved
+
+
+def limit_command(command, resolved):
+    """(command, cgroup description): the command wrapped in a limited systemd scope when limits are set on Linux"""
+    properties = []
+    if resolved.get("memory_max_mb"):
+        properties.append(f"MemoryMax={resolved['memory_max_mb']}M")
+    if resolved.get("cpu_max_percent"):
+        properties.append(f"CPUQuota={resolved['cpu_max_percent']}%")
+    if not properties:
+        return command, None
+    systemd_run = shutil.which("systemd-run") if sys.platform.startswith("linux") else None
+    user_bus = os.path.join(os.environ.get("XDG_RUNTIME_DIR", ""), "bus")
+    if not systemd_run or not os.path.exists("/sys/fs/cgroup/cgroup.controllers") or not os.path.exists(user_bus):
+        return command, None
+    wrapper = [systemd_run, "--user", "--scope", "--quiet", "--collect"]
+    for prop in properties:
+        wrapper += ["-p", prop]
+    # systemd-run execs the command in place, so the spawned pid is still the game's
+    return wrapper + ["--"] + command, " ".join(properties)
+
+
+def schedule_command(command, resolved):
+    """(command, settings left over): the command prefixed with nice, taskset and ionice where they exist.
+
+    The wrappers exec the next program in place, so the game starts with the
+    settings on every thread it creates and the spawned pid is still the
+    game's. Settings without a wrapper on this system are returned for
+    apply_after_spawn.
+    """
+    remaining = dict(resolved)
+    if os.name != "posix":
+        return command, remaining
+    prefix = []
+    nice = shutil.which("nice") if "nice" in resolved else None
+    if nice:
+        # GNU nice warns and still runs the command when it may not lower the niceness
+        prefix += [nice, "-n", str(resolved["nice"])]
+        remaining.pop("nice")
+    taskset = shutil.which("taskset") if "affinity" in resolved else None
+    if taskset:
+        prefix += [taskset, "-c", format_cpu_list(resolved["affinity"])]
+        remaining.pop("affinity")
+    ionice = shutil.which("ionice") if "ionice" in resolved else None
+    if ionice:
+        # -t: start the game anyway if the class is not permitted (realtime needs root)
+        prefix += [ionice, "-t", "-c", str(IONICE_CLASSES.index(resolved["ionice"]) + 1)]
+        remaining.pop("ionice")
+    return prefix + command, remaining
+
+
+def apply_after_spawn(pid, resolved):
+    """Apply settings schedule_command could not prefix (all of them on Windows) to the spawned process"""
+    if not resolved:
+        return
+    import psutil
+    process = psutil.Process(pid)
+    if "nice" in resolved:
+        if os.name == "posix":
+            process.nice(resolved["nice"])
+        else:
+            process.nice(getattr(psutil, next(name for bound, name in WINDOWS_PRIORITIES if resolved["nice"] >= bound)))
+    if "affinity" in resolved and hasattr(process, "cpu_affinity"):
+        process.cpu_affinity(resolved["affinity"])
+    if "ionice" in resolved and hasattr(process, "ionice"):
+        if os.name == "posix":
+            process.ionice({"idle": psutil.IOPRIO_CLASS_IDLE, "best_effort": psutil.IOPRIO_CLASS_BE,
+                            "realtime": psutil.IOPRIO_CLASS_RT}[resolved["ionice"]])
+        elif resolved["ionice"] == "idle":
+            process.ionice(psutil.IOPRIO_VERYLOW)
+
+
+def applied_policy(pid):
+    """Priority, I/O class and affinity the process actually has, for the session record"""
+    try:
+        import psutil
+        process = psutil.Process(pid)
+        applied = {"nice": process.nice()}
+        if hasattr(process, "cpu_affinity"):
+            applied["affinity"] = format_cpu_list(process.cpu_affinity())
+        if hasattr(process, "ionice"):
+            ioclass = getattr(process.ionice(), "ioclass", None)
+            applied["ionice"] = getattr(ioclass, "name", str(ioclass))
+        return applied
+    except Exception as e:
+        logger.warning("Could not read the game's scheduling settings: %s", e)
+        return {}
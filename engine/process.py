@@ -0,0 +1,267 @@
+"""Game process supervision: output capture, log filtering and session records.
+
+The game's stdout and stderr are read line by line on reader threads, so the
+launcher never blocks on the pipes. Each line's log4j level and thread are
+parsed with one anchored regex; a level filter and a per-second line budget
+decide what reaches the Terminal tab. When the game exits, its exit status,
+wall time, line counts, resource usage and the GC log summary are saved as a session record.
+"""
+import logging
+import os
+import re
+import secrets
+import subprocess
+import threading
+import time
+from collections import Counter, deque
+
+from .config import SCRIPT_DIR, load_json, save_json
+from .gclog import format_gc_summary, summarize_session_gc
+from .policy import applied_policy
+from .sampler import ProcessSampler
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_DIR = os.path.join(SCRIPT_DIR, "sessions")
+SESSION_FILE = "session.json"
+LOG_LEVELS = {"TRACE": 0, "DEBUG": 1, "INFO": 2, "WARN": 3, "ERROR": 4, "FATAL": 5}
+DEFAULT_MIN_LEVEL = "INFO"
+DEFAULT_MAX_LINES_PER_SECOND = 100
+CRASH_TAIL_LINES = 200
+
+# [12:34:56] [Render thread/INFO]: message    (vanilla)
+# [12:34:56] [main/INFO] (FabricLoader) message    (Fabric, Quilt)
+LOG4J_LINE = re.compile(r"\[[^\]]*\] \[(?P<thread>.+?)/(?P<level>TRACE|DEBUG|INFO|WARN|ERROR|FATAL)\]")
+
+
+def parse_log_line(line):
+    """(level, thread) of a log4j console line, or (None, None) for continuation lines"""
+    match = LOG4J_LINE.match(line)
+    if match:
+        return match.group("level"), match.group("thread")
+    return None, None
+
+
+# Logged right as the game window is created
+FIRST_WINDOW_MARKERS = ("Backend library:", "LWJGL version")
+
+
+def new_session_id():
+    return time.strftime("%Y%m%d-%H%M%S") + f"-{secrets.token_hex(2)}"
+
+
+def session_dir(session_id, sessions_dir=SESSIONS_DIR):
+    """A session's directory, created if missing"""
+    path = os.path.join(sessions_dir, session_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def save_session_record(record, sessions_dir=SESSIONS_DIR):
+    try:
+        session_dir = os.path.join(sessions_dir, record["id"])
+        os.makedirs(session_dir, exist_ok=True)
+        # Readers (the session list, the GC tab) never see a half-written file
+        record_file = os.path.join(session_dir, SESSION_FILE)
+        save_json(record_file + ".tmp", record)
+        os.replace(record_file + ".tmp", record_file)
+    except OSError as e:
+        logger.warning("Failed to save session record: %s", e)
+
+
+def list_sessions(sessions_dir=SESSIONS_DIR, limit=None):
+    """Saved session records, newest first"""
+    try:
+        names = sorted(os.listdir(sessions_dir), reverse=True)
+    except FileNotFoundError:
+        return []
+    sessions = []
+    for name in names:
+        try:
+            record = load_json(os.path.join(sessions_dir, name, SESSION_FILE), None)
+        except (OSError, ValueError):
+            continue
+        if record:
+            sessions.append(record)
+            if limit and len(sessions) >= limit:
+                break
+    return sessions
+
+
+def spawn_game(command, cwd, **popen_kwargs):
+    """Start the game with its output piped to the launcher"""
+    return subprocess.Popen(command, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace", **popen_kwargs)
+
+
+class GameSession:
+    """Supervises one running game process.
+
+    Lines at or above ``min_level`` are passed to ``append_terminal`` up to
+    ``max_lines_per_second``; WARN and above always get through. Lines without
+    a log4j prefix (stack traces) take the level of the line before them, and
+    unprefixed stderr counts as WARN.
+    """
+
+    def __init__(self, process, version, append_terminal_callback, on_exit=None, min_level=DEFAULT_MIN_LEVEL,
+                 max_lines_per_second=DEFAULT_MAX_LINES_PER_SECOND, sessions_dir=SESSIONS_DIR, session_id=None,
+                 timer=None, details=None, sample_interval=None):
+        self.process = process
+        self.append_terminal = append_terminal_callback
+        self.on_exit = on_exit
+        self.min_level = LOG_LEVELS.get(min_level.upper(), LOG_LEVELS[DEFAULT_MIN_LEVEL])
+        self.max_lines_per_second = max_lines_per_second
+        self.session_id = session_id or new_session_id()
+        self.sessions_dir = sessions_dir
+        self.session_dir = os.path.join(sessions_dir, self.session_id)
+        self.timer = timer
+        # Resource samples of the game; None when sampling is off or psutil is missing
+        self.sampler = ProcessSampler(process.pid, sample_interval) if sample_interval else None
+        self.record = dict(details or {}, id=self.session_id, version=version, pid=process.pid, started_at=time.time())
+        self._first_line = threading.Event()
+        self._first_window = threading.Event()
+        self.level_counts = Counter()
+        self.thread_counts = Counter()
+        self.tail = deque(maxlen=CRASH_TAIL_LINES)
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._window = 0
+        self._window_lines = 0
+        self._suppressed = 0
+        self._suppressed_total = 0
+        self._readers = []
+        self._done = threading.Event()
+
+    def start(self):
+        self.save()
+        if self.sampler:
+            self.sampler = self.sampler.start()
+        for stream, name in ((self.process.stdout, "stdout"), (self.process.stderr, "stderr")):
+            if stream is not None:
+                reader = threading.Thread(target=self._read, args=(stream, name), daemon=True)
+                reader.start()
+                self._readers.append(reader)
+        threading.Thread(target=self._wait, daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until the game has exited and its record is saved; returns the exit code"""
+        self._done.wait(timeout)
+        return self.record.get("exit_code")
+
+    @property
+    def running(self):
+        return not self._done.is_set()
+
+    # === Output ===
+    def _read(self, stream, name):
+        last_level = "WARN" if name == "stderr" else "INFO"
+        try:
+            for line in stream:
+                line = line.rstrip("\r\n")
+                if not self._first_window.is_set():
+                    self._mark_startup(line)
+                level, thread = parse_log_line(line)
+                if level is None:
+                    level = last_level
+                else:
+                    last_level = level
+                self._handle(line, level, thread)
+        except (OSError, ValueError) as e:
+            logger.warning("Stopped reading game %s: %s", name, e)
+        finally:
+            stream.close()
+
+    def _mark_startup(self, line):
+        """Record time to the first log line and to the game window, measured from the launch start"""
+        if not self._first_line.is_set():
+            self._first_line.set()
+            if self.timer:
+                self.timer.mark("first_log_line")
+            policy = self.record.get("launch_policy")
+            if policy is not None:
+                # Only now is the pid the JVM itself rather than the nice/taskset/ionice wrapper chain
+                applied = applied_policy(self.process.pid)
+                with self._lock:
+                    self.record["launch_policy"] = dict(policy, applied=applied)
+                self.save()
+        if any(marker in line for marker in FIRST_WINDOW_MARKERS):
+            self._first_window.set()
+            if self.timer:
+                self.timer.mark("first_window")
+                self.save()
+
+    def _handle(self, line, level, thread=None):
+        severity = LOG_LEVELS[level]
+        with self._lock:
+            self.level_counts[level] += 1
+            if thread is not None:
+                self.thread_counts[thread] += 1
+            self.tail.append(line)
+            if severity < self.min_level:
+                return
+            second = int(time.monotonic())
+            if second != self._window:
+                self._flush_suppressed()
+                self._window, self._window_lines = second, 0
+            if self._window_lines >= self.max_lines_per_second and severity < LOG_LEVELS["WARN"]:
+                self._suppressed += 1
+                return
+            self._window_lines += 1
+        self.append_terminal(f"[Game] {line}")
+
+    def _flush_suppressed(self):
+        if self._suppressed:
+            self.append_terminal(f"[Game] ... {self._suppressed} lines not shown (over {self.max_lines_per_second}/s)")
+            self._suppressed_total += self._suppressed
+            self._suppressed = 0
+
+    # === Exit ===
+    def _wait(self):
+        exit_code = self.process.wait()
+        if self.sampler:
+            self.sampler.stop()
+        for reader in self._readers:
+            reader.join()
+        resources = self.sampler.summary() if self.sampler else None
+        gc_stats = summarize_session_gc(self.session_dir)
+        wall_time = time.perf_counter() - self._t0
+        with self._lock:
+            self._flush_suppressed()
+            self.record.update(
+                ended_at=time.time(),
+                exit_code=exit_code,
+                wall_time_s=round(wall_time, 2),
+                lines=dict(self.level_counts),
+                busiest_threads=dict(self.thread_counts.most_common(5)),
+                lines_not_shown=self._suppressed_total,
+            )
+            if exit_code != 0:
+                self.record["output_tail"] = list(self.tail)
+            if resources:
+                self.record["resources"] = resources
+            if gc_stats:
+                self.record["gc"] = gc_stats
+        self.save()
+        self.append_terminal(f"Minecraft exited with code {exit_code} after {wall_time:.0f} s.")
+        if resources:
+            self.append_terminal(f"Resources: CPU {resources['cpu_percent_avg']:.0f}% average, {resources['cpu_percent_max']:.0f}% peak; "
+                                 f"memory {resources['rss_mb_max']:.0f} MB peak; {resources['threads_max']} threads peak")
+        if gc_stats:
+            self.append_terminal(format_gc_summary(gc_stats))
+        self._done.set()
+        if self.on_exit:
+            try:
+                self.on_exit(self)
+            except Exception as e:
+                logger.warning("Game exit callback failed: %s", e)
+
+    def save(self):
+        """Write the session record; safe to call from the reader threads and the exit watcher at once"""
+        with self._save_lock:
+            with self._lock:
+                if self.timer:
+                    self.record["spans"] = self.timer.to_list()
+                record = dict(self.record)
+            save_session_record(record, self.sessions_dir)
@@ -0,0 +1,275 @@
+"""Dependency and compatibility checks over the installed mod set.
+
+Mods are read from the mod index (no jar is opened unless it changed) and
+checked against each other and against the version being launched:
+missing or out-of-range dependencies, declared incompatibilities, duplicate
+mod ids, mods for another Minecraft version and mods for another loader.
+The dependency graph and the issues found are cached in
+``cache/mod_graph.json`` under a hash of the jars' fingerprints and the
+target version, so an unchanged mods folder is checked without rebuilding
+anything.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+from .config import CACHE_DIR, load_json, save_json
+from .modindex import mod_index
+
+logger = logging.getLogger(__name__)
+
+MOD_GRAPH_CACHE_FILE = os.path.join(CACHE_DIR, "mod_graph.json")
+MAX_GRAPH_CACHE_SIZE = 20
+# Loaders whose mods another loader can also run
+COMPATIBLE_LOADERS = {"Quilt": {"Quilt", "Fabric"}, "NeoForge": {"NeoForge", "Forge"}}
+SNAPSHOT = re.compile(r"^\d{2}w\d{2}[a-z]$")
+# Ids a mod answers to besides its own, for mods that do not declare them in "provides"
+IMPLIED_PROVIDES = {"fabric-api": ("fabric",)}
+# Libraries recent loaders ship themselves (Fabric Loader 0.15+, NeoForge); mods depend on them like on mods
+LOADER_PROVIDED_IDS = {"mixinextras"}
+# Part of the cache key, so results computed by older rules are not reused
+GRAPH_CACHE_VERSION = 3
+MAVEN_RANGE = re.compile(r"^(?P<open>[\[(])(?P<low>[^,\])]*)(?:,(?P<high>[^\])]*))?(?P<close>[\])])$")
+
+
+class ModCheckError(Exception):
+    pass
+
+
+# === Versions ===
+def version_key(version):
+    """Sortable key for loose semver / Minecraft versions; None when the version has no leading number"""
+    version = str(version).strip().lstrip("v").split("+", 1)[0]
+    if SNAPSHOT.match(version):
+        return None
+    main, _, pre = version.partition("-")
+    parts = []
+    for part in main.split("."):
+        match = re.match(r"\d+", part)
+        if not match:
+            break
+        parts.append(int(match.group()))
+    if not parts:
+        return None
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    # A pre-release sorts before the release it leads up to
+    return tuple(parts), 0 if pre else 1, pre
+
+
+def _compare(a, b):
+    ka, kb = version_key(a), version_key(b)
+    if ka is None or kb is None:
+        return None
+    return (ka > kb) - (ka < kb)
+
+
+def _matches_predicate(version, predicate):
+    predicate = predicate.strip()
+    if predicate in ("", "*", "any"):
+        return True
+    if predicate.endswith((".x", ".*")):
+        prefix = predicate[:-2].lstrip("=~^")
+        if version_key(version) is None:
+            return True
+        return str(version) == prefix or str(version).startswith(prefix + ".")
+    for op in (">=", "<=", ">", "<", "=", "~", "^"):
+        if predicate.startswith(op):
+            target = predicate[len(op):].strip()
+            break
+    else:
+        op, target = "=", predicate
+    cmp = _compare(version, target)
+    if cmp is None:
+        return True  # Unparseable versions (snapshots, "${version}") are not held against a mod
+    if op == ">=":
+        return cmp >= 0
+    if op == "<=":
+        return cmp <= 0
+    if op == ">":
+        return cmp > 0
+    if op == "<":
+        return cmp < 0
+    if op == "=":
+        return cmp == 0
+    base = version_key(target)[0]
+    upper_len = 2 if op == "~" else next((i + 1 for i, p in enumerate(base) if p), len(base))
+    upper = list(base[:max(upper_len, 1)])
+    upper[-1] += 1
+    return cmp >= 0 and _compare(version, ".".join(map(str, upper))) < 0
+
+
+def _matches_maven(version, spec):
+    match = MAVEN_RANGE.match(spec.replace(" ", ""))
+    if not match:
+        return True  # A bare Maven version is only a recommendation
+    low, high = match.group("low"), match.group("high")
+    if high is None:  # "[1.0]" pins one version
+        return _compare(version, low) in (0, None)
+    if low:
+        cmp = _compare(version, low)
+        if cmp is not None and (cmp < 0 or (cmp == 0 and match.group("open") == "(")):
+            return False
+    if high:
+        cmp = _compare(version, high)
+        if cmp is not None and (cmp > 0 or (cmp == 0 and match.group("close") == ")")):
+            return False
+    return True
+
+
+def version_matches(version, spec):
+    """Whether version satisfies a Fabric/Quilt predicate ("|| " alternatives, space-separated AND) or a Maven range"""
+    if spec is None or version in (None, ""):
+        return True
+    if isinstance(spec, list):
+        return any(version_matches(version, s) for s in spec)
+    spec = str(spec).strip()
+    if spec[:1] in "[(":
+        # Maven ranges can be joined with commas between brackets: "[1.0,2.0),[3.0,)"
+        ranges = re.findall(r"[\[(][^\])]*[\])]", spec)
+        return any(_matches_maven(version, r) for r in ranges) if ranges else True
+    return any(all(_matches_predicate(version, p) for p in alt.split()) for alt in spec.split("||"))
+
+
+# === Target version ===
+def version_target(version, minecraft_dir):
+    """(Minecraft version, loader) of an installed version id, following inheritsFrom"""
+    loader = None
+    lowered = version.lower()
+    for name, marker in (("NeoForge", "neoforge"), ("Quilt", "quilt"), ("Fabric", "fabric"), ("Forge", "forge")):
+        if marker in lowered:
+            loader = name
+            break
+    current, base = version, version
+    for _ in range(10):
+        path = os.path.join(minecraft_dir, "versions", current, current + ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            break
+        base = current
+        if loader is None and "fabricmc" in data.get("mainClass", ""):
+            loader = "Fabric"
+        current = data.get("inheritsFrom")
+        if not current:
+            break
+    return base, loader
+
+
+# === Checks ===
+def _issue(kind, severity, mod, message):
+    return {"kind": kind, "severity": severity, "mod": mod, "message": message}
+
+
+def build_graph(entries):
+    """{mod id: {"file", "version", "depends": [ids]}} plus the ids provided by aliases and nested jars"""
+    graph, provided = {}, {}
+    for entry in entries:
+        if entry["mod_id"]:
+            graph.setdefault(entry["mod_id"], {"file": entry["file"], "version": entry["version"],
+                                               "depends": sorted(entry["dependencies"])})
+            for alias in list(entry["provides"]) + list(IMPLIED_PROVIDES.get(entry["mod_id"], ())):
+                provided.setdefault(alias, entry)
+        # A jar-in-jar mod is loaded with its version, not the outer jar's
+        for mod_id, version in sorted((entry.get("bundled") or {}).items()):
+            provided.setdefault(mod_id, dict(entry, mod_id=mod_id, version=version))
+    return graph, provided
+
+
+def check_mods(entries, minecraft_version=None, loader=None):
+    """(graph, issues) for a list of mod index entries"""
+    graph, provided = build_graph(entries)
+    by_id = {}
+    for entry in entries:
+        if entry["mod_id"]:
+            by_id.setdefault(entry["mod_id"], []).append(entry)
+    issues = []
+
+    for mod_id, copies in sorted(by_id.items()):
+        if len(copies) > 1:
+            issues.append(_issue("duplicate", "error", copies[0]["file"],
+                                 f"{mod_id} is installed {len(copies)} times: "
+                                 + ", ".join(f"{c['file']} ({c['version']})" for c in copies)))
+
+    for entry in entries:
+        name = entry["file"]
+        if entry["error"]:
+            issues.append(_issue("unreadable", "warning", name, f"{name} could not be read: {entry['error']}"))
+            continue
+        if loader and entry["loader"] and entry["loader"] not in COMPATIBLE_LOADERS.get(loader, {loader}):
+            issues.append(_issue("loader", "error", name, f"{name} is a {entry['loader']} mod but {loader} is being launched"))
+        elif not loader and entry["loader"]:
+            issues.append(_issue("loader", "warning", name, f"{name} needs {entry['loader']}; vanilla ignores the mods folder"))
+        if minecraft_version and not version_matches(minecraft_version, entry["minecraft"]):
+            issues.append(_issue("minecraft", "error", name,
+                                 f"{name} needs Minecraft {entry['minecraft']}, launching {minecraft_version}"))
+        for dep_id, spec in sorted(entry["dependencies"].items()):
+            target = (by_id.get(dep_id) or [None])[0] or provided.get(dep_id)
+            if target is None and dep_id in LOADER_PROVIDED_IDS and loader:
+                continue
+            if target is None:
+                issues.append(_issue("missing", "error", name, f"{name} requires {dep_id} {spec}, which is not installed"))
+            elif not version_matches(target["version"], spec):
+                issues.append(_issue("version", "error", name,
+                                     f"{name} requires {dep_id} {spec}, installed is {target['version']}"))
+        for other_id, spec in sorted(entry["breaks"].items()):
+            for other in by_id.get(other_id, []):
+                if version_matches(other["version"], spec):
+                    issues.append(_issue("conflict", "error", name,
+                                         f"{name} is incompatible with {other['file']} ({other_id} {other['version']})"))
+    return graph, issues
+
+
+class ModResolver:
+    """check() with results cached per mods folder state and target version"""
+
+    def __init__(self, cache_file=MOD_GRAPH_CACHE_FILE, index=None):
+        self.cache_file = cache_file
+        self.index = index or mod_index
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = load_json(self.cache_file, {})
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable mod graph cache: %s", e)
+                self._entries = {}
+        return self._entries
+
+    def check(self, mods_dir, minecraft_version=None, loader=None):
+        """{"graph", "issues", "mods", "cached"} for the jars in mods_dir"""
+        entries = self.index.scan(mods_dir)
+        digest = hashlib.sha1(json.dumps([GRAPH_CACHE_VERSION, minecraft_version, loader] + [
+            (e["path"], e["size"], e["mtime_ns"]) for e in entries]).encode()).hexdigest()
+        with self._lock:
+            cached = self._load().get(digest)
+            if cached:
+                return dict(cached, cached=True)
+        graph, issues = check_mods(entries, minecraft_version, loader)
+        result = {"graph": graph, "issues": issues, "mods": len(entries)}
+        with self._lock:
+            cache = self._load()
+            cache.pop(digest, None)
+            while len(cache) >= MAX_GRAPH_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[digest] = result
+            try:
+                os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+                save_json(self.cache_file, cache)
+            except OSError as e:
+                logger.warning("Failed to save mod graph cache: %s", e)
+        return dict(result, cached=False)
+
+    def check_version(self, version, minecraft_dir):
+        """check() for the mods folder of minecraft_dir against an installed version"""
+        minecraft_version, loader = version_target(version, minecraft_dir)
+        return self.check(os.path.join(minecraft_dir, "mods"), minecraft_version, loader)
+
+
+mod_resolver = ModResolver()
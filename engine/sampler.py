@@ -0,0 +1,158 @@
+"""Background resource sampling of running processes.
+
+A ProcessSampler thread polls one process with psutil at a fixed interval
+and writes each sample into a SampleRing: one preallocated ``array('d')``
+per metric, overwritten in place once full, so a long session costs the
+same memory as a short one and readers can hand a whole series to a chart
+without building a dict per sample. psutil is imported when sampling
+starts, keeping the engine importable without it.
+"""
+import logging
+import threading
+import time
+from array import array
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_FIELDS = ("time", "cpu_percent", "rss_mb", "threads", "read_mb", "write_mb", "open_files")
+DEFAULT_SAMPLE_INTERVAL = 1.0
+DEFAULT_SAMPLE_CAPACITY = 3600
+MB = 1024 * 1024
+
+
+class SampleRing:
+    """The last ``capacity`` samples of SAMPLE_FIELDS, stored column-wise"""
+
+    def __init__(self, capacity=DEFAULT_SAMPLE_CAPACITY):
+        self.capacity = capacity
+        self.columns = {field: array("d", bytes(8 * capacity)) for field in SAMPLE_FIELDS}
+        self.count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, values):
+        """Add one sample, given in SAMPLE_FIELDS order"""
+        with self._lock:
+            index = self._next
+            for field, value in zip(SAMPLE_FIELDS, values):
+                self.columns[field][index] = value
+            self._next = (index + 1) % self.capacity
+            self.count += 1
+
+    def series(self, field, last=None):
+        """Values of one field, oldest first (the last ``last`` samples only, if given)"""
+        with self._lock:
+            size = min(self.count, self.capacity)
+            last = size if last is None else min(last, size)
+            column = self.columns[field]
+            start = (self._next - last) % self.capacity
+            if start + last <= self.capacity:
+                return column[start:start + last]
+            return column[start:] + column[:(start + last) % self.capacity]
+
+    def latest(self):
+        """The newest sample as a dict, or None"""
+        with self._lock:
+            if not self.count:
+                return None
+            index = (self._next - 1) % self.capacity
+            return {field: self.columns[field][index] for field in SAMPLE_FIELDS}
+
+
+class ProcessSampler:
+    """Samples CPU %, RSS, threads, I/O and open files of one process until it exits or stop() is called"""
+
+    def __init__(self, pid, interval=DEFAULT_SAMPLE_INTERVAL, capacity=DEFAULT_SAMPLE_CAPACITY):
+        self.pid = pid
+        self.interval = interval
+        self.ring = SampleRing(capacity)
+        self.samples = 0
+        self.started_at = None
+        self._totals = dict.fromkeys(("cpu_percent", "rss_mb", "threads"), 0.0)
+        self._peaks = dict.fromkeys(("cpu_percent", "rss_mb", "threads", "open_files"), 0.0)
+        self._io = [0.0, 0.0]
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling on a daemon thread; returns None when psutil or the process is unavailable"""
+        try:
+            import psutil
+            self._process = psutil.Process(self.pid)
+            self._process.cpu_percent(None)  # The first call only sets the baseline
+        except ImportError:
+            logger.info("psutil is not installed; not sampling process %s", self.pid)
+            return None
+        except Exception as e:
+            logger.warning("Cannot sample process %s: %s", self.pid, e)
+            return None
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"sampler-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(self.interval + 1)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        import psutil
+        t0 = time.monotonic()
+        while not self._stop.wait(self.interval):
+            try:
+                sample = self._sample(psutil)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                break
+            except psutil.Error as e:
+                logger.warning("Stopped sampling process %s: %s", self.pid, e)
+                break
+            self.ring.append((time.monotonic() - t0,) + sample)
+
+    def _sample(self, psutil):
+        process = self._process
+        with process.oneshot():
+            cpu = process.cpu_percent(None)
+            rss = process.memory_info().rss / MB
+            threads = process.num_threads()
+            try:
+                io = process.io_counters()
+                read_mb, write_mb = io.read_bytes / MB, io.write_bytes / MB
+            except (AttributeError, psutil.AccessDenied):
+                read_mb, write_mb = self._io
+            try:
+                open_files = len(process.open_files())
+            except psutil.AccessDenied:
+                open_files = 0
+        self.samples += 1
+        for key, value in (("cpu_percent", cpu), ("rss_mb", rss), ("threads", threads)):
+            self._totals[key] += value
+        for key, value in (("cpu_percent", cpu), ("rss_mb", rss), ("threads", threads), ("open_files", open_files)):
+            self._peaks[key] = max(self._peaks[key], value)
+        self._io = [read_mb, write_mb]
+        return cpu, rss, threads, read_mb, write_mb, open_files
+
+    def summary(self):
+        """Averages and peaks over every sample taken, not only those still in the ring"""
+        if not self.samples:
+            return None
+        return {
+            "samples": self.samples,
+            "interval_s": self.interval,
+            "cpu_percent_avg": round(self._totals["cpu_percent"] / self.samples, 1),
+            "cpu_percent_max": round(self._peaks["cpu_percent"], 1),
+            "rss_mb_avg": round(self._totals["rss_mb"] / self.samples, 1),
+            "rss_mb_max": round(self._peaks["rss_mb"], 1),
+            "threads_avg": round(self._totals["threads"] / self.samples, 1),
+            "threads_max": int(self._peaks["threads"]),
+            "open_files_max": int(self._peaks["open_files"]),
+            "read_mb": round(self._io[0], 1),
+            "write_mb": round(self._io[1], 1),
+        }
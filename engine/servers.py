@@ -0,0 +1,56 @@
+"""Saved server favorites."""
+
+
+class ServerManager:
+    def __init__(self, config_data, append_terminal_callback):
+        self.config_data = config_data
+        self.append_terminal = append_terminal_callback
+        self.servers = self.config_data.get("servers", [])
+
+    def add_server(self, name, ip, port="25565"):
+        """Add a new server to the list"""
+        server = {
+            "name": name,
+            "ip": ip,
+            "port": port
+        }
+
+        # Check if server already exists
+        for existing in self.servers:
+            if existing["ip"] == ip and existing["port"] == port:
+                return False, "Server already exists"
+
+        self.servers.append(server)
+        self.config_data["servers"] = self.servers
+        return True, "Server added successfully"
+
+    def remove_server(self, index):
+        """Remove a server from the list"""
+        if 0 <= index < len(self.servers):
+            removed = self.servers.pop(index)
+            self.config_data["servers"] = self.servers
+            return True, f"Server '{removed['name']}' removed"
+        return False, "Invalid server index"
+
+    def get_servers_list(self):
+        """Get formatted list of servers"""
+        return [f"{server['name']} ({server['ip']}:{server['port']})" for server in self.servers]
+
+    def get_server_details(self, index):
+        """Get server details by index"""
+        if 0 <= index < len(self.servers):
+            return self.servers[index]
+        return None
+
+    def ping_server(self, ip, port):
+        """Ping a server to check if it's online"""
+        try:
+            # This is a basic implementation - in a real scenario you'd use proper Minecraft server pinging
+            import socket
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(5)
+            result = sock.connect_ex((ip, int(port)))
+            sock.close()
+            return result == 0
+        except:
+            return False
@@ -0,0 +1,110 @@
+"""Startup phase timing and the background tasks that run once the window is up."""
+import logging
+import os
+import threading
+
+from .accounts import AccountSessionManager
+from .config import CACHE_DIR, load_json, save_json
+from .timing import PhaseTimer
+from .versions import get_version_catalog, load_version_catalog
+
+logger = logging.getLogger(__name__)
+
+STARTUP_STATE_FILE = os.path.join(CACHE_DIR, "startup_state.json")
+
+
+class StartupTimer(PhaseTimer):
+    """Collects per-phase startup timings in milliseconds"""
+
+    label = "Startup"
+
+
+class StartupPipeline:
+    """Serves last known startup data immediately and refreshes it in the background.
+
+    ``dispatch(func, *args)`` must run ``func`` on the thread that owns the UI; the
+    Tk launcher passes a ``root.after`` wrapper, headless callers can call directly.
+    """
+
+    def __init__(self, minecraft_dir, config_data, timer, dispatch, append_terminal_callback, accounts=None):
+        self.minecraft_dir = minecraft_dir
+        self.config_data = config_data
+        self.accounts = accounts or AccountSessionManager(config_data, append_terminal_callback=append_terminal_callback)
+        self.timer = timer
+        self.dispatch = dispatch
+        self.append_terminal = append_terminal_callback
+        self.state = load_json(STARTUP_STATE_FILE, {})
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = threading.Event()
+
+    def cached_catalog(self):
+        """Version catalog from the on-disk manifest cache, or the built-in fallback on first run"""
+        return load_version_catalog(self.minecraft_dir, network=False)
+
+    def cached_versions(self):
+        return self.cached_catalog().ids()
+
+    def cached_login_state(self):
+        """'none', 'valid', 'refresh_due' or 'expired' for the active Microsoft login, without touching the network"""
+        return self.accounts.state()
+
+    def start(self, on_versions=None, on_login=None):
+        """Start the version refresh and, when the active login's token has expired, its refresh.
+
+        on_versions receives the refreshed VersionCatalog and on_login the usable
+        login (or None), both through dispatch. Tokens that are still valid are
+        not checked over the network; the account manager refreshes them before
+        they expire.
+        """
+        tasks = [(self._refresh_versions, on_versions)]
+        if self.accounts.state() == "expired":
+            tasks.append((self._validate_login, on_login))
+        self._pending = len(tasks)
+        for task, callback in tasks:
+            threading.Thread(target=task, args=(callback,), daemon=True).start()
+        self.accounts.start()
+
+    def wait(self, timeout=None):
+        """Block until all background tasks have finished"""
+        return self._done.wait(timeout)
+
+    def _refresh_versions(self, callback):
+        try:
+            with self.timer.phase("version_refresh"):
+                catalog = get_version_catalog(self.minecraft_dir, refresh=True)
+            if callback:
+                self.dispatch(callback, catalog)
+        except Exception as e:
+            self.append_terminal(f"Failed to refresh versions, using cached list: {e}")
+        finally:
+            self._task_done()
+
+    def _validate_login(self, callback):
+        try:
+            with self.timer.phase("login_refresh"):
+                login = self.accounts.get_valid_login()
+            if callback:
+                self.dispatch(callback, login)
+        except Exception as e:
+            self.append_terminal(f"Failed to validate Microsoft login: {e}")
+        finally:
+            self._task_done()
+
+    def _save_state(self):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            save_json(STARTUP_STATE_FILE, self.state)
+        except OSError as e:
+            logger.warning("Failed to save startup state: %s", e)
+
+    def _task_done(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending > 0:
+                return
+            self.state["last_startup_ms"] = dict(self.timer.phases)
+            self._save_state()
+        logger.info("Startup timings: %s", self.timer.summary())
+        self.append_terminal(f"Startup timings: {self.timer.summary()}")
+        self._done.set()
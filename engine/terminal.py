@@ -0,0 +1,54 @@
+"""Fixed-capacity line buffer behind the Terminal tab."""
+from collections import deque
+from itertools import islice
+
+TERMINAL_CAPACITY = 5000
+
+
+class TerminalBuffer:
+    """The last ``capacity`` terminal lines, plus the tail the view has not shown yet.
+
+    ``flush()`` tells the view how many old lines to delete from the top and
+    what text to append, so the widget never holds more than ``capacity``
+    lines and each flush is one delete and one insert however many lines
+    arrived. Memory and per-flush cost stay flat over long sessions.
+    """
+
+    def __init__(self, capacity=TERMINAL_CAPACITY):
+        self.capacity = capacity
+        self.lines = deque(maxlen=capacity)
+        self.total = 0
+        self._pending = 0
+        self._shown = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    def extend(self, texts):
+        """Append texts; multi-line texts (tracebacks) count as several lines"""
+        for text in texts:
+            for line in str(text).split("\n"):
+                self.lines.append(line)
+                self._pending += 1
+                self.total += 1
+        self._pending = min(self._pending, self.capacity)
+
+    def flush(self):
+        """(lines to delete from the top of the view, text to append), or None when nothing is pending"""
+        if not self._pending:
+            return None
+        new_lines = list(islice(reversed(self.lines), self._pending))
+        new_lines.reverse()
+        trim = min(max(self._shown + len(new_lines) - self.capacity, 0), self._shown)
+        self._shown += len(new_lines) - trim
+        self._pending = 0
+        return trim, "\n".join(new_lines) + "\n"
+
+    def clear(self):
+        """Forget every line; the view must be emptied too"""
+        self.lines.clear()
+        self._pending = 0
+        self._shown = 0
+
+    def text(self):
+        return "\n".join(self.lines)
@@ -0,0 +1,80 @@
+"""Named phase timings for startup and launches, and percentile summaries across launches."""
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    """Collects per-phase timings in milliseconds.
+
+    Every phase is also kept as a span (name, start offset, duration) so a
+    launch can be persisted and compared with earlier ones.
+    """
+
+    label = "Launch"
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.perf_counter()
+        self.phases = {}
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, name, duration_ms, start_ms=None):
+        if start_ms is None:
+            start_ms = (time.perf_counter() - self.start) * 1000 - duration_ms
+        with self._lock:
+            self.phases[name] = round(duration_ms, 1)
+            self.spans.append({"name": name, "start_ms": round(start_ms, 1), "duration_ms": round(duration_ms, 1)})
+        logger.info("%s phase %s: %.1f ms", self.label, name, duration_ms)
+
+    def mark(self, name):
+        """Record the time elapsed since the timer started"""
+        self.record(name, (time.perf_counter() - self.start) * 1000, start_ms=0)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named phase"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000, (t0 - self.start) * 1000)
+
+    def summary(self):
+        with self._lock:
+            return ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases.items())
+
+    def to_list(self):
+        with self._lock:
+            return [dict(span) for span in self.spans]
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize_spans(span_lists):
+    """Per-phase count, p50 and p95 in ms over several launches' spans, in first-seen phase order"""
+    durations = {}
+    for spans in span_lists:
+        for span in spans:
+            durations.setdefault(span["name"], []).append(span["duration_ms"])
+    return {
+        name: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+        for name, values in durations.items()
+    }
+
+
+def format_span_summary(summary):
+    """Fixed-width table of a summarize_spans result"""
+    lines = [f"{'Phase':<20} {'Launches':>8} {'p50 ms':>10} {'p95 ms':>10}"]
+    for name, stats in summary.items():
+        lines.append(f"{name:<20} {stats['count']:>8} {stats['p50']:>10.0f} {stats['p95']:>10.0f}")
+    return "\n".join(lines)
@@ -0,0 +1,134 @@
+"""Launcher self-update support via GitHub releases."""
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+import requests
+
+from .download import download_file, split_digest
+
+
+class Updater:
+    def __init__(self, current_version, launcher_name, append_terminal_callback, github_repo=None):
+        self.current_version = current_version
+        self.launcher_name = launcher_name
+        self.append_terminal = append_terminal_callback
+        self.github_repo = github_repo or "your-github-username/omnilancher"  # Replace with actual GitHub repo
+        self.update_url = f"https://api.github.com/repos/{self.github_repo}/releases/latest"
+
+    def check_for_updates(self):
+        """Check for updates from GitHub releases"""
+        try:
+            self.append_terminal("Checking for launcher updates...")
+            response = requests.get(self.update_url, timeout=10)
+            response.raise_for_status()
+
+            release_data = response.json()
+            latest_version = release_data["tag_name"].lstrip('v')
+            download_url = None
+            digest = None
+
+            # Find the appropriate asset (assuming it's a zip file)
+            for asset in release_data.get("assets", []):
+                if asset["name"].endswith(".zip"):
+                    download_url = asset["browser_download_url"]
+                    digest = asset.get("digest")  # "sha256:<hex>" on recent GitHub releases
+                    break
+
+            if not download_url:
+                # Fallback to source code zip
+                download_url = release_data["zipball_url"]
+
+            return {
+                "latest_version": latest_version,
+                "download_url": download_url,
+                "digest": digest,
+                "changelog": release_data.get("body", "No changelog available"),
+                "release_url": release_data["html_url"]
+            }
+
+        except Exception as e:
+            self.append_terminal(f"Failed to check for updates: {e}")
+            return None
+
+    def download_and_install_update(self, update_info):
+        """Download and install the update"""
+        try:
+            self.append_terminal("Downloading update...")
+
+            # Stream to a stable temporary path so a retried update resumes instead of starting over
+            temp_path = os.path.join(tempfile.gettempdir(), f"{self.launcher_name}-update-{update_info['latest_version']}.zip")
+            hash_name, hash_value = split_digest(update_info.get("digest"))
+            download_file(update_info["download_url"], temp_path, hash_value, hash_name, timeout=60)
+
+            self.append_terminal("Extracting update...")
+
+            # Extract to temporary directory
+            extract_dir = tempfile.mkdtemp()
+            with zipfile.ZipFile(temp_path, 'r') as zip_ref:
+                zip_ref.extractall(extract_dir)
+
+            # Find the main directory (GitHub releases might have extra folder)
+            contents = os.listdir(extract_dir)
+            if len(contents) == 1 and os.path.isdir(os.path.join(extract_dir, contents[0])):
+                source_dir = os.path.join(extract_dir, contents[0])
+            else:
+                source_dir = extract_dir
+
+            # Get current launcher directory
+            current_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+
+            # Backup current version
+            backup_dir = os.path.join(current_dir, "backup")
+            if os.path.exists(backup_dir):
+                shutil.rmtree(backup_dir)
+            shutil.copytree(current_dir, backup_dir, ignore=shutil.ignore_patterns("backup", "__pycache__", "*.pyc"))
+
+            self.append_terminal("Installing update...")
+
+            # Copy new files (excluding certain files)
+            exclude_files = {"config.json", "logs", "screenshots", ".git"}
+            for item in os.listdir(source_dir):
+                if item in exclude_files:
+                    continue
+
+                source_path = os.path.join(source_dir, item)
+                dest_path = os.path.join(current_dir, item)
+
+                if os.path.isdir(source_path):
+                    if os.path.exists(dest_path):
+                        shutil.rmtree(dest_path)
+                    shutil.copytree(source_path, dest_path)
+                else:
+                    shutil.copy2(source_path, dest_path)
+
+            # Clean up
+            os.unlink(temp_path)
+            shutil.rmtree(extract_dir)
+
+            self.append_terminal("Update installed successfully!")
+            return True
+
+        except Exception as e:
+            self.append_terminal(f"Failed to install update: {e}")
+            return False
+
+    def compare_versions(self, version1, version2):
+        """Compare two version strings"""
+        def parse_version(v):
+            return [int(x) for x in v.split('.')]
+
+        try:
+            v1_parts = parse_version(version1)
+            v2_parts = parse_version(version2)
+
+            # Pad shorter version with zeros
+            max_len = max(len(v1_parts), len(v2_parts))
+            v1_parts.extend([0] * (max_len - len(v1_parts)))
+            v2_parts.extend([0] * (max_len - len(v2_parts)))
+
+            return (v1_parts > v2_parts) - (v1_parts < v2_parts)
+        except:
+            return 0  # Assume equal if parsing fails
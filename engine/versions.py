@@ -0,0 +1,335 @@
+"""Minecraft version list lookup and caching."""
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import minecraft_launcher_lib
+import requests
+
+from .config import CACHE_DIR, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+VERSION_MANIFEST_FILE = os.path.join(CACHE_DIR, "version_manifest.json")
+FALLBACK_VERSIONS = ["1.20.1", "1.19.4", "1.19.3", "1.18.2", "1.17.1", "1.16.5"]
+VERSION_TYPES = ["release", "snapshot", "old_beta", "old_alpha", "modded"]
+
+# === Version Manifest Caching ===
+VERSION_CACHE_DURATION = 3600  # Revalidate after 1 hour (3600 seconds)
+
+
+class VersionManifestCache:
+    """Mojang version manifest kept on disk and revalidated with ETag/If-Modified-Since.
+
+    Reads never wait on the network once a copy exists: a stale manifest is
+    returned immediately and revalidated in the background.
+    """
+
+    def __init__(self, cache_file, url=VERSION_MANIFEST_URL, max_age=VERSION_CACHE_DURATION):
+        self.cache_file = cache_file
+        self.url = url
+        self.max_age = max_age
+        self._entry = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._revalidating = False
+
+    def _load(self):
+        if not self._loaded:
+            try:
+                entry = load_json(self.cache_file, None)
+                if entry and "manifest" in entry:
+                    self._entry = entry
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable version manifest cache: %s", e)
+            self._loaded = True
+        return self._entry
+
+    def _store(self, entry):
+        self._entry = entry
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            save_json(tmp_file, entry)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Failed to save version manifest cache: %s", e)
+
+    def is_stale(self):
+        with self._lock:
+            entry = self._load()
+            return entry is None or time.time() - entry.get("fetched_at", 0) >= self.max_age
+
+    def get_manifest(self, network=True):
+        """Return the manifest, or None when there is no copy and network is False"""
+        with self._lock:
+            entry = self._load()
+        if entry is None:
+            return self.revalidate() if network else None
+        if network and self.is_stale():
+            self.revalidate_async()
+        return entry["manifest"]
+
+    def revalidate(self):
+        """Conditionally refetch the manifest; falls back to the cached copy on network errors"""
+        with self._lock:
+            entry = self._load()
+        headers = {"user-agent": f"minecraft-launcher-lib/{minecraft_launcher_lib.utils.get_library_version()}"}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = requests.get(self.url, headers=headers, timeout=10)
+            if response.status_code == 304 and entry:
+                entry = dict(entry, fetched_at=time.time())
+            else:
+                response.raise_for_status()
+                entry = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": time.time(),
+                    "manifest": response.json(),
+                }
+        except (requests.RequestException, ValueError):
+            if entry is None:
+                raise
+            logger.warning("Version manifest revalidation failed, serving cached copy", exc_info=True)
+            return entry["manifest"]
+        with self._lock:
+            self._store(entry)
+        return entry["manifest"]
+
+    def revalidate_async(self):
+        """Revalidate in a background thread unless one is already running"""
+        with self._lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+
+        def run():
+            try:
+                self.revalidate()
+            except Exception as e:
+                logger.warning("Background version manifest revalidation failed: %s", e)
+            finally:
+                self._revalidating = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def invalidate(self):
+        """Force the next read to revalidate"""
+        with self._lock:
+            entry = self._load()
+            if entry:
+                entry["fetched_at"] = 0
+
+
+manifest_cache = VersionManifestCache(VERSION_MANIFEST_FILE)
+
+
+def get_installed_version_entries(minecraft_dir):
+    """Installed versions in manifest entry form, keeping inheritsFrom for modded versions"""
+    versions_dir = os.path.join(minecraft_dir, "versions")
+    try:
+        dir_list = os.listdir(versions_dir)
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for name in dir_list:
+        json_path = os.path.join(versions_dir, name, name + ".json")
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        entry = {"id": data.get("id", name), "type": data.get("type", "release"), "releaseTime": data.get("releaseTime", "")}
+        if data.get("inheritsFrom"):
+            entry["inheritsFrom"] = data["inheritsFrom"]
+        entries.append(entry)
+    return entries
+
+
+def _merge_installed(manifest, minecraft_dir):
+    version_list = list(manifest["versions"]) if manifest else []
+    known = {v["id"] for v in version_list}
+    for v in get_installed_version_entries(minecraft_dir):
+        if v["id"] not in known:
+            version_list.append(dict(v, type="modded", baseType=v["type"]))
+    return version_list
+
+
+def get_available_versions(minecraft_dir, refresh=False, network=True):
+    """Manifest versions followed by installed versions that are not in the manifest.
+
+    Installed versions Mojang doesn't list (Fabric, Forge, custom clients) get type "modded".
+    """
+    manifest = manifest_cache.revalidate() if refresh else manifest_cache.get_manifest(network)
+    return _merge_installed(manifest, minecraft_dir)
+
+
+def version_key(version_id):
+    """Numeric sort key for a version id such as 1.20.10 (so it sorts after 1.20.9)"""
+    return tuple(int(part) for part in re.findall(r"\d+", version_id))
+
+
+class VersionCatalog:
+    """Version entries indexed by id and type, ordered newest first, with incremental search"""
+
+    def __init__(self, entries):
+        self.by_id = {}
+        for entry in entries:
+            self.by_id.setdefault(entry["id"], entry)
+        # ISO 8601 release times sort chronologically as strings
+        self.entries = sorted(self.by_id.values(),
+                              key=lambda e: (e.get("releaseTime") or "", version_key(e["id"])), reverse=True)
+        self.rank = {entry["id"]: index for index, entry in enumerate(self.entries)}
+        self.by_type = {version_type: [] for version_type in VERSION_TYPES}
+        for entry in self.entries:
+            self.by_type.setdefault(entry.get("type", "release"), []).append(entry["id"])
+        self._sorted_keys = sorted((entry["id"].lower(), entry["id"]) for entry in self.entries)
+        self._last_search = None
+
+    def __contains__(self, version_id):
+        return version_id in self.by_id
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, version_id):
+        return self.by_id.get(version_id)
+
+    def ids(self, version_type=None):
+        """Version ids newest first, optionally only one type"""
+        if not version_type or version_type == "all":
+            return [entry["id"] for entry in self.entries]
+        return list(self.by_type.get(version_type, []))
+
+    def base_version(self, version_id):
+        """The vanilla version a modded version builds on, or the id itself"""
+        entry = self.by_id.get(version_id)
+        if entry and entry.get("inheritsFrom"):
+            return entry["inheritsFrom"]
+        return version_id
+
+    def compare(self, a, b):
+        """1 if a is newer than b, -1 if older, 0 if the same release"""
+        a, b = self.base_version(a), self.base_version(b)
+        if a == b:
+            return 0
+        if a in self.rank and b in self.rank:
+            return 1 if self.rank[a] < self.rank[b] else -1
+        return (version_key(a) > version_key(b)) - (version_key(a) < version_key(b))
+
+    def search(self, query, version_type=None):
+        """Ids matching query, newest first: prefix matches, then substring, then fuzzy subsequence.
+
+        Narrowing a previous query (typing another character) only rescans its results.
+        """
+        query = query.strip().lower()
+        candidates = self.ids(version_type)
+        if not query:
+            return candidates
+
+        last = self._last_search
+        if last and last[1] == version_type and query.startswith(last[0]):
+            pool = last[2]
+        else:
+            pool = candidates
+        allowed = set(pool)
+
+        start = bisect.bisect_left(self._sorted_keys, (query, ""))
+        prefix = set()
+        for key, version_id in self._sorted_keys[start:]:
+            if not key.startswith(query):
+                break
+            if version_id in allowed:
+                prefix.add(version_id)
+
+        substring, fuzzy = [], []
+        for version_id in pool:
+            if version_id in prefix:
+                continue
+            key = version_id.lower()
+            if query in key:
+                substring.append(version_id)
+            elif _is_subsequence(query, key):
+                fuzzy.append(version_id)
+
+        results = [version_id for version_id in pool if version_id in prefix] + substring + fuzzy
+        self._last_search = (query, version_type, results)
+        return results
+
+
+def _is_subsequence(query, text):
+    chars = iter(text)
+    return all(char in chars for char in query)
+
+
+_catalog_cache = {}
+
+
+def get_version_catalog(minecraft_dir, refresh=False, network=True):
+    """Catalog over the cached manifest and installed versions, rebuilt only when either changes"""
+    manifest = manifest_cache.revalidate() if refresh else manifest_cache.get_manifest(network)
+    try:
+        installed_mtime = os.stat(os.path.join(minecraft_dir, "versions")).st_mtime
+    except OSError:
+        installed_mtime = 0
+    key = (minecraft_dir, id(manifest), installed_mtime)
+    if _catalog_cache.get("key") == key:
+        return _catalog_cache["catalog"]
+    catalog = VersionCatalog(_merge_installed(manifest, minecraft_dir))
+    # Holding the manifest keeps its id() from being reused while it is part of the key
+    _catalog_cache.update(key=key, manifest=manifest, catalog=catalog)
+    return catalog
+
+
+def fetch_versions(minecraft_dir):
+    """Revalidate the manifest and return version ids, raising on network errors without a cached copy"""
+    return get_version_catalog(minecraft_dir, refresh=True).ids()
+
+
+def load_version_catalog(minecraft_dir, append_terminal_callback=None, refresh=False, network=True):
+    """Version catalog, falling back to a fixed list when offline with nothing cached"""
+    try:
+        catalog = get_version_catalog(minecraft_dir, refresh, network)
+        if len(catalog):
+            return catalog
+    except Exception as e:
+        if append_terminal_callback:
+            append_terminal_callback(f"Failed to fetch versions: {e}")
+    return VersionCatalog([{"id": version_id, "type": "release"} for version_id in FALLBACK_VERSIONS])
+
+
+def get_versions(minecraft_dir, append_terminal_callback=None, refresh=False, network=True):
+    """Get available Minecraft version ids newest first, falling back to a fixed list when offline"""
+    return load_version_catalog(minecraft_dir, append_terminal_callback, refresh, network).ids()
+
+
+def get_cached_versions(minecraft_dir, append_terminal_callback=None):
+    """Get the version list from the manifest cache, revalidating it in the background when stale"""
+    return get_versions(minecraft_dir, append_terminal_callback)
+
+
+def clear_version_cache():
+    """Mark the cached manifest stale so the next read revalidates it"""
+    manifest_cache.invalidate()
+
+
+def get_version_info(minecraft_dir, version_id):
+    """Get the manifest entry for a version, or None if it is unknown"""
+    return get_version_catalog(minecraft_dir).get(version_id)
+
+
+def get_latest_release(refresh=False):
+    """Id of the latest Minecraft release"""
+    manifest = manifest_cache.revalidate() if refresh else manifest_cache.get_manifest()
+    return manifest["latest"]["release"]
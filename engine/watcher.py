@@ -0,0 +1,156 @@
+"""Directory watching with inotify on Linux and polling elsewhere.
+
+The watcher keeps a snapshot of the directory's files (size and mtime) and
+reports differences as ("added" | "removed" | "modified", name) events.
+With inotify the directory is only rescanned after the kernel reports a
+change and no further change arrived for ``debounce`` seconds, so copying
+a large jar produces one event instead of one per write. Without inotify
+the directory is rescanned every ``poll_interval`` seconds.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 2.0
+
+# <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+
+def _libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch") else None
+
+
+def snapshot(path, suffix=None):
+    """{name: (size, mtime_ns)} of the files in path"""
+    files = {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if suffix and not entry.name.endswith(suffix):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return files
+
+
+def diff_snapshots(old, new):
+    events = [("removed", name) for name in old if name not in new]
+    for name, state in new.items():
+        if name not in old:
+            events.append(("added", name))
+        elif old[name] != state:
+            events.append(("modified", name))
+    return events
+
+
+class DirectoryWatcher:
+    """Calls ``on_change(events, files)`` on a background thread whenever the directory's files change"""
+
+    def __init__(self, path, on_change, suffix=None, debounce=DEFAULT_DEBOUNCE, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.suffix = suffix
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.files = snapshot(path, suffix)
+        self.backend = None
+        self._stop = threading.Event()
+        self._wake_r = self._wake_w = None
+        self._thread = None
+
+    def start(self):
+        libc = _libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC) if libc else -1
+        if fd >= 0 and libc.inotify_add_watch(fd, os.fsencode(self.path), WATCH_MASK) >= 0:
+            self.backend = "inotify"
+            self._wake_r, self._wake_w = os.pipe()
+            target, args = self._run_inotify, (fd,)
+        else:
+            if fd >= 0:
+                os.close(fd)
+            self.backend = "polling"
+            target, args = self._run_polling, ()
+        self._thread = threading.Thread(target=target, args=args, name=f"watch-{os.path.basename(self.path)}",
+                                        daemon=True)
+        self._thread.start()
+        logger.info("Watching %s (%s)", self.path, self.backend)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"x")
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(2)
+        if self._wake_w is not None:
+            os.close(self._wake_w)
+            self._wake_w = None
+
+    def rescan(self):
+        """Compare the directory with the last snapshot and report any differences"""
+        files = snapshot(self.path, self.suffix)
+        events = diff_snapshots(self.files, files)
+        self.files = files
+        if events:
+            try:
+                self.on_change(events, files)
+            except Exception as e:
+                logger.warning("Directory change handler failed: %s", e)
+
+    def _run_polling(self):
+        while not self._stop.wait(self.poll_interval):
+            self.rescan()
+
+    def _run_inotify(self, fd):
+        deadline = None
+        try:
+            while not self._stop.is_set():
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                readable, _, _ = select.select([fd, self._wake_r], [], [], timeout)
+                if self._wake_r in readable:
+                    break
+                if fd in readable:
+                    try:
+                        while os.read(fd, 64 * 1024):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    # Wait until the directory has been quiet for the debounce period
+                    deadline = time.monotonic() + self.debounce
+                elif deadline is not None and time.monotonic() >= deadline:
+                    deadline = None
+                    self.rescan()
+        finally:
+            os.close(fd)
+            os.close(self._wake_r)
@@ -5,11 +5,7 @@ build_exe_options = {
     "include_files": [
         "lang",
         "assets",
-        "mods.py",
-        "servers.py",
-        "jvm_presets.py",
-        "updater.py",
-        "backup.py",
+        "engine",
         "launcher.ico",
         "rounded_button.png",
         "config.json",
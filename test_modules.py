@@ -1,40 +1,77 @@
 #!/usr/bin/env python3
-"""Test script to check if modules can be imported correctly."""
+"""Test script to check if the engine modules can be imported correctly."""
 
 import sys
 import os
+import time
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+start = time.perf_counter()
 try:
-    from mods import create_mods_tab
-    print("✓ mods module imported successfully")
+    import engine
+    print(f"✓ engine imported successfully ({(time.perf_counter() - start) * 1000:.1f} ms)")
 except ImportError as e:
-    print(f"✗ Failed to import mods: {e}")
+    print(f"✗ Failed to import engine: {e}")
 
-try:
-    from servers import create_servers_tab
-    print("✓ servers module imported successfully")
-except ImportError as e:
-    print(f"✗ Failed to import servers: {e}")
+for module_name, attr in [
+    ("engine.mods", "ModManager"),
+    ("engine.servers", "ServerManager"),
+    ("engine.jvm_presets", "JVMPresetManager"),
+    ("engine.updater", "Updater"),
+    ("engine.backup", "BackupManager"),
+    ("engine.launch", "GameLauncher"),
+]:
+    try:
+        getattr(__import__(module_name, fromlist=[attr]), attr)
+        print(f"✓ {module_name} imported successfully")
+    except (ImportError, AttributeError) as e:
+        print(f"✗ Failed to import {module_name}: {e}")
 
 try:
-    from jvm_presets import create_jvm_presets_section
-    print("✓ jvm_presets module imported successfully")
-except ImportError as e:
-    print(f"✗ Failed to import jvm_presets: {e}")
+    import tempfile
+    from engine.launch import command_cache_key
+    with tempfile.TemporaryDirectory() as minecraft_dir:
+        os.makedirs(os.path.join(minecraft_dir, "versions", "1.20.1"))
+        with open(os.path.join(minecraft_dir, "versions", "1.20.1", "1.20.1.json"), "w") as f:
+            f.write('{"id": "1.20.1"}')
+        before = command_cache_key("1.20.1", minecraft_dir, {})
+        os.makedirs(os.path.join(minecraft_dir, "runtime", "java-runtime-gamma"))
+        after = command_cache_key("1.20.1", minecraft_dir, {})
+    if before and after and before != after:
+        print("✓ command_cache_key includes installed Java runtimes")
+    else:
+        print("✗ command_cache_key ignores installed Java runtimes")
+except Exception as e:
+    print(f"✗ command_cache_key failed: {e}")
 
 try:
-    from updater import create_updater_section
-    print("✓ updater module imported successfully")
-except ImportError as e:
-    print(f"✗ Failed to import updater: {e}")
+    from engine.jvm_flags import check_jvm_args
+    flags = {"UseContainerSupport": "product", "UseG1GC": "product", "UseParallelGC": "product"}
+    off = check_jvm_args(["-XX:-UseCGroupMemoryLimitForHeap"], flags)[0]
+    cms = check_jvm_args(["-XX:+UseParallelGC", "-XX:+UseConcMarkSweepGC"], flags)[0]
+    if off == ["-XX:-UseContainerSupport"] and cms == ["-XX:+UseParallelGC"]:
+        print("✓ check_jvm_args keeps flag signs and the selected collector")
+    else:
+        print(f"✗ check_jvm_args replaced flags wrongly: {off}, {cms}")
+except Exception as e:
+    print(f"✗ check_jvm_args failed: {e}")
 
 try:
-    from backup import create_backup_section
-    print("✓ backup module imported successfully")
-except ImportError as e:
-    print(f"✗ Failed to import backup: {e}")
+    from engine.timing import percentile
+    ranks = (percentile(range(1, 21), 95), percentile([1, 2], 50), percentile(range(1, 11), 50))
+    if ranks == (19, 1, 5):
+        print("✓ percentile uses nearest rank")
+    else:
+        print(f"✗ percentile returned {ranks}, expected (19, 1, 5)")
+except Exception as e:
+    print(f"✗ percentile failed: {e}")
+
+gui_modules = [name for name in ("tkinter", "PIL", "psutil") if name in sys.modules]
+if gui_modules:
+    print(f"✗ engine pulled in GUI-only modules: {gui_modules}")
+else:
+    print("✓ engine imports without tkinter, PIL or psutil")
 
 print("\nTest completed.")